@@ -0,0 +1,45 @@
+"""add media_rankings table and interaction indexes
+
+Revision ID: 0c7d2b4e9a16
+Revises: f1a6c8d3e750
+Create Date: 2026-10-20 14:05:51.620378
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0c7d2b4e9a16'
+down_revision: Union[str, Sequence[str], None] = 'f1a6c8d3e750'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('media_rankings',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('feed', sqlmodel.sql.sqltypes.AutoString(length=20), nullable=False),
+    sa.Column('category_id', sa.Integer(), nullable=False),
+    sa.Column('rank', sa.Integer(), nullable=False),
+    sa.Column('media_id', sa.Integer(), nullable=False),
+    sa.Column('score', sa.Float(), nullable=False),
+    sa.Column('computed_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['media_id'], ['media.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_media_rankings_feed_category_rank', 'media_rankings', ['feed', 'category_id', 'rank'], unique=False)
+    op.create_index('ix_comments_media_created', 'comments', ['media_id', 'created_at'], unique=False)
+    op.create_index('ix_media_reactions_media_like', 'media_reactions', ['media_id', 'is_like'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_media_reactions_media_like', table_name='media_reactions')
+    op.drop_index('ix_comments_media_created', table_name='comments')
+    op.drop_index('ix_media_rankings_feed_category_rank', table_name='media_rankings')
+    op.drop_table('media_rankings')
@@ -0,0 +1,47 @@
+"""add feed_inbox and feed_pull_creators tables
+
+Revision ID: 2e5a9f7c1b83
+Revises: 0c7d2b4e9a16
+Create Date: 2026-10-20 16:34:27.419866
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2e5a9f7c1b83'
+down_revision: Union[str, Sequence[str], None] = '0c7d2b4e9a16'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('feed_inbox',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('media_id', sa.Integer(), nullable=False),
+    sa.Column('owner_id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['media_id'], ['media.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'media_id')
+    )
+    op.create_index('ix_feed_inbox_user_created_media', 'feed_inbox', ['user_id', 'created_at', 'media_id'], unique=False)
+    op.create_index(op.f('ix_feed_inbox_owner_id'), 'feed_inbox', ['owner_id'], unique=False)
+    op.create_table('feed_pull_creators',
+    sa.Column('creator_id', sa.Integer(), nullable=False),
+    sa.Column('marked_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['creator_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('creator_id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('feed_pull_creators')
+    op.drop_index(op.f('ix_feed_inbox_owner_id'), table_name='feed_inbox')
+    op.drop_index('ix_feed_inbox_user_created_media', table_name='feed_inbox')
+    op.drop_table('feed_inbox')
@@ -0,0 +1,40 @@
+"""add category media_count and category browse index
+
+Revision ID: 3f2b9c1d7e04
+Revises: e6c3c01ae949
+Create Date: 2026-10-19 09:12:40.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f2b9c1d7e04'
+down_revision: Union[str, Sequence[str], None] = 'e6c3c01ae949'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('category', sa.Column('media_count', sa.Integer(), nullable=False, server_default='0'))
+    op.create_index('ix_media_category_status_created_id', 'media', ['category_id', 'status', 'created_at', 'id'], unique=False)
+
+    # Backfill counters once; from here on they are maintained incrementally
+    op.execute(
+        """
+        UPDATE category SET media_count = (
+            SELECT COUNT(*) FROM media
+            WHERE media.category_id = category.id AND media.status = 'ACTIVE'
+        )
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_media_category_status_created_id', table_name='media')
+    op.drop_column('category', 'media_count')
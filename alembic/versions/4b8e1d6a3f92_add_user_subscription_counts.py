@@ -0,0 +1,40 @@
+"""add subscriber_count and subscription_count to users
+
+Revision ID: 4b8e1d6a3f92
+Revises: 2e5a9f7c1b83
+Create Date: 2026-10-21 08:52:13.104737
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4b8e1d6a3f92'
+down_revision: Union[str, Sequence[str], None] = '2e5a9f7c1b83'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('subscriber_count', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('users', sa.Column('subscription_count', sa.Integer(), nullable=False, server_default='0'))
+    op.create_index('ix_subscriptions_creator_id_id', 'subscriptions', ['creator_id', 'id'], unique=False)
+
+    op.execute(
+        """
+        UPDATE users SET
+            subscriber_count = (SELECT COUNT(*) FROM subscriptions WHERE subscriptions.creator_id = users.id),
+            subscription_count = (SELECT COUNT(*) FROM subscriptions WHERE subscriptions.subscriber_id = users.id)
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_subscriptions_creator_id_id', table_name='subscriptions')
+    op.drop_column('users', 'subscription_count')
+    op.drop_column('users', 'subscriber_count')
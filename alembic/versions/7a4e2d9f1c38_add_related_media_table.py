@@ -0,0 +1,44 @@
+"""add related_media table
+
+Revision ID: 7a4e2d9f1c38
+Revises: 3f2b9c1d7e04
+Create Date: 2026-10-19 11:02:17.504913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7a4e2d9f1c38'
+down_revision: Union[str, Sequence[str], None] = '3f2b9c1d7e04'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('related_media',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('media_id', sa.Integer(), nullable=False),
+    sa.Column('related_media_id', sa.Integer(), nullable=False),
+    sa.Column('score', sa.Float(), nullable=False),
+    sa.Column('rank', sa.Integer(), nullable=False),
+    sa.Column('computed_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['media_id'], ['media.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['related_media_id'], ['media.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_related_media_media_rank', 'related_media', ['media_id', 'rank'], unique=False)
+    op.add_column('media', sa.Column('related_refreshed_at', sa.DateTime(), nullable=True))
+    op.create_index(op.f('ix_media_related_refreshed_at'), 'media', ['related_refreshed_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_media_related_refreshed_at'), table_name='media')
+    op.drop_column('media', 'related_refreshed_at')
+    op.drop_index('ix_related_media_media_rank', table_name='related_media')
+    op.drop_table('related_media')
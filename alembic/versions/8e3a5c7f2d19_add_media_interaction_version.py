@@ -0,0 +1,28 @@
+"""add interaction_version to media
+
+Revision ID: 8e3a5c7f2d19
+Revises: 6d2f8a1c4e57
+Create Date: 2026-10-22 10:17:52.640193
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e3a5c7f2d19'
+down_revision: Union[str, Sequence[str], None] = '6d2f8a1c4e57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('media', sa.Column('interaction_version', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('media', 'interaction_version')
@@ -0,0 +1,39 @@
+"""add response_cache table
+
+Revision ID: 9c4f1b7e2a60
+Revises: 8e3a5c7f2d19
+Create Date: 2026-10-23 09:41:18.204517
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c4f1b7e2a60'
+down_revision: Union[str, Sequence[str], None] = '8e3a5c7f2d19'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('response_cache',
+    sa.Column('key', sqlmodel.sql.sqltypes.AutoString(length=200), nullable=False),
+    sa.Column('body', sa.LargeBinary(), nullable=False),
+    sa.Column('etag', sqlmodel.sql.sqltypes.AutoString(length=100), nullable=False),
+    sa.Column('fresh_until', sa.DateTime(), nullable=False),
+    sa.Column('stale_until', sa.DateTime(), nullable=False),
+    sa.Column('lease_until', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('key')
+    )
+    op.create_index(op.f('ix_response_cache_stale_until'), 'response_cache', ['stale_until'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_response_cache_stale_until'), table_name='response_cache')
+    op.drop_table('response_cache')
@@ -0,0 +1,44 @@
+"""add lower() prefix indexes for short autocomplete queries
+
+Revision ID: a3e7d9c4b218
+Revises: 9c4f1b7e2a60
+Create Date: 2026-10-24 10:12:05.318442
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3e7d9c4b218'
+down_revision: Union[str, Sequence[str], None] = '9c4f1b7e2a60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, table, column); text_pattern_ops serves lower(column) LIKE 'ab%' and ORDER BY lower(column)
+PREFIX_INDEXES = [
+    ('ix_media_title_lower_prefix', 'media', 'title'),
+    ('ix_users_name_lower_prefix', 'users', 'name'),
+    ('ix_category_name_lower_prefix', 'category', 'name'),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Postgres only, like the trigram indexes: other backends use the in-memory index
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    for name, table, column in PREFIX_INDEXES:
+        op.create_index(name, table, [sa.text(f'lower({column}) text_pattern_ops')], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    for name, table, _ in reversed(PREFIX_INDEXES):
+        op.drop_index(name, table_name=table)
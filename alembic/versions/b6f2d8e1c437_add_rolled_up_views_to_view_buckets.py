@@ -0,0 +1,32 @@
+"""add rolled_up_views to minute and hour view buckets
+
+Revision ID: b6f2d8e1c437
+Revises: a3e7d9c4b218
+Create Date: 2026-10-24 15:26:41.702963
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6f2d8e1c437'
+down_revision: Union[str, Sequence[str], None] = 'a3e7d9c4b218'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in ('media_views_minute', 'media_views_hour'):
+        op.add_column(table, sa.Column('rolled_up_views', sa.Integer(), nullable=False, server_default='0'))
+        # Rows already rolled up were rolled up in full
+        op.execute(f'UPDATE {table} SET rolled_up_views = views WHERE rolled_up')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in ('media_views_hour', 'media_views_minute'):
+        op.drop_column(table, 'rolled_up_views')
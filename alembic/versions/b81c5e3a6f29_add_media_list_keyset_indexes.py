@@ -0,0 +1,29 @@
+"""add media list keyset indexes
+
+Revision ID: b81c5e3a6f29
+Revises: 7a4e2d9f1c38
+Create Date: 2026-10-19 13:40:52.271605
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b81c5e3a6f29'
+down_revision: Union[str, Sequence[str], None] = '7a4e2d9f1c38'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_media_status_created_id', 'media', ['status', 'created_at', 'id'], unique=False)
+    op.create_index('ix_media_owner_created_id', 'media', ['owner_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_media_owner_created_id', table_name='media')
+    op.drop_index('ix_media_status_created_id', table_name='media')
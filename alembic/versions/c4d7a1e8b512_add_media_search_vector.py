@@ -0,0 +1,45 @@
+"""add media search_vector full-text column
+
+Revision ID: c4d7a1e8b512
+Revises: b81c5e3a6f29
+Create Date: 2026-10-19 15:26:08.930147
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4d7a1e8b512'
+down_revision: Union[str, Sequence[str], None] = 'b81c5e3a6f29'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Postgres only: other backends use the in-process index in services.search_service
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    # Generated column, so every INSERT/UPDATE of title/description keeps it current
+    op.execute(
+        """
+        ALTER TABLE media ADD COLUMN search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(description, '')), 'B')
+        ) STORED
+        """
+    )
+    op.create_index('ix_media_search_vector', 'media', ['search_vector'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.drop_index('ix_media_search_vector', table_name='media')
+    op.drop_column('media', 'search_vector')
@@ -0,0 +1,48 @@
+"""add pg_trgm indexes for fuzzy search and autocomplete
+
+Revision ID: d5e8f2a9c637
+Revises: c4d7a1e8b512
+Create Date: 2026-10-19 17:03:44.615290
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5e8f2a9c637'
+down_revision: Union[str, Sequence[str], None] = 'c4d7a1e8b512'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, table, column); gin_trgm_ops also serves ILIKE '%term%' lookups
+TRGM_INDEXES = [
+    ('ix_media_title_trgm', 'media', 'title'),
+    ('ix_users_name_trgm', 'users', 'name'),
+    ('ix_users_email_trgm', 'users', 'email'),
+    ('ix_category_name_trgm', 'category', 'name'),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Postgres only: other backends use the in-memory index in services.suggest_service
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for name, table, column in TRGM_INDEXES:
+        op.create_index(
+            name, table, [column], unique=False,
+            postgresql_using='gin', postgresql_ops={column: 'gin_trgm_ops'},
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    for name, table, _ in reversed(TRGM_INDEXES):
+        op.drop_index(name, table_name=table)
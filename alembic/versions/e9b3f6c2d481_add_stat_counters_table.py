@@ -0,0 +1,35 @@
+"""add stat_counters table
+
+Revision ID: e9b3f6c2d481
+Revises: d5e8f2a9c637
+Create Date: 2026-10-20 09:18:35.276041
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e9b3f6c2d481'
+down_revision: Union[str, Sequence[str], None] = 'd5e8f2a9c637'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Left empty: the app builds the counters on first boot (services.stats_service.ensure_stats_initialized)
+    op.create_table('stat_counters',
+    sa.Column('key', sqlmodel.sql.sqltypes.AutoString(length=100), nullable=False),
+    sa.Column('value', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('key')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('stat_counters')
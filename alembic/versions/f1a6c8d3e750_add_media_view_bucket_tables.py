@@ -0,0 +1,56 @@
+"""add media view bucket tables
+
+Revision ID: f1a6c8d3e750
+Revises: e9b3f6c2d481
+Create Date: 2026-10-20 11:47:09.833512
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1a6c8d3e750'
+down_revision: Union[str, Sequence[str], None] = 'e9b3f6c2d481'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _bucket_table(name: str, with_rollup_flag: bool):
+    columns = [
+        sa.Column('media_id', sa.Integer(), nullable=False),
+        sa.Column('bucket_start', sa.DateTime(), nullable=False),
+        sa.Column('owner_id', sa.Integer(), nullable=False),
+        sa.Column('views', sa.Integer(), nullable=False),
+    ]
+    if with_rollup_flag:
+        columns.append(sa.Column('rolled_up', sa.Boolean(), nullable=False))
+    op.create_table(name,
+    *columns,
+    sa.ForeignKeyConstraint(['media_id'], ['media.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('media_id', 'bucket_start')
+    )
+    op.create_index(f'ix_{name}_owner_bucket', name, ['owner_id', 'bucket_start'], unique=False)
+    if with_rollup_flag:
+        op.create_index(f'ix_{name}_rollup', name, ['rolled_up', 'bucket_start'], unique=False)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _bucket_table('media_views_minute', with_rollup_flag=True)
+    _bucket_table('media_views_hour', with_rollup_flag=True)
+    _bucket_table('media_views_day', with_rollup_flag=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_media_views_day_owner_bucket', table_name='media_views_day')
+    op.drop_table('media_views_day')
+    op.drop_index('ix_media_views_hour_rollup', table_name='media_views_hour')
+    op.drop_index('ix_media_views_hour_owner_bucket', table_name='media_views_hour')
+    op.drop_table('media_views_hour')
+    op.drop_index('ix_media_views_minute_rollup', table_name='media_views_minute')
+    op.drop_index('ix_media_views_minute_owner_bucket', table_name='media_views_minute')
+    op.drop_table('media_views_minute')
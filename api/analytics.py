@@ -0,0 +1,77 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlmodel import Session
+from datetime import datetime, timedelta, timezone
+from typing import Literal
+
+from database import get_session
+from services.auth_service import get_current_user
+from services.view_analytics_service import view_series, MINUTE, HOUR, DAY
+from models.media import Media
+from models.user import User, UserRole
+from schemas.analytics import ViewSeries, ViewPoint
+
+router = APIRouter()
+
+# Window used when `since` is omitted
+DEFAULT_WINDOWS = {
+    MINUTE: timedelta(hours=1),
+    HOUR: timedelta(hours=24),
+    DAY: timedelta(days=30),
+}
+
+
+def _naive_utc(value: datetime | None) -> datetime | None:
+    """Buckets are stored as naive UTC; an offset-aware query value (`...Z`, `+02:00`) is converted to match."""
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _build_series(session: Session, granularity: str, since: datetime | None, until: datetime | None, **scope) -> ViewSeries:
+    since, until = _naive_utc(since), _naive_utc(until)
+    until = until or datetime.utcnow()
+    since = since or until - DEFAULT_WINDOWS[granularity]
+    if since >= until:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="`since` must be before `until`.")
+
+    points = view_series(session, granularity, since, until, **scope)
+    return ViewSeries(
+        granularity=granularity,
+        since=since,
+        until=until,
+        total=sum(views for _, views in points),
+        points=[ViewPoint(bucket_start=bucket, views=views) for bucket, views in points],
+    )
+
+
+@router.get("/analytics/media/{media_id}/views", response_model=ViewSeries)
+def media_view_series(
+    media_id: int,
+    granularity: Literal["minute", "hour", "day"] = Query("hour"),
+    since: datetime | None = Query(None, description="UTC start of the window (inclusive)"),
+    until: datetime | None = Query(None, description="UTC end of the window (exclusive), defaults to now"),
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+):
+    media = session.get(Media, media_id)
+    if not media:
+        raise HTTPException(status_code=404, detail="Media not found")
+    if media.owner_id != current_user.id and current_user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=403, detail="Not authorized")
+
+    return _build_series(session, granularity, since, until, media_id=media_id)
+
+
+@router.get("/analytics/creators/{user_id}/views", response_model=ViewSeries)
+def creator_view_series(
+    user_id: int,
+    granularity: Literal["minute", "hour", "day"] = Query("day"),
+    since: datetime | None = Query(None, description="UTC start of the window (inclusive)"),
+    until: datetime | None = Query(None, description="UTC end of the window (exclusive), defaults to now"),
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+):
+    if user_id != current_user.id and current_user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=403, detail="Not authorized")
+
+    return _build_series(session, granularity, since, until, owner_id=user_id)
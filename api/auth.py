@@ -9,10 +9,11 @@ from models.user import User, UserBase, UserStatus
 import uuid
 from core.config import settings
 
-from core.mail import fast_mail
-from fastapi_mail import MessageSchema, MessageType, MultipartSubtypeEnum
+from core.mail import send_html_mail
 
 from models.auth import ForgotPasswordRequest, ResetPasswordRequest, ChangePasswordRequest
+from services.suggest_service import index_suggestion, CREATOR
+from services.stats_service import record_user_change
 
 
 router = APIRouter()
@@ -50,8 +51,10 @@ def register_user(*, session: Session = Depends(get_session), user_in: dict):
 
     db_user = User(**user_data, hashed_password=hashed_password)
     session.add(db_user)
+    record_user_change(session, None, db_user.status)
     session.commit()
     session.refresh(db_user)
+    index_suggestion(CREATOR, db_user.id, db_user.name, db_user.status == UserStatus.ACTIVE)
     return {"message": "Registration successful"}
 
 
@@ -124,19 +127,7 @@ async def forgot_password(
         <p><a href="{reset_link}">Reset Password Link</a></p>
         """
 
-        messageData = MessageSchema(
-            subject="Password Reset Request",
-            recipients=[payload.email],
-            body=html,
-            subtype=MessageType.html,
-            multipart_subtype=MultipartSubtypeEnum.alternative  
-        )
-
-        background_tasks.add_task(
-            fast_mail.send_message, 
-            messageData, 
-            MessageType.html
-        )
+        background_tasks.add_task(send_html_mail, "Password Reset Request", [payload.email], html)
         
         return {"message": "Password reset email successfully scheduled for sending."}
 
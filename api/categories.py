@@ -1,9 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Union
 from sqlmodel import Session, select
 
 from database import get_session
 from services.auth_service import get_current_user
-from models.category import Category
+from services.pagination import apply_keyset, keyset_page
+from models.category import Category, CategoryStatus
+from models.media import Media, MediaStatus
+from schemas.media import CategoryMediaPage, CategoryMediaFieldsPage
+from schemas.category import CategoryRead
+from services.suggest_service import index_suggestion, unindex_suggestion, CATEGORY
+from services.stats_service import bump, CATEGORIES
+from services.serialization import (
+    category_select, media_read_select, rows_to_dicts, fast_response, parse_fields, ORJSONResponse,
+    MEDIA_READ_FIELDS, FIELDS_DESCRIPTION,
+)
 
 router = APIRouter()
 
@@ -20,19 +31,53 @@ def create_category(
     if existing:
         raise HTTPException(status_code=400, detail="Category already exists")
 
+    category.media_count = 0
     session.add(category)
+    bump(session, CATEGORIES, 1)
     session.commit()
     session.refresh(category)
+    index_suggestion(CATEGORY, category.id, category.name, category.status == CategoryStatus.ACTIVE)
     return category
 
-@router.get("/category/list", response_model=list[Category])
+@router.get("/category/list", response_model=list[Category], response_class=ORJSONResponse)
 def list_categories(
     session: Session = Depends(get_session),
     # current_user: User = Depends(get_current_user),
 ):
-    categories = session.exec(
-        select(Category)).all()
-    return categories
+    categories = session.exec(category_select()).all()
+    return fast_response(rows_to_dicts(categories))
+
+@router.get(
+    "/category/{category_id}/media",
+    response_model=Union[CategoryMediaPage, CategoryMediaFieldsPage],
+    response_class=ORJSONResponse,
+)
+def list_category_media(
+    category_id: int,
+    cursor: str | None = Query(None, description="Cursor returned as next_cursor by the previous page"),
+    size: int = Query(20, ge=1, le=100, description="Number of items per page"),
+    fields: str | None = Query(None, description=FIELDS_DESCRIPTION),
+    session: Session = Depends(get_session),
+):
+    selected = parse_fields(fields, MEDIA_READ_FIELDS)
+    category = session.get(Category, category_id)
+    if not category:
+        raise HTTPException(status_code=404, detail="Category not found")
+
+    # Walks ix_media_category_status_created_id: equality on (category_id, status), range on (created_at, id)
+    statement = media_read_select(selected).where(
+        Media.category_id == category_id, Media.status == MediaStatus.ACTIVE
+    )
+    rows = session.exec(apply_keyset(statement, Media, cursor, size)).all()
+    items, next_cursor = keyset_page(rows, size)
+
+    return fast_response({
+        "category": CategoryRead.model_validate(category).model_dump(),
+        "total_count": category.media_count,
+        "items": rows_to_dicts(items, selected),
+        "size": size,
+        "next_cursor": next_cursor,
+    })
 
 @router.put("/category/update/{category_id}", response_model=Category)
 def update_category(
@@ -51,6 +96,7 @@ def update_category(
     session.add(category)
     session.commit()
     session.refresh(category)
+    index_suggestion(CATEGORY, category.id, category.name, category.status == CategoryStatus.ACTIVE)
     return category
 
 @router.delete("/category/delete/{category_id}")
@@ -64,5 +110,7 @@ def delete_category(
         raise HTTPException(status_code=404, detail="Category not found")
 
     session.delete(category)
+    bump(session, CATEGORIES, -1)
     session.commit()
+    unindex_suggestion(CATEGORY, category_id)
     return {"message": "Category deleted successfully"}
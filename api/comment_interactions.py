@@ -3,6 +3,8 @@ from database import get_session
 from sqlmodel import Session, select
 from models.user import User
 from services.auth_service import get_current_user
+from services.etag_service import bump_comment_interaction_version
+from services.response_cache import invalidate_media_details
 from schemas.comment_interaction import LikeDisLikeRequest
 from models.comment_interaction import CommentReaction, CommentReply
 
@@ -17,21 +19,23 @@ def toggle_reaction(comment_id: int, payload: LikeDisLikeRequest, session: Sessi
         )
     ).first()
 
+    media_id = bump_comment_interaction_version(session, comment_id)
     if existing:
         if existing.is_like == payload.is_like:
             session.delete(existing)
-            session.commit()
-            return {"message": "Reaction removed"}
+            message = "Reaction removed"
         else:
             existing.is_like = payload.is_like
             session.add(existing)
-            session.commit()
-            return {"message": "Reaction updated"}
+            message = "Reaction updated"
     else:
         reaction = CommentReaction(user_id = current_user.id, comment_id=comment_id, is_like=payload.is_like)
         session.add(reaction)
-        session.commit()
-        return {"message": "Reaction added"}
+        message = "Reaction added"
+    session.commit()
+    if media_id is not None:
+        invalidate_media_details([media_id])
+    return {"message": message}
     
 
 @router.get("/comment/{comment_id}/reactions")
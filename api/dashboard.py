@@ -1,107 +1,97 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import Session, select, func
+from sqlmodel import Session, select
 from sqlalchemy.orm import selectinload 
 
 from database import get_session
 from services.auth_service import get_current_user
-from models.category import Category
+from services.cache import TTLCache
+from services.stats_service import get_counters, owner_media_key, CATEGORIES, MEDIA, USERS
+from core.config import settings
 from models.media import Media, MediaStatus
 from models.user import User, UserRole, UserStatus
 from schemas.dashboard import DashboardPayload
+from schemas.media import MediaRead
+from schemas.user import UserRead
 
 router = APIRouter()
 
+# Payloads are rebuilt at most once per DASHBOARD_CACHE_SECONDS per key
+dashboard_cache = TTLCache(ttl_seconds=settings.DASHBOARD_CACHE_SECONDS)
+
+
+def _recent_media(session: Session, statement) -> list[MediaRead]:
+    statement = (
+        statement
+        .options(selectinload(Media.category), selectinload(Media.user))
+        .order_by(Media.created_at.desc())
+        .limit(5)
+    )
+    return [MediaRead.model_validate(m) for m in session.exec(statement).all()]
+
+
+def _build_admin_dashboard(session: Session) -> DashboardPayload:
+    counters = get_counters(session, CATEGORIES, MEDIA, USERS)
+
+    recent_media_result = _recent_media(
+        session,
+        select(Media)
+        # .where(Media.status == MediaStatus.ACTIVE)
+    )
+
+    recent_users_statement = (
+        select(User)
+        .where(User.role != UserRole.ADMIN)
+        # .where(User.status == UserStatus.ACTIVE)
+        .order_by(User.created_at.desc())
+        .limit(5)
+    )
+
+    recent_users_result = [UserRead.model_validate(u) for u in session.exec(recent_users_statement).all()]
+
+    return DashboardPayload(
+        total_categories=counters[CATEGORIES],
+        total_media=counters[MEDIA],
+        total_users=counters[USERS],
+        recent_users=recent_users_result,
+        recent_media=recent_media_result,
+    )
+
+
+def _build_owner_dashboard(session: Session, owner_id: int, status: MediaStatus | None) -> DashboardPayload:
+    key = owner_media_key(owner_id, status)
+    total_media = get_counters(session, key)[key]
+
+    statement = select(Media).where(Media.owner_id == owner_id)
+    if status is not None:
+        statement = statement.where(Media.status == status)
+
+    return DashboardPayload(
+        total_media=total_media,
+        recent_media=_recent_media(session, statement),
+    )
+
+
 @router.get("/dashboard", response_model=DashboardPayload)
 def admin_dashboard(
     session: Session = Depends(get_session),
     current_user: User = Depends(get_current_user),
 ):
     if current_user.role == UserRole.ADMIN:
-        total_categories = session.exec(select(func.count(Category.id))).one()
-        total_media = session.exec(
-            select(func.count(Media.id))
-            # .where(Media.status == MediaStatus.ACTIVE)
-            ).one()
-        total_users = session.exec(
-            select(func.count(User.id))
-            .where(User.role != UserRole.ADMIN)
-            # .where(User.status == UserStatus.ACTIVE)
-            ).one()
-
-        recent_media_statement = (
-            select(Media)
-            # .where(Media.status == MediaStatus.ACTIVE)
-            .options(selectinload(Media.category))
-            .order_by(Media.created_at.desc())
-            .limit(5)
-        )
-
-        recent_media_result = session.exec(recent_media_statement).all()
-        
-        recent_users_statement = (
-            select(User)
-            .where(User.role != UserRole.ADMIN)
-            # .where(User.status == UserStatus.ACTIVE)
-            .order_by(User.created_at.desc())
-            .limit(5)
-        )
-
-        recent_users_result = session.exec(recent_users_statement).all()
-
-        return {
-            "total_categories": total_categories,
-            "total_media": total_media,
-            "total_users": total_users,
-            "recent_users": recent_users_result,
-            "recent_media": recent_media_result
-        }
+        return dashboard_cache.get_or_set(("admin",), lambda: _build_admin_dashboard(session))
 
     elif current_user.role == UserRole.USER:
-        total_media = session.exec(
-            select(func.count(Media.id))
-            .where(Media.owner_id == current_user.id)
-            # .where(Media.status == MediaStatus.ACTIVE)
-            ).one()
-
-        recent_media_statement = (
-            select(Media)
-            # .where(Media.status == MediaStatus.ACTIVE)
-            .where(Media.owner_id == current_user.id)
-            .options(selectinload(Media.category))
-            .order_by(Media.created_at.desc())
-            .limit(5)
+        return dashboard_cache.get_or_set(
+            ("owner", current_user.id, None),
+            lambda: _build_owner_dashboard(session, current_user.id, None),
         )
 
-        recent_media_result = session.exec(recent_media_statement).all()
-
-        return {
-            "total_media": total_media,
-            "recent_media": recent_media_result
-        }
-
 
 @router.get("/user-dashboard", response_model=DashboardPayload)
 def admin_dashboard(
     session: Session = Depends(get_session),
     current_user: User = Depends(get_current_user),
 ):
-    total_media = session.exec(select(func.count(Media.id)).where(Media.owner_id == current_user.id).where(Media.status == MediaStatus.ACTIVE)).one()
-
-    recent_media_statement = (
-        select(Media)
-        .where(Media.status == MediaStatus.ACTIVE)
-        .where(Media.owner_id == current_user.id)
-        .options(selectinload(Media.category))
-        .order_by(Media.created_at.desc())
-        .limit(5)
+    return dashboard_cache.get_or_set(
+        ("owner", current_user.id, MediaStatus.ACTIVE),
+        lambda: _build_owner_dashboard(session, current_user.id, MediaStatus.ACTIVE),
     )
-
-    recent_media_result = session.exec(recent_media_statement).all()
-
-    return {
-        "total_media": total_media,
-        "recent_media": recent_media_result
-    }
-
-
-
@@ -0,0 +1,20 @@
+from fastapi import APIRouter, Depends, Query
+from sqlmodel import Session
+
+from database import get_session
+from services.auth_service import get_current_user
+from services.feed_service import get_feed_page
+from models.user import User
+from schemas.media import CursorPaginatedMedia
+
+router = APIRouter()
+
+@router.get("/feed", response_model=CursorPaginatedMedia)
+def subscription_feed(
+    cursor: str | None = Query(None, description="Cursor returned as next_cursor by the previous page"),
+    size: int = Query(20, ge=1, le=100, description="Number of items per page"),
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+):
+    items, next_cursor = get_feed_page(session, current_user.id, cursor, size)
+    return CursorPaginatedMedia(items=items, size=size, next_cursor=next_cursor)
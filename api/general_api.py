@@ -1,19 +1,24 @@
-from fastapi import APIRouter, status, HTTPException, Depends, BackgroundTasks, UploadFile, File
+from fastapi import APIRouter, status, HTTPException, Depends, BackgroundTasks, UploadFile, File, Query, Request, Response
 from schemas.contact_us import ContactUsMessage
 from schemas.user import UserRead
-from schemas.media import MediaRead
+from schemas.media import MediaRead, MediaFieldsRead
 from models.media import Media
 from models.user import User
 from services.auth_service import get_current_user
 from services.file_service import safe_filename, save_upload_file
 
-from core.mail import fast_mail
-from fastapi_mail import MessageSchema, MessageType, MultipartSubtypeEnum
+from core.mail import send_html_mail
 from core.config import settings
 from database import get_session
+from services.etag_service import user_etag, etag_matches, not_modified, set_cache_headers
+from services.serialization import (
+    media_read_select, rows_to_dicts, fast_response, parse_fields, ORJSONResponse,
+    MEDIA_READ_FIELDS, FIELDS_DESCRIPTION,
+)
 from sqlmodel import Session, select
+from typing import Union
 import os
-from core.cloudinary_config import cloudinary
+from core.storage import storage
 
 router = APIRouter()
 
@@ -34,20 +39,8 @@ async def contact_us_message(
     </div>
     """
 
-    messageData = MessageSchema(
-        subject="New Contact Us Message",
-        recipients=[settings.OWNER_EMAIL],
-        body=html,
-        subtype=MessageType.html,
-        multipart_subtype=MultipartSubtypeEnum.alternative  
-    )
-
     try:
-        background_tasks.add_task(
-            fast_mail.send_message, 
-            messageData, 
-            MessageType.html
-        )
+        background_tasks.add_task(send_html_mail, "New Contact Us Message", [settings.OWNER_EMAIL], html)
         return {"message": "Message successfully scheduled for sending."}
         
     except Exception as e:
@@ -59,21 +52,37 @@ async def contact_us_message(
     
 
 @router.get("/users/{user_id}/profile", response_model=UserRead)
-def get_user_profile(user_id: int, session: Session = Depends(get_session)):
+def get_user_profile(user_id: int, request: Request, response: Response, session: Session = Depends(get_session)):
+    etag = user_etag(session, user_id)
+    if etag is None:
+        raise HTTPException(status_code=404, detail="User not found.")
+    if etag_matches(request, etag):
+        return not_modified(etag, settings.PROFILE_CACHE_CONTROL)
+    set_cache_headers(response, etag, settings.PROFILE_CACHE_CONTROL)
+
     user = session.exec(select(User).where(User.id == user_id)).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found.")
 
     return user
     
-@router.get("/media/user/{user_id}", response_model=list[MediaRead])
-def get_user_media(user_id: int, session: Session = Depends(get_session)):
-    query = select(Media).where(Media.owner_id == user_id)
+@router.get(
+    "/media/user/{user_id}",
+    response_model=Union[list[MediaRead], list[MediaFieldsRead]],
+    response_class=ORJSONResponse,
+)
+def get_user_media(
+    user_id: int,
+    fields: str | None = Query(None, description=FIELDS_DESCRIPTION),
+    session: Session = Depends(get_session),
+):
+    selected = parse_fields(fields, MEDIA_READ_FIELDS)
+    query = media_read_select(selected).where(Media.owner_id == user_id)
     media = session.exec(query).all()
     if not media:
         raise HTTPException(status_code=404, detail="Media not found.")
 
-    return media
+    return fast_response(rows_to_dicts(media, selected))
 
 @router.post("/user/{user_id}/bg-profile-update")
 async def bg_profile_update(
@@ -110,13 +119,14 @@ async def bg_profile_update(
         try:
             if current_user.background_pic_public_id:
                 try:
-                    cloudinary.uploader.destroy(current_user.background_pic_public_id)
+                    storage.destroy(current_user.background_pic_public_id)
                 except Exception as delete_error:
                     print(f"⚠️ Failed to delete old background pic: {delete_error}")
 
-            res = cloudinary.uploader.upload(
+            res = storage.upload(
                 bg_file.file,
                 folder=f"mediahub/profile_pics/{current_user.id}",
+                filename=bg_file.filename,
                 transformation=[{"width": 600, "height": 600, "crop": "limit"}],  
                 overwrite=True
             )
@@ -1,5 +1,7 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form, Query, BackgroundTasks
-from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form, Query, BackgroundTasks, Request, Response
+from fastapi.responses import StreamingResponse
+from fastapi.encoders import jsonable_encoder
+from typing import Literal, Optional, Union
 import os
 from uuid import uuid4
 import shutil
@@ -7,26 +9,45 @@ from datetime import datetime
 
 from sqlmodel import Session, select, func
 
-from database import get_session
-from services.auth_service import get_current_user
+from database import engine, get_session
+from services.auth_service import get_current_user, get_optional_user
 from services.file_service import save_upload_file, save_upload_file_async
+from services.category_service import track_media_change
+from services.stats_service import record_media_change
+from services.related_media_service import get_related_media, refresh_related_media
+from services.pagination import apply_keyset, keyset_page
+from services.search_service import search_media, search_filter, index_media, unindex_media
+from services.export_service import stream_export, export_filename, MEDIA_TYPES
+from services.serialization import (
+    media_read_select, rows_to_dicts, fast_response, parse_fields, ORJSONResponse,
+    MEDIA_READ_FIELDS, FIELDS_DESCRIPTION,
+)
+from services.suggest_service import index_suggestion, unindex_suggestion, MEDIA
+from services.count_service import count_total
+from services.view_analytics_service import record_view
+from services.ranking_service import get_feed, TRENDING, POPULAR
+from services.feed_service import fan_out_media
+from services.etag_service import media_etag, etag_matches, not_modified, set_cache_headers
+from services.response_cache import response_cache, media_details_key, invalidate_media_details
+from services.moderation_service import create_job, get_job, bulk_change_status, bulk_delete, STATUS_CHANGE, DELETE
 from models.media import Media, MediaStatusUpdate, MediaStatus
 from models.user import User, UserRole
 from models.media_interaction import Comment, MediaReaction
-from schemas.media import PaginatedMedia, MediaRead, MediaWithRelatedCategoryMedia
+from schemas.media import PaginatedMedia, MediaRead, MediaWithRelatedCategoryMedia, CursorPaginatedMedia, CursorPaginatedMediaFields, RankedFeed, MediaBatch
 from sqlalchemy.orm import selectinload 
 from core.config import settings
 from schemas.media_response import MediaResponse, CommentResponse, MediaReactionSummary
 from schemas.user import UserRead
+from schemas.moderation import BulkMediaStatusUpdate, BulkMediaDelete, ModerationJobRead
 from schemas.comment_interaction import CommentReactionsData
 from models.comment_interaction import CommentReaction
 import subprocess
 from pathlib import Path
 import json
-import ffmpeg
+import orjson
 import logging
-from core.cloudinary_config import cloudinary
-from cloudinary.utils import cloudinary_url
+from core.storage import storage
+from core.compression import precompress_file
 
 router = APIRouter()
 
@@ -196,6 +217,10 @@ def convert_video_to_hls(video_path: Path, output_dir: Path) -> Path:
             f.write('#EXT-X-STREAM-INF:BANDWIDTH=3750000,RESOLUTION=1280x720\n720p.m3u8\n')
             f.write('#EXT-X-STREAM-INF:BANDWIDTH=7500000,RESOLUTION=1920x1080\n1080p.m3u8\n')
 
+        # Served as-is by PrecompressedStaticFiles to clients that accept gzip / br
+        for playlist in output_dir.glob("*.m3u8"):
+            precompress_file(playlist)
+
         return master_playlist
 
     except Exception as e:
@@ -248,6 +273,8 @@ def generate_thumbnail(video_path: Path, output_dir: Path, duration: float):
 
 def get_audio_metadata(file_path: str):
     """Extract metadata from audio file using ffmpeg.probe."""
+    import ffmpeg  # only needed for audio uploads, kept off the startup path
+
     probe = ffmpeg.probe(file_path)
     audio_stream = next((stream for stream in probe["streams"] if stream["codec_type"] == "audio"), None)
     
@@ -289,9 +316,7 @@ MEDIA_UPLOAD_DIR = Path("static/media/uploads")
 HLS_OUTPUT_DIR = Path("static/media/hls")
 THUMBNAIL_DIR = Path("static/media/thumbnails")
 
-MEDIA_UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
-HLS_OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
-THUMBNAIL_DIR.mkdir(parents=True, exist_ok=True)
+# Created once by core.prestart, not on every worker import
 
 
 # @router.post("/media/create", response_model=Media)
@@ -402,35 +427,31 @@ async def create_media(
     folder_type = "videos" if media_type == "video" else "audios"
 
     try:
-        res = cloudinary.uploader.upload(
+        res = storage.upload(
             file.file,
             resource_type="video",  # Cloudinary uses 'video' for both video/audio
             folder=f"mediahub/{folder_type}/{current_user.id}",
+            filename=file.filename,
             use_filename=True,
             unique_filename=True,
         )
 
         public_id = res.get("public_id")
         secure_url = res.get("secure_url")
-        cloud_name = cloudinary.config().cloud_name
 
         # --- Generate HLS URL (Cloudinary auto-generates m3u8 for video/audio) ---
-        hls_url = f"https://res.cloudinary.com/{cloud_name}/video/upload/{public_id}.m3u8"
+        hls_url = storage.hls_url(public_id)
 
         thumb_public_id = None
 
         if media_type == "video":
-            thumb_url, _ = cloudinary_url(
-                public_id,
-                resource_type="video",
-                format="jpg",
-                transformation=[{"width": 400, "height": 225, "crop": "fill"}],
-            )
+            thumb_url = storage.video_thumbnail_url(public_id)
         elif media_type == "audio":
             if thumbnail:
-                thumb_res = cloudinary.uploader.upload(
+                thumb_res = storage.upload(
                     thumbnail.file,
                     folder=f"mediahub/audio_thumbnails/{current_user.id}",
+                    filename=thumbnail.filename,
                     use_filename=True,
                     unique_filename=True,
                     resource_type="image",
@@ -464,9 +485,16 @@ async def create_media(
         )
 
         session.add(media)
+        track_media_change(session, None, None, media.category_id, media.status)
+        record_media_change(session, None, (media.owner_id, media.category_id, media.status))
         session.commit()
         session.refresh(media)
 
+        index_media(media)
+        index_suggestion(MEDIA, media.id, media.title, media.status == MediaStatus.ACTIVE)
+        background_tasks.add_task(refresh_related_media, media.id)
+        background_tasks.add_task(fan_out_media, media.id)
+
         return {
             "message": f"{media_type.capitalize()} uploaded successfully!",
             "media": media,
@@ -546,6 +574,7 @@ async def create_media(
 
 @router.put("/media/update/{media_id}", response_model=Media)
 async def update_media(
+    background_tasks: BackgroundTasks,
     media_id: int,
     title: Optional[str] = Form(None),
     description: Optional[str] = Form(None),
@@ -560,6 +589,8 @@ async def update_media(
     if not media:
         raise HTTPException(status_code=404, detail="Media not found or not owned by user")
 
+    old_category_id = media.category_id
+
     try:
         # Update metadata
         if title:
@@ -578,20 +609,21 @@ async def update_media(
 
         # Replace media file if provided
         if file:
-            # Delete old media from Cloudinary
+            # Delete old media from storage
             if media.public_id:
                 try:
-                    cloudinary.uploader.destroy(media.public_id, resource_type="video")
+                    storage.destroy(media.public_id, resource_type="video")
                 except Exception as e:
                     print("Warning: Failed to delete old media:", e)
 
             mime = file.content_type or ""
             resource_type = "video" if mime.startswith(("video/", "audio/")) else "auto"
 
-            upload_res = cloudinary.uploader.upload(
+            upload_res = storage.upload(
                 file.file,
                 resource_type=resource_type,
                 folder=f"mediahub/media/{current_user.id}",
+                filename=file.filename,
                 use_filename=True,
                 unique_filename=False,
                 overwrite=True
@@ -599,17 +631,11 @@ async def update_media(
 
             public_id = upload_res.get("public_id")
             secure_url = upload_res.get("secure_url")
-            cloud_name = cloudinary.config().cloud_name
-            hls_url = f"https://res.cloudinary.com/{cloud_name}/video/upload/{public_id}.m3u8"
+            hls_url = storage.hls_url(public_id)
 
             # Generate video thumbnail if applicable
             if media.media_type == "video":
-                thumb_url, _ = cloudinary_url(
-                    public_id,
-                    resource_type="video",
-                    format="jpg",
-                    transformation=[{"width": 400, "height": 225, "crop": "fill"}],
-                )
+                thumb_url = storage.video_thumbnail_url(public_id)
 
             media.file_url = secure_url
             media.public_id = public_id
@@ -622,13 +648,14 @@ async def update_media(
         if media.media_type == "audio" and thumbnail:
             if thumb_public_id:
                 try:
-                    cloudinary.uploader.destroy(thumb_public_id, resource_type="image")
+                    storage.destroy(thumb_public_id, resource_type="image")
                 except Exception as e:
                     print("Warning: Failed to delete old thumbnail:", e)
 
-            thumb_res = cloudinary.uploader.upload(
+            thumb_res = storage.upload(
                 thumbnail.file,
                 folder=f"mediahub/audio_thumbnails/{current_user.id}",
+                filename=thumbnail.filename,
                 use_filename=True,
                 unique_filename=True,
                 resource_type="image",
@@ -640,10 +667,25 @@ async def update_media(
         media.thumbnail_url = thumb_url
         media.thumbnail_public_id = thumb_public_id
         media.updated_at = datetime.utcnow()
+        related_changed = media.category_id != old_category_id
+        if related_changed:
+            # Category drives the related score; rebuilt in the background, or on the next view if that comes first
+            media.related_refreshed_at = None
 
         session.add(media)
+        track_media_change(session, old_category_id, media.status, media.category_id, media.status)
+        record_media_change(
+            session,
+            (media.owner_id, old_category_id, media.status),
+            (media.owner_id, media.category_id, media.status),
+        )
         session.commit()
         session.refresh(media)
+        index_media(media)
+        index_suggestion(MEDIA, media.id, media.title, media.status == MediaStatus.ACTIVE)
+        invalidate_media_details([media.id])
+        if related_changed:
+            background_tasks.add_task(refresh_related_media, media.id)
 
         return {"message": "Media updated successfully", "media": media}
 
@@ -652,35 +694,130 @@ async def update_media(
         raise HTTPException(status_code=500, detail=f"Failed to update media: {str(e)}")
 
 
-@router.get("/media/list", response_model=List[MediaRead])
+@router.get(
+    "/media/list",
+    response_model=Union[CursorPaginatedMedia, CursorPaginatedMediaFields],
+    response_class=ORJSONResponse,
+)
 def list_media(
-    skip: int = 0,
-    limit: int = 20,
+    cursor: str | None = Query(None, description="Cursor returned as next_cursor by the previous page"),
+    size: int = Query(20, ge=1, le=100, description="Number of items per page"),
+    fields: str | None = Query(None, description=FIELDS_DESCRIPTION),
     session: Session = Depends(get_session),
     current_user: User = Depends(get_current_user),
 ):
-    query = select(Media).where(Media.owner_id == current_user.id).offset(skip).limit(limit)
-    media_list = session.exec(query).all()
-    return media_list
+    selected = parse_fields(fields, MEDIA_READ_FIELDS)
+    # Served by ix_media_owner_created_id
+    query = media_read_select(selected).where(Media.owner_id == current_user.id)
+    rows = session.exec(apply_keyset(query, Media, cursor, size)).all()
+    items, next_cursor = keyset_page(rows, size)
+    return fast_response({"items": rows_to_dicts(items, selected), "size": size, "next_cursor": next_cursor})
+
+
+@router.get(
+    "/media/lists",
+    response_model=Union[CursorPaginatedMedia, CursorPaginatedMediaFields],
+    response_class=ORJSONResponse,
+)
+def list_media_all(
+    cursor: str | None = Query(None, description="Cursor returned as next_cursor by the previous page"),
+    size: int = Query(50, ge=1, le=100, description="Number of items per page"),
+    fields: str | None = Query(None, description=FIELDS_DESCRIPTION),
+    session: Session = Depends(get_session),
+):
+    selected = parse_fields(fields, MEDIA_READ_FIELDS)
+    # Served by ix_media_status_created_id
+    query = media_read_select(selected).where(Media.status == MediaStatus.ACTIVE)
+    rows = session.exec(apply_keyset(query, Media, cursor, size)).all()
+    items, next_cursor = keyset_page(rows, size)
+    return fast_response({"items": rows_to_dicts(items, selected), "size": size, "next_cursor": next_cursor})
 
 
-@router.get("/media/lists", response_model=List[MediaRead])
-def list_media_all(
-    skip: int = 0,
-    limit: int = 50,
+@router.get("/media/search", response_model=PaginatedMedia)
+def search_media_public(
+    q: str = Query(..., min_length=1, max_length=200, description="Search terms matched against title and description"),
+    page: int = Query(1, ge=1, description="Page number, starts from 1"),
+    size: int = Query(20, ge=1, le=100, description="Number of items per page"),
+    session: Session = Depends(get_session),
+):
+    items, total_count, total_is_exact = search_media(session, q, offset=(page - 1) * size, limit=size)
+    total_pages = (total_count + size - 1) // size if total_count > 0 else 0
+
+    return PaginatedMedia(
+        total_count=total_count,
+        page=page,
+        size=size,
+        items=items,
+        total_pages=total_pages,
+        total_is_exact=total_is_exact
+    )
+
+
+@router.get("/media/batch", response_model=MediaBatch)
+def get_media_batch(
+    ids: list[int] = Query(..., description="Media ids in display order, e.g. ?ids=3&ids=7"),
+    session: Session = Depends(get_session),
+    current_user: User | None = Depends(get_optional_user),
+):
+    if len(ids) > settings.MEDIA_BATCH_MAX_IDS:
+        raise HTTPException(status_code=400, detail=f"At most {settings.MEDIA_BATCH_MAX_IDS} ids per request.")
+
+    query = (
+        select(Media)
+        .where(Media.id.in_(set(ids)))
+        .options(selectinload(Media.category), selectinload(Media.user))
+    )
+    # Inactive media stay visible to their owner and to admins, as on the detail pages
+    if current_user is None:
+        query = query.where(Media.status == MediaStatus.ACTIVE)
+    elif current_user.role != UserRole.ADMIN:
+        query = query.where((Media.status == MediaStatus.ACTIVE) | (Media.owner_id == current_user.id))
+    found = {media.id: media for media in session.exec(query).all()}
+
+    requested = list(dict.fromkeys(ids))
+    return MediaBatch(
+        items=[found[media_id] for media_id in requested if media_id in found],
+        missing=[media_id for media_id in requested if media_id not in found],
+    )
+
+
+@router.get("/media/trending", response_model=RankedFeed)
+def trending_media(
+    category_id: int | None = Query(None, description="Restrict to one category"),
+    limit: int = Query(20, ge=1, le=100, description="Number of items"),
+    session: Session = Depends(get_session),
+):
+    # Snapshot written by the ranking job; no aggregation happens per request
+    computed_at, items = get_feed(session, TRENDING, category_id)
+    return RankedFeed(feed=TRENDING, category_id=category_id, computed_at=computed_at, items=items[:limit])
+
+
+@router.get("/media/popular", response_model=RankedFeed)
+def popular_media(
+    category_id: int | None = Query(None, description="Restrict to one category"),
+    limit: int = Query(20, ge=1, le=100, description="Number of items"),
     session: Session = Depends(get_session),
 ):
-    query = select(Media).where(Media.status == MediaStatus.ACTIVE).offset(skip).limit(limit)
-    media_list = session.exec(query).all()
-    return media_list
+    computed_at, items = get_feed(session, POPULAR, category_id)
+    return RankedFeed(feed=POPULAR, category_id=category_id, computed_at=computed_at, items=items[:limit])
 
 
 @router.get("/media/detail/{media_id}", response_model=MediaResponse)
 def get_media(
     media_id: int,
+    request: Request,
+    response: Response,
     session: Session = Depends(get_session),
     # current_user: User = Depends(get_current_user),
 ):
+    # Validate from version columns before loading comments and counting reactions
+    etag = media_etag(session, media_id)
+    if etag is None:
+        raise HTTPException(status_code=404, detail="Media not found")
+    if etag_matches(request, etag):
+        return not_modified(etag, settings.MEDIA_CACHE_CONTROL)
+    set_cache_headers(response, etag, settings.MEDIA_CACHE_CONTROL)
+
     media = session.exec(select(Media).where(Media.id == media_id).options(selectinload(Media.category))).first()
     if not media:
         raise HTTPException(status_code=404, detail="Media not found")
@@ -716,74 +853,86 @@ def get_media(
     )
 
 
-# @router.get("/media/{media_id}/details", response_model=MediaWithRelatedCategoryMedia)
-@router.get("/media/{media_id}/details")
-def get_media(
-    media_id: int,
-    session: Session = Depends(get_session),
-    # current_user: User = Depends(get_current_user),
-):
-    media = session.exec(select(Media).where(Media.id == media_id)).first()
+def _render_media_details(media_id: int) -> Optional[tuple[bytes, str]]:
+    """Body and ETag of /media/{id}/details, rendered once per cache fill."""
+    with Session(engine) as session:
+        media = session.exec(select(Media).where(Media.id == media_id)).first()
 
-    if not media:
-        raise HTTPException(status_code=404, detail="Media not found")
-   
-    # Comments
-    comments = session.exec(
-        select(Comment).where(Comment.media_id == media_id).order_by(Comment.created_at.desc())
-    ).all()
+        if not media:
+            return None
 
-    likes_count = session.exec(
-        select(func.count()).where(MediaReaction.media_id == media_id, MediaReaction.is_like == True)
-    ).one()
+        # Comments
+        comments = session.exec(
+            select(Comment).where(Comment.media_id == media_id).order_by(Comment.created_at.desc())
+        ).all()
 
-    dislikes_count = session.exec(
-        select(func.count()).where(MediaReaction.media_id == media_id, MediaReaction.is_like == False)
-    ).one()
+        likes_count = session.exec(
+            select(func.count()).where(MediaReaction.media_id == media_id, MediaReaction.is_like == True)
+        ).one()
 
-    related_media = session.exec(
-        select(Media)
-        .where(
-            (Media.category_id == media.category_id) & 
-            (Media.id != media_id)                     
-        )
-        .options(selectinload(Media.category))
-    ).all()
+        dislikes_count = session.exec(
+            select(func.count()).where(MediaReaction.media_id == media_id, MediaReaction.is_like == False)
+        ).one()
 
-    media_read = MediaRead.model_validate(media)
+        related_media = get_related_media(session, media)
 
-    comment_responses = []
-    for c in comments:
-        # ✅ Fetch owner info
-        owner = session.exec(select(User).where(User.id == c.user_id)).first()
-        owner_data = UserRead.model_validate(owner)
+        media_read = MediaRead.model_validate(media)
 
-        # ✅ Fetch reactions for this comment
-        reactions = session.exec(select(CommentReaction).where(CommentReaction.comment_id == c.id)).all()
-        reaction_data = [CommentReactionsData.model_validate(r) for r in reactions]
+        comment_responses = []
+        for c in comments:
+            # ✅ Fetch owner info
+            owner = session.exec(select(User).where(User.id == c.user_id)).first()
+            owner_data = UserRead.model_validate(owner)
 
-        # ✅ Build response object
-        comment_responses.append(
-            CommentResponse(
-                id=c.id,
-                user_id=c.user_id,
-                content=c.content,
-                created_at=c.created_at,
-                user=owner_data,
-                reactions=reaction_data
+            # ✅ Fetch reactions for this comment
+            reactions = session.exec(select(CommentReaction).where(CommentReaction.comment_id == c.id)).all()
+            reaction_data = [CommentReactionsData.model_validate(r) for r in reactions]
+
+            # ✅ Build response object
+            comment_responses.append(
+                CommentResponse(
+                    id=c.id,
+                    user_id=c.user_id,
+                    content=c.content,
+                    created_at=c.created_at,
+                    user=owner_data,
+                    reactions=reaction_data
+                )
             )
-        )
 
-    return {
-        'media': media_read,
-        'reactions': MediaReactionSummary(
-            likes=likes_count,
-            dislikes=dislikes_count
-        ),
-        'comments': comment_responses,
-        # 'related_media': related_media,
-        "related_media": [MediaRead.model_validate(m) for m in related_media]
-    }
+        body = orjson.dumps(jsonable_encoder({
+            'media': media_read,
+            'reactions': MediaReactionSummary(
+                likes=likes_count,
+                dislikes=dislikes_count
+            ),
+            'comments': comment_responses,
+            # 'related_media': related_media,
+            "related_media": [MediaRead.model_validate(m) for m in related_media]
+        }))
+        # After get_related_media, which may have just refreshed the related list
+        etag = media_etag(session, media_id, with_comment_authors=True, with_related=True)
+        return body, etag
+
+
+# @router.get("/media/{media_id}/details", response_model=MediaWithRelatedCategoryMedia)
+@router.get("/media/{media_id}/details")
+def get_media(
+    media_id: int,
+    request: Request,
+    # current_user: User = Depends(get_current_user),
+):
+    # Public page: served from the shared response cache, one render per key however many requests miss
+    cached = response_cache.get_or_compute(media_details_key(media_id), lambda: _render_media_details(media_id))
+    if cached is None:
+        raise HTTPException(status_code=404, detail="Media not found")
+    if etag_matches(request, cached.etag):
+        return not_modified(cached.etag, settings.MEDIA_CACHE_CONTROL)
+    return Response(
+        content=cached.body,
+        media_type="application/json",
+        headers={"ETag": cached.etag, "Cache-Control": settings.MEDIA_CACHE_CONTROL},
+    )
 
 
 
@@ -845,18 +994,23 @@ def delete_media(
     if media.owner_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized")
 
-    # Delete files from Cloudinary
+    # Delete files from storage
     try:
         if media.public_id:
-            cloudinary.uploader.destroy(media.public_id, resource_type="video")
+            storage.destroy(media.public_id, resource_type="video")
         if getattr(media, "thumbnail_public_id", None):
-            cloudinary.uploader.destroy(media.thumbnail_public_id, resource_type="image")
+            storage.destroy(media.thumbnail_public_id, resource_type="image")
     except Exception as e:
-        print(f"Cloudinary deletion failed: {e}")
+        print(f"Storage deletion failed: {e}")
 
     # Delete DB record
+    track_media_change(session, media.category_id, media.status, None, None)
+    record_media_change(session, (media.owner_id, media.category_id, media.status), None)
     session.delete(media)
     session.commit()
+    unindex_media(media_id)
+    unindex_suggestion(MEDIA, media_id)
+    invalidate_media_details([media_id])
 
     return {"message": "Media deleted successfully"}
 
@@ -876,22 +1030,16 @@ def users_list(
             detail="Only admins can view all users"
         )
     
-    statement = select(Media)
-
-    if search:
-        search_pattern = f"%{search}%"
-
-        statement = statement.where(
-            (Media.title.ilike(search_pattern)) | (Media.description.ilike(search_pattern))
-        )
-
-    total_count = session.exec(select(func.count()).select_from(statement)).one()
-
     offset = (page - 1) * size
 
-    statement = statement.order_by(Media.id).offset(offset).limit(size)
-
-    media = session.exec(statement).all()
+    if search:
+        # Ranked full-text match across every status instead of a sequential ILIKE scan
+        media, total_count, total_is_exact = search_media(session, search, offset=offset, limit=size, status=None)
+    else:
+        statement = select(Media)
+        total_count, total_is_exact = count_total(session, statement, table_name="media")
+        statement = statement.order_by(Media.id).offset(offset).limit(size)
+        media = session.exec(statement).all()
     
     total_pages = (total_count + size -1) // size if total_count > 0 else 0
     
@@ -900,12 +1048,42 @@ def users_list(
         page=page,
         size= size,
         items=media,
-        total_pages=total_pages
+        total_pages=total_pages,
+        total_is_exact=total_is_exact
+    )
+
+
+@router.get("/media-management/export")
+def media_export(
+    current_user: User = Depends(get_current_user),
+    fmt: Literal["csv", "ndjson"] = Query("csv", alias="format", description="csv or ndjson"),
+    search: str | None = Query(None, description="Same full-text filter as /media-management"),
+    session: Session = Depends(get_session),
+):
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admins can export media"
+        )
+
+    statement = select(
+        Media.id, Media.title, Media.description, Media.media_type, Media.status,
+        Media.category_id, Media.owner_id, Media.views, Media.duration,
+        Media.file_url, Media.thumbnail_url, Media.created_at, Media.updated_at,
+    )
+    if search:
+        statement = statement.where(search_filter(session, search))
+
+    return StreamingResponse(
+        stream_export(statement.order_by(Media.id), fmt),
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{export_filename("media", fmt)}"'},
     )
 
 
 @router.post("/media/change-status")
 def changeUserStatus(
+    background_tasks: BackgroundTasks,
     media_data: MediaStatusUpdate,
     current_user: User = Depends(get_current_user),
     session: Session = Depends(get_session),
@@ -913,10 +1091,23 @@ def changeUserStatus(
     media = session.exec(select(Media).where(Media.id == media_data.id)).first()
     if not media:
         raise HTTPException(status_code=404, detail="Media not found.")
+    track_media_change(session, media.category_id, media.status, media.category_id, media_data.status)
+    record_media_change(
+        session,
+        (media.owner_id, media.category_id, media.status),
+        (media.owner_id, media.category_id, media_data.status),
+    )
+    reactivated = media.status != MediaStatus.ACTIVE and media_data.status == MediaStatus.ACTIVE
     media.status = media_data.status
     session.add(media)
     session.commit()
     session.refresh(media)
+    index_media(media)
+    index_suggestion(MEDIA, media.id, media.title, media.status == MediaStatus.ACTIVE)
+    invalidate_media_details([media.id])
+    if reactivated:
+        # The list was not kept up while the media was hidden
+        background_tasks.add_task(refresh_related_media, media.id)
     return {"status": 200, "detail": "Status changed successfully."}
 
 
@@ -938,18 +1129,77 @@ def admin_delete_media(
         os.remove(media.thumbnail_url)
 
     # Remove from DB
+    track_media_change(session, media.category_id, media.status, None, None)
+    record_media_change(session, (media.owner_id, media.category_id, media.status), None)
     session.delete(media)
     session.commit()
+    unindex_media(media_id)
+    unindex_suggestion(MEDIA, media_id)
+    invalidate_media_details([media_id])
 
     return {"message": "Media deleted successfully"}
 
 
+def _require_admin_bulk(current_user: User, ids: list[int]):
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admins only")
+    if len(ids) > settings.MODERATION_MAX_IDS:
+        raise HTTPException(status_code=400, detail=f"At most {settings.MODERATION_MAX_IDS} ids per request.")
+
+
+@router.post("/admin-media/bulk-status", response_model=ModerationJobRead, status_code=status.HTTP_202_ACCEPTED)
+def admin_bulk_change_status(
+    payload: BulkMediaStatusUpdate,
+    background_tasks: BackgroundTasks,
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+):
+    _require_admin_bulk(current_user, payload.ids)
+    job = create_job(session, STATUS_CHANGE, len(set(payload.ids)), current_user.id)
+    background_tasks.add_task(bulk_change_status, job.id, payload.ids, payload.status)
+    return job
+
+
+@router.post("/admin-media/bulk-delete", response_model=ModerationJobRead, status_code=status.HTTP_202_ACCEPTED)
+def admin_bulk_delete_media(
+    payload: BulkMediaDelete,
+    background_tasks: BackgroundTasks,
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+):
+    _require_admin_bulk(current_user, payload.ids)
+    job = create_job(session, DELETE, len(set(payload.ids)), current_user.id)
+    background_tasks.add_task(bulk_delete, job.id, payload.ids)
+    return job
+
+
+@router.get("/admin-media/jobs/{job_id}", response_model=ModerationJobRead)
+def admin_moderation_job(
+    job_id: str,
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+):
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admins only")
+    job = get_job(session, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found.")
+    return job
+
+
 @router.get("/media-view/{media_id}", response_model=MediaRead)
 def get_media(
     media_id: int,
+    request: Request,
+    response: Response,
     session: Session = Depends(get_session),
     current_user: User = Depends(get_current_user),
 ):
+    etag = media_etag(session, media_id)
+    if etag is not None and etag_matches(request, etag):
+        return not_modified(etag, settings.PRIVATE_CACHE_CONTROL)
+    if etag is not None:
+        set_cache_headers(response, etag, settings.PRIVATE_CACHE_CONTROL)
     # media = session.exec(select(Media).where(Media.id == media_id).options(selectinload(Media.category))).first()
     media = session.exec(select(Media).where(Media.id == media_id)).first()
     if not media:
@@ -960,11 +1210,9 @@ def get_media(
 
 @router.post("/media/views/{media_id}")
 def increment_media_views(media_id: int, session: Session = Depends(get_session)):
-    media = session.exec(select(Media).where(Media.id == media_id)).first()
-    if not media:
+    # Primary key lookup only; the view itself is buffered in memory and the
+    # view_flush job writes minute buckets and Media.views in batches
+    if session.exec(select(Media.id).where(Media.id == media_id)).first() is None:
         raise HTTPException(status_code=404, detail="Media not found")
-    media.views += 1
-    session.add(media)
-    session.commit()
-    session.refresh(media)
+    record_view(media_id)
     return {'message': "Media views incremented"}
\ No newline at end of file
@@ -5,6 +5,8 @@ from database import get_session
 from models.user import User
 from models.media_interaction import Comment, MediaReaction
 from services.auth_service import get_current_user
+from services.etag_service import bump_interaction_version
+from services.response_cache import invalidate_media_details
 from schemas.media_interaction import LikeDisLikeRequest, CommentRequest
 from schemas.media_response import CommentResponse
 from typing import List
@@ -18,7 +20,9 @@ def add_comment(media_id: int, payload: CommentRequest, session: Session = Depen
     
     comment = Comment(user_id = current_user.id, media_id=media_id, content=payload.content)
     session.add(comment)
+    bump_interaction_version(session, media_id)
     session.commit()
+    invalidate_media_details([media_id])
     session.refresh(comment)
     return {'message': "Comment added successfully."}
 
@@ -37,21 +41,22 @@ def toggle_reaction(media_id: int, payload: LikeDisLikeRequest, session: Session
         )
     ).first()
 
+    bump_interaction_version(session, media_id)
     if existing:
         if existing.is_like == payload.is_like:
             session.delete(existing)
-            session.commit()
-            return {"message": "Reaction removed"}
+            message = "Reaction removed"
         else:
             existing.is_like = payload.is_like
             session.add(existing)
-            session.commit()
-            return {"message": "Reaction updated"}
+            message = "Reaction updated"
     else:
         reaction = MediaReaction(user_id = current_user.id, media_id=media_id, is_like=payload.is_like)
         session.add(reaction)
-        session.commit()
-        return {"message": "Reaction added"}
+        message = "Reaction added"
+    session.commit()
+    invalidate_media_details([media_id])
+    return {"message": message}
     
 
 @router.get("/media/{media_id}/reactions")
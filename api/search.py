@@ -0,0 +1,23 @@
+from fastapi import APIRouter, Depends, Query
+from sqlmodel import Session
+
+from database import get_session
+from schemas.search import SuggestResponse, Suggestion
+from services.suggest_service import suggest
+
+router = APIRouter()
+
+@router.get("/search/suggest", response_model=SuggestResponse)
+def search_suggest(
+    q: str = Query(..., min_length=1, max_length=100, description="Partial text typed by the user"),
+    limit: int = Query(8, ge=1, le=20, description="Maximum number of suggestions"),
+    session: Session = Depends(get_session),
+):
+    results = suggest(session, q, limit)
+    return SuggestResponse(
+        query=q,
+        suggestions=[
+            Suggestion(type=kind, id=item_id, label=label, score=round(score, 4))
+            for kind, item_id, label, score in results
+        ],
+    )
@@ -1,21 +1,79 @@
-from fastapi import FastAPI, HTTPException, APIRouter, Depends
+from fastapi import FastAPI, HTTPException, APIRouter, Depends, Query
 from sqlmodel import Session, select
 from database import get_session
 from services.auth_service import get_current_user
 from models.user import User
 from models.subscription import Subscription
+from core.config import settings
+from schemas.subscription import FollowState
+from schemas.user import PaginatedSubscribers, SubscriberRead
+from services.feed_service import backfill_inbox, clear_inbox
+from services.subscription_service import adjust_subscription_counts, followed_creators
 
 router = APIRouter()
 
 @router.post("/user/{user_id}/subscribe")
 def user_subscribe(user_id: int, session: Session = Depends(get_session), current_user: User = Depends(get_current_user)):
-    existSubscription = session.exec(select(Subscription).where(Subscription.subscriber_id == current_user.id)).first()
+    if not session.get(User, user_id):
+        raise HTTPException(status_code=404, detail="User not found.")
+
+    # Served by the unique (subscriber_id, creator_id) index
+    existSubscription = session.exec(
+        select(Subscription).where(Subscription.subscriber_id == current_user.id, Subscription.creator_id == user_id)
+    ).first()
     if existSubscription:
         session.delete(existSubscription)
+        clear_inbox(session, current_user.id, user_id)
+        adjust_subscription_counts(session, current_user.id, user_id, -1)
         session.commit()
         return {'message': "Unsubscribed successfully."}
     else:
         subscription = Subscription(subscriber_id=current_user.id, creator_id = user_id)
         session.add(subscription)
+        backfill_inbox(session, current_user.id, user_id)
+        adjust_subscription_counts(session, current_user.id, user_id, 1)
         session.commit()
-        return {'message': "Subscribed successfully."}
\ No newline at end of file
+        return {'message': "Subscribed successfully."}
+
+
+@router.get("/user/subscriptions/status", response_model=FollowState)
+def subscription_status(
+    ids: list[int] = Query(..., description="Creator ids to resolve, e.g. ?ids=3&ids=7"),
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+):
+    if len(ids) > settings.FOLLOW_STATE_MAX_IDS:
+        raise HTTPException(status_code=400, detail=f"At most {settings.FOLLOW_STATE_MAX_IDS} ids per request.")
+
+    following = followed_creators(session, current_user.id, ids)
+    return FollowState(following={creator_id: creator_id in following for creator_id in ids})
+
+
+@router.get("/user/{user_id}/subscribers", response_model=PaginatedSubscribers)
+def list_subscribers(
+    user_id: int,
+    cursor: int | None = Query(None, description="next_cursor from the previous page"),
+    size: int = Query(20, ge=1, le=100, description="Number of items per page"),
+    session: Session = Depends(get_session),
+):
+    creator = session.get(User, user_id)
+    if not creator:
+        raise HTTPException(status_code=404, detail="User not found.")
+
+    # Keyset on subscriptions(creator_id, id), newest subscriptions first; public columns only
+    statement = (
+        select(User.id, User.name, User.about, User.profile_pic_url, User.subscriber_count, Subscription.id.label("subscription_id"))
+        .join(Subscription, Subscription.subscriber_id == User.id)
+        .where(Subscription.creator_id == user_id)
+    )
+    if cursor is not None:
+        statement = statement.where(Subscription.id < cursor)
+    rows = session.exec(statement.order_by(Subscription.id.desc()).limit(size + 1)).all()
+
+    page = rows[:size]
+    return PaginatedSubscribers(
+        items=[SubscriberRead.model_validate(row) for row in page],
+        size=size,
+        total_count=creator.subscriber_count,
+        next_cursor=page[-1].subscription_id if len(rows) > size else None,
+    )
\ No newline at end of file
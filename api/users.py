@@ -1,16 +1,25 @@
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form, Query
+from fastapi.responses import StreamingResponse
 import os
-from sqlmodel import Session, select, func
+from sqlmodel import Session, select
 from datetime import datetime
 
 from database import get_session
 from services.auth_service import get_current_user, require_admin
-from models.user import User, UserStatusUpdate
+from models.user import User, UserStatusUpdate, UserStatus
 from services.file_service import safe_filename, save_upload_file, save_upload_file_async
-from typing import List
-from schemas.user import PaginatedUsers, UserRole, UserRead
+from typing import List, Literal, Union
+from schemas.user import PaginatedUsers, PaginatedUserFields, UserRole, UserRead
 from core.config import settings
-from core.cloudinary_config import cloudinary
+from core.storage import storage
+from services.count_service import count_total
+from services.stats_service import record_user_change
+from services.suggest_service import index_suggestion, unindex_suggestion, CREATOR
+from services.export_service import stream_export, export_filename, MEDIA_TYPES
+from services.serialization import (
+    user_read_select, rows_to_dicts, fast_response, parse_fields, ORJSONResponse,
+    USER_FIELDS, FIELDS_DESCRIPTION,
+)
 
 router = APIRouter()
 
@@ -74,13 +83,14 @@ def update_profile(
         try:
             if current_user.profile_pic_public_id:
                 try:
-                    cloudinary.uploader.destroy(current_user.profile_pic_public_id)
+                    storage.destroy(current_user.profile_pic_public_id)
                 except Exception as delete_error:
                     print(f"⚠️ Failed to delete old profile pic: {delete_error}")
 
-            res = cloudinary.uploader.upload(
+            res = storage.upload(
                 profile_pic.file,
                 folder=f"mediahub/profile_pics/{current_user.id}",
+                filename=profile_pic.filename,
                 transformation=[{"width": 600, "height": 600, "crop": "limit"}],  
                 overwrite=True
             )
@@ -94,16 +104,23 @@ def update_profile(
     session.add(current_user)
     session.commit()
     session.refresh(current_user)
+    if current_user.role != UserRole.ADMIN:
+        index_suggestion(CREATOR, current_user.id, current_user.name, current_user.status == UserStatus.ACTIVE)
 
     return current_user
 
 
-@router.get("/users", response_model=PaginatedUsers)
+@router.get(
+    "/users",
+    response_model=Union[PaginatedUsers, PaginatedUserFields],
+    response_class=ORJSONResponse,
+)
 def users_list(
     current_user: User = Depends(get_current_user),
     page: int = Query(1, ge=1, description="Page number, starts from 1"),
     size: int = Query(10, ge=1, le=100, description="Number of items per page"),
     search: str | None = Query(None, description="Search term to filter users by name or email (case-insensitive)"),
+    fields: str | None = Query(None, description=FIELDS_DESCRIPTION),
     session: Session = Depends(get_session),
 ):
     if current_user.role != UserRole.ADMIN:
@@ -111,34 +128,70 @@ def users_list(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Only admins can view all users"
         )
+    selected = parse_fields(fields, USER_FIELDS)
 
-    statement = select(User).where(User.role != UserRole.ADMIN)
+    filters = [User.role != UserRole.ADMIN]
 
     if search:
         search_pattern = f"%{search}%"
 
-        statement = statement.where(
+        filters.append(
             (User.name.ilike(search_pattern)) | (User.email.ilike(search_pattern))
         )
 
-    total_count = session.exec(select(func.count()).select_from(statement)).one()
+    # Unfiltered listings cover the whole table, let the count layer estimate them
+    total_count, total_is_exact = count_total(
+        session, select(User).where(*filters), table_name=None if search else "users"
+    )
 
     offset = (page - 1) * size
 
-    statement = statement.order_by(User.id).offset(offset).limit(size)
+    statement = user_read_select(selected).where(*filters).order_by(User.id).offset(offset).limit(size)
 
     users = session.exec(statement).all()
     
     total_pages = (total_count + size - 1) // size if total_count > 0 else 0
 
-    return PaginatedUsers(
-        total_count=total_count,
-        page=page,
-        size= size,
-        items=users,
-        total_pages=total_pages
+    return fast_response({
+        "total_count": total_count,
+        "page": page,
+        "size": size,
+        "items": rows_to_dicts(users),
+        "total_pages": total_pages,
+        "total_is_exact": total_is_exact,
+    })
+
+
+# Declared before /users/{user_id} so "export" is not parsed as an id
+@router.get("/users/export")
+def users_export(
+    current_user: User = Depends(get_current_user),
+    fmt: Literal["csv", "ndjson"] = Query("csv", alias="format", description="csv or ndjson"),
+    search: str | None = Query(None, description="Same filter as /users: name or email (case-insensitive)"),
+):
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admins can export users"
+        )
+
+    statement = select(
+        User.id, User.name, User.email, User.status, User.about,
+        User.subscriber_count, User.subscription_count, User.created_at, User.updated_at,
+    ).where(User.role != UserRole.ADMIN)
+    if search:
+        search_pattern = f"%{search}%"
+        statement = statement.where(
+            (User.name.ilike(search_pattern)) | (User.email.ilike(search_pattern))
+        )
+
+    return StreamingResponse(
+        stream_export(statement.order_by(User.id), fmt),
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{export_filename("users", fmt)}"'},
     )
 
+
 @router.get("/users/{user_id}", response_model=UserRead)
 def user_view(user_id: int, current_user: User = Depends(get_current_user), session: Session = Depends(get_session)):
     user = session.exec(select(User).where(User.id == user_id)).first()
@@ -156,10 +209,14 @@ def changeUserStatus(
     user = session.exec(select(User).where(User.id == user_data.id)).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found.")
+    if user.role != UserRole.ADMIN:
+        record_user_change(session, user.status, user_data.status)
     user.status = user_data.status
     session.add(user)
     session.commit()
     session.refresh(user)
+    if user.role != UserRole.ADMIN:
+        index_suggestion(CREATOR, user.id, user.name, user.status == UserStatus.ACTIVE)
     return {"status": 200, "detail": "Status changed successfully."}
 
 @router.delete("/user/delete/{user_id}")
@@ -176,8 +233,11 @@ def user_delete(user_id: int, current_user: User = Depends(get_current_user), se
             except Exception as e:
                 print(f"Warning: Failed to delete {file_path}: {e}")
 
+    if user.role != UserRole.ADMIN:
+        record_user_change(session, user.status, None)
     session.delete(user)
     session.commit()
+    unindex_suggestion(CREATOR, user_id)
     return {"status": 200, "detail": "User deleted successfully."}
     
     
\ No newline at end of file
@@ -0,0 +1,7 @@
+"""
+Load-testing harness: a synthetic dataset generator (dataset.py), scripted
+user journeys (journeys.py) and a runner that drives the real app in-process
+or over HTTP and reports per-route throughput and latency percentiles:
+
+    python -m benchmarks.loadtest --help
+"""
@@ -0,0 +1,252 @@
+"""
+Synthetic dataset for load tests: users, categories, media, comments,
+reactions and subscriptions with production-like skew. Media views are
+Pareto-distributed, and a Zipf curve over creators concentrates uploads and
+followers on a few accounts. Comments and reactions follow views, so the
+popular items are also the busy ones.
+
+Rows are bulk-inserted with explicit ids, then the derived state the app
+keeps (feed inboxes, stat / category / subscription counters, ranking
+snapshots) is built the same way the app builds it.
+
+Every account uses PASSWORD; ADMIN_EMAIL is an admin. Run directly to seed
+the database the app is configured for:
+
+    python -m benchmarks.loadtest.dataset --users 5000 --media 50000 [--reset]
+"""
+import argparse
+import random
+import time
+from dataclasses import dataclass, fields
+from datetime import datetime, timedelta
+from itertools import accumulate
+
+from sqlalchemy import func, text
+from sqlmodel import Session, SQLModel, select
+
+PASSWORD = "loadtest-password"
+ADMIN_EMAIL = "admin@loadtest.dev"
+CHUNK = 5000
+
+WORDS = (
+    "live acoustic session guitar piano tutorial review travel vlog recipe street food city night "
+    "drone footage interview podcast episode highlights remix cover lesson beginner advanced workout "
+    "morning routine documentary trailer behind scenes studio jazz lofi ambient football match analysis"
+).split()
+
+
+@dataclass
+class DatasetConfig:
+    users: int = 1000
+    categories: int = 20
+    media: int = 10000
+    comments: int = 30000
+    reactions: int = 60000
+    comment_reactions: int = 10000
+    subscriptions: int = 20000
+    # Pareto shape of media views: lower means a heavier tail
+    views_alpha: float = 1.16
+    # Zipf exponent over creators for uploads and followers
+    creator_skew: float = 1.1
+    inactive_ratio: float = 0.05
+    seed: int = 42
+
+
+def user_email(user_id: int) -> str:
+    return ADMIN_EMAIL if user_id == 1 else f"user{user_id}@loadtest.dev"
+
+
+def _zipf_cum_weights(count: int, skew: float, rng: random.Random) -> tuple[list[int], list[float]]:
+    """Items in random order with cumulative Zipf weights, for rng.choices(..., cum_weights=...)."""
+    items = list(range(count))
+    rng.shuffle(items)
+    return items, list(accumulate(1 / (rank + 1) ** skew for rank in range(count)))
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choices(WORDS, k=words)).capitalize()
+
+
+def _insert(session: Session, model, rows: list[dict]):
+    for start in range(0, len(rows), CHUNK):
+        session.execute(model.__table__.insert(), rows[start:start + CHUNK])
+
+
+def generate(engine, config: DatasetConfig, log=print):
+    # Imported here so callers can point DATABASE_URL at the target database first
+    from core.config import settings
+    from models.category import Category, CategoryStatus
+    from models.comment_interaction import CommentReaction
+    from models.feed import FeedInbox, FeedPullCreator
+    from models.media import Media, MediaStatus
+    from models.media_interaction import Comment, MediaReaction
+    from models.subscription import Subscription
+    from models.user import User, UserRole, UserStatus
+    from services.auth_service import get_password_hash
+    from services.ranking_service import refresh_rankings
+    from services.stats_service import reconcile_stats
+
+    rng = random.Random(config.seed)
+    now = datetime.utcnow()
+    started = time.perf_counter()
+
+    with Session(engine) as session:
+        if session.exec(select(func.count(User.id))).one():
+            raise SystemExit("Target database already has users; use an empty one (or --reset on SQLite).")
+
+        # One Argon2 hash shared by every account, hashing per user would dominate seeding
+        hashed_password = get_password_hash(PASSWORD)
+        user_count = config.users + 1
+        _insert(session, User, [
+            dict(
+                id=user_id, name=f"Load User {user_id}", email=user_email(user_id), hashed_password=hashed_password,
+                role=UserRole.ADMIN if user_id == 1 else UserRole.USER, status=UserStatus.ACTIVE,
+                about=_sentence(rng, 8), created_at=now - timedelta(days=rng.uniform(0, 730)), updated_at=now,
+            )
+            for user_id in range(1, user_count + 1)
+        ])
+        _insert(session, Category, [
+            dict(id=category_id, name=f"{rng.choice(WORDS).capitalize()} {category_id}",
+                 description=_sentence(rng, 6), status=CategoryStatus.ACTIVE, media_count=0)
+            for category_id in range(1, config.categories + 1)
+        ])
+        log(f"users: {user_count}, categories: {config.categories}")
+
+        creators, creator_weights = _zipf_cum_weights(config.users, config.creator_skew, rng)
+        creator_ids = [index + 2 for index in creators]
+        category_ids, category_weights = _zipf_cum_weights(config.categories, 0.8, rng)
+
+        media_rows = []
+        for media_id in range(1, config.media + 1):
+            # Recent uploads are denser than old ones
+            created_at = now - timedelta(days=365 * rng.random() ** 2, seconds=rng.uniform(0, 86400))
+            media_rows.append(dict(
+                id=media_id, title=_sentence(rng, rng.randint(3, 7)), description=_sentence(rng, 25),
+                media_type="video" if rng.random() < 0.85 else "audio",
+                file_url=f"https://cdn.loadtest.dev/v/{media_id}.mp4",
+                thumbnail_url=f"https://cdn.loadtest.dev/t/{media_id}.jpg",
+                public_id=f"v{media_id}", thumbnail_public_id=f"t{media_id}",
+                status=MediaStatus.INACTIVE if rng.random() < config.inactive_ratio else MediaStatus.ACTIVE,
+                owner_id=rng.choices(creator_ids, cum_weights=creator_weights)[0],
+                category_id=rng.choices(category_ids, cum_weights=category_weights)[0] + 1,
+                views=int((rng.paretovariate(config.views_alpha) - 1) * 50),
+                width=1920, height=1080, duration=rng.randint(30, 3600),
+                created_at=created_at, updated_at=created_at, interaction_version=0,
+            ))
+        _insert(session, Media, media_rows)
+        log(f"media: {config.media}")
+
+        # Engagement follows views
+        media_ids = [row["id"] for row in media_rows]
+        engagement = list(accumulate(row["views"] + 1 for row in media_rows))
+        created = {row["id"]: row["created_at"] for row in media_rows}
+
+        comment_rows = []
+        for comment_id, media_id in enumerate(rng.choices(media_ids, cum_weights=engagement, k=config.comments), 1):
+            at = created[media_id] + (now - created[media_id]) * rng.random()
+            comment_rows.append(dict(
+                id=comment_id, media_id=media_id, user_id=rng.randint(2, user_count),
+                content=_sentence(rng, rng.randint(4, 30)), created_at=at, updated_at=at,
+            ))
+        _insert(session, Comment, comment_rows)
+
+        reactions = set()
+        for media_id in rng.choices(media_ids, cum_weights=engagement, k=config.reactions):
+            reactions.add((rng.randint(2, user_count), media_id))
+        _insert(session, MediaReaction, [
+            dict(id=reaction_id, user_id=user_id, media_id=media_id, is_like=rng.random() < 0.9)
+            for reaction_id, (user_id, media_id) in enumerate(reactions, 1)
+        ])
+
+        comment_reactions = {
+            (rng.randint(2, user_count), rng.randint(1, config.comments))
+            for _ in range(config.comment_reactions if config.comments else 0)
+        }
+        _insert(session, CommentReaction, [
+            dict(id=reaction_id, user_id=user_id, comment_id=comment_id, is_like=rng.random() < 0.85)
+            for reaction_id, (user_id, comment_id) in enumerate(comment_reactions, 1)
+        ])
+        log(f"comments: {config.comments}, reactions: {len(reactions)}, comment reactions: {len(comment_reactions)}")
+
+        subscriptions = set()
+        for _ in range(config.subscriptions * 3):
+            if len(subscriptions) >= config.subscriptions:
+                break
+            subscriber_id = rng.randint(2, user_count)
+            creator_id = rng.choices(creator_ids, cum_weights=creator_weights)[0]
+            if subscriber_id != creator_id:
+                subscriptions.add((subscriber_id, creator_id))
+        _insert(session, Subscription, [
+            dict(id=subscription_id, subscriber_id=subscriber_id, creator_id=creator_id)
+            for subscription_id, (subscriber_id, creator_id) in enumerate(subscriptions, 1)
+        ])
+        log(f"subscriptions: {len(subscriptions)}")
+
+        # Feeds: same split as services.feed_service, pull-only above the fan-out limit
+        followers = select(Subscription.creator_id).group_by(Subscription.creator_id).having(
+            func.count(Subscription.id) > settings.FEED_FANOUT_MAX_FOLLOWERS
+        )
+        session.execute(FeedPullCreator.__table__.insert().from_select(
+            ["creator_id", "marked_at"], select(followers.subquery().c.creator_id, func.now())
+        ))
+        session.execute(FeedInbox.__table__.insert().from_select(
+            ["user_id", "media_id", "owner_id", "created_at"],
+            select(Subscription.subscriber_id, Media.id, Media.owner_id, Media.created_at)
+            .join(Media, Media.owner_id == Subscription.creator_id)
+            .where(Media.status == MediaStatus.ACTIVE, Subscription.creator_id.not_in(select(FeedPullCreator.creator_id))),
+        ))
+
+        if engine.dialect.name == "postgresql":
+            # Explicit ids leave the serial sequences behind
+            for table in ("users", "category", "media", "comments", "media_reactions", "comment_reactions", "subscriptions"):
+                session.execute(text(
+                    f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), COALESCE((SELECT MAX(id) FROM {table}), 1))"
+                ))
+        session.commit()
+
+    reconcile_stats()
+    refresh_rankings()
+    log(f"done in {time.perf_counter() - started:.1f}s")
+
+
+def add_arguments(parser: argparse.ArgumentParser):
+    defaults = DatasetConfig()
+    for field in fields(DatasetConfig):
+        parser.add_argument(f"--{field.name.replace('_', '-')}", type=type(getattr(defaults, field.name)),
+                            default=getattr(defaults, field.name))
+
+
+def config_from_args(args) -> DatasetConfig:
+    return DatasetConfig(**{field.name: getattr(args, field.name) for field in fields(DatasetConfig)})
+
+
+def prepare_schema(engine, reset: bool):
+    """SQLite: create (or with `reset`, recreate) the tables. Postgres: run the migrations."""
+    import models  # noqa: F401  (registers every table on SQLModel.metadata)
+
+    if engine.dialect.name == "postgresql":
+        from alembic import command
+        from alembic.config import Config
+
+        command.upgrade(Config("alembic.ini"), "head")
+        return
+    if reset:
+        SQLModel.metadata.drop_all(engine)
+    SQLModel.metadata.create_all(engine)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    add_arguments(parser)
+    parser.add_argument("--reset", action="store_true", help="SQLite only: drop and recreate every table first")
+    args = parser.parse_args()
+
+    from database import engine
+
+    engine.echo = False
+    prepare_schema(engine, args.reset)
+    generate(engine, config_from_args(args))
+
+
+if __name__ == "__main__":
+    main()
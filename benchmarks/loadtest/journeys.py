@@ -0,0 +1,153 @@
+"""
+Scripted user journeys. Each one is a short session a real client would run,
+issued through a VirtualUser that times every request under its route
+template ("GET /media/{media_id}/details"), so results group per route
+whatever ids were hit.
+
+Ids are picked from what earlier responses returned where the app exposes
+them (list pages, trending), so hot items get hit the way they would in
+production rather than uniformly.
+"""
+import random
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+
+import httpx
+
+from benchmarks.loadtest.dataset import PASSWORD, user_email
+
+WORDS = ["gu", "guitar", "piano", "live session", "street food", "jazz", "tutorial", "drone", "rev", "podcast"]
+
+
+@dataclass
+class Population:
+    """Id ranges of the seeded dataset; user 1 is the admin."""
+    users: int
+    media: int
+    categories: int
+
+
+@dataclass
+class Recorder:
+    latencies: dict[str, list[float]] = field(default_factory=lambda: defaultdict(list))
+    errors: dict[str, int] = field(default_factory=lambda: defaultdict(int))
+
+    def add(self, route: str, seconds: float, ok: bool):
+        self.latencies[route].append(seconds)
+        if not ok:
+            self.errors[route] += 1
+
+
+class VirtualUser:
+    def __init__(self, client: httpx.AsyncClient, recorder: Recorder, population: Population, rng: random.Random):
+        self.client = client
+        self.recorder = recorder
+        self.population = population
+        self.rng = rng
+        self.headers: dict[str, str] = {}
+        self.user_id: int | None = None
+
+    async def call(self, method: str, route: str, *, params=None, json=None, expect=(200,), **path) -> httpx.Response:
+        started = time.perf_counter()
+        response = await self.client.request(method, route.format(**path), params=params, json=json, headers=self.headers)
+        self.recorder.add(f"{method} {route}", time.perf_counter() - started, response.status_code in expect)
+        return response
+
+    async def login(self, user_id: int):
+        response = await self.call("POST", "/auth/login", json={"email": user_email(user_id), "password": PASSWORD})
+        if response.status_code == 200:
+            self.headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+            self.user_id = user_id
+
+    def random_user(self) -> int:
+        return self.rng.randint(2, self.population.users)
+
+    def pick(self, items: list[dict], fallback_max: int) -> int:
+        """An id from a page the client just saw, biased to the top, or any id when the page was empty."""
+        if items:
+            return items[min(int(self.rng.expovariate(0.3)), len(items) - 1)]["id"]
+        return self.rng.randint(1, fallback_max)
+
+
+async def browse(user: VirtualUser):
+    """Anonymous visitor: home page, a category, then a popular video."""
+    await user.call("GET", "/category/list")
+    page = await user.call("GET", "/media/lists", params={"size": 20})
+    items = page.json().get("items", []) if page.status_code == 200 else []
+    if items and page.json().get("next_cursor") and user.rng.random() < 0.3:
+        await user.call("GET", "/media/lists", params={"size": 20, "cursor": page.json()["next_cursor"]})
+
+    await user.call("GET", "/category/{category_id}/media", category_id=user.rng.randint(1, user.population.categories))
+    trending = await user.call("GET", "/media/trending")
+    if trending.status_code == 200 and user.rng.random() < 0.5:
+        items = trending.json().get("items", []) or items
+
+    media_id = user.pick(items, user.population.media)
+    await user.call("GET", "/media/{media_id}/details", media_id=media_id, expect=(200, 404))
+    await user.call("GET", "/media/{media_id}/comments", media_id=media_id, expect=(200, 404))
+    await user.call("POST", "/media/views/{media_id}", media_id=media_id, expect=(200, 404))
+
+
+async def viewer(user: VirtualUser):
+    """Signed-in viewer: feed, follow state, then likes, comments and follows on what they watch."""
+    await user.login(user.random_user())
+    feed = await user.call("GET", "/feed")
+    items = feed.json().get("items", []) if feed.status_code == 200 else []
+    if not items:
+        page = await user.call("GET", "/media/lists", params={"size": 20})
+        items = page.json().get("items", []) if page.status_code == 200 else []
+
+    owners = sorted({item["owner_id"] for item in items if item.get("owner_id")})[:20]
+    if owners:
+        await user.call("GET", "/user/subscriptions/status", params={"ids": owners})
+
+    media_id = user.pick(items, user.population.media)
+    await user.call("GET", "/media/{media_id}/details", media_id=media_id, expect=(200, 404))
+    if user.rng.random() < 0.4:
+        await user.call("POST", "/media/{media_id}/reaction", media_id=media_id,
+                        json={"is_like": user.rng.random() < 0.9}, expect=(200, 404))
+    if user.rng.random() < 0.15:
+        await user.call("POST", "/media/{media_id}/comments", media_id=media_id,
+                        json={"content": "Great video, thanks for sharing!"}, expect=(201, 404))
+    if owners and user.rng.random() < 0.1:
+        # Follow and unfollow, so the dataset stays the same size across runs
+        creator_id = user.rng.choice(owners)
+        for _ in range(2):
+            await user.call("POST", "/user/{user_id}/subscribe", user_id=creator_id, expect=(200, 400, 404))
+
+
+async def search(user: VirtualUser):
+    """Typing in the search box, then submitting."""
+    query = user.rng.choice(WORDS)
+    for length in sorted({2, len(query) // 2 + 1, len(query)}):
+        await user.call("GET", "/search/suggest", params={"q": query[:length]})
+    await user.call("GET", "/media/search", params={"q": query})
+
+
+async def creator(user: VirtualUser):
+    """A creator checking their channel."""
+    await user.login(user.random_user())
+    await user.call("GET", "/user-dashboard")
+    await user.call("GET", "/users/{user_id}/profile", user_id=user.user_id)
+    await user.call("GET", "/media/user/{user_id}", user_id=user.user_id)
+    await user.call("GET", "/media/list", params={"size": 20})
+    await user.call("GET", "/user/{user_id}/subscribers", user_id=user.user_id)
+
+
+async def admin(user: VirtualUser):
+    """Back-office pages."""
+    await user.login(1)
+    await user.call("GET", "/dashboard")
+    await user.call("GET", "/users", params={"size": 20})
+    await user.call("GET", "/media-management", params={"size": 20})
+
+
+JOURNEYS = {
+    "browse": browse,
+    "viewer": viewer,
+    "search": search,
+    "creator": creator,
+    "admin": admin,
+}
+DEFAULT_MIX = "browse=50,viewer=25,search=15,creator=8,admin=2"
@@ -0,0 +1,199 @@
+"""
+Drive the app with a weighted mix of journeys for a fixed time and report,
+per route, request count, errors, throughput and p50 / p95 / p99 latency.
+
+Modes:
+  asgi  in-process through httpx's ASGI transport: no sockets, measures the app itself
+  http  over real HTTP, against --base-url (e.g. `python -m core.server` in
+        production mode) or, without it, a single uvicorn worker in this process
+
+Needs the app's environment / .env; --database-url overrides DATABASE_URL,
+so the same run can target SQLite or a local Postgres:
+
+    python -m benchmarks.loadtest --database-url sqlite:///loadtest.db --generate --reset --media 20000
+    python -m benchmarks.loadtest --database-url postgresql://u:p@localhost:5434/loadtest --mode http \\
+        --base-url http://localhost:8000 --concurrency 50 --duration 60 --json results.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import threading
+import time
+
+import httpx
+
+from benchmarks.loadtest.dataset import add_arguments, config_from_args, generate, prepare_schema
+from benchmarks.loadtest.journeys import DEFAULT_MIX, JOURNEYS, Population, Recorder, VirtualUser
+
+TRANSPORT_ERROR = "transport error"
+
+
+def parse_mix(mix: str) -> tuple[list[str], list[float]]:
+    names, weights = [], []
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        if name.strip() not in JOURNEYS:
+            raise SystemExit(f"Unknown journey {name.strip()!r}, expected one of {', '.join(JOURNEYS)}")
+        names.append(name.strip())
+        weights.append(float(weight or 1))
+    return names, weights
+
+
+def percentile(ordered: list[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, max(0, round(q / 100 * len(ordered)) - 1))]
+
+
+def summarize(recorder: Recorder, elapsed: float) -> list[dict]:
+    rows = []
+    for route, samples in sorted(recorder.latencies.items()):
+        ordered = sorted(samples)
+        rows.append({
+            "route": route,
+            "count": len(ordered),
+            "errors": recorder.errors.get(route, 0),
+            "rps": round(len(ordered) / elapsed, 1),
+            "p50_ms": round(percentile(ordered, 50) * 1000, 2),
+            "p95_ms": round(percentile(ordered, 95) * 1000, 2),
+            "p99_ms": round(percentile(ordered, 99) * 1000, 2),
+            "max_ms": round(ordered[-1] * 1000, 2),
+        })
+    return rows
+
+
+def print_report(rows: list[dict], elapsed: float):
+    width = max([len(row["route"]) for row in rows] + [5])
+    print(f"\n{'route':<{width}} {'count':>7} {'err':>5} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for row in rows:
+        print(
+            f"{row['route']:<{width}} {row['count']:>7} {row['errors']:>5} {row['rps']:>8} "
+            f"{row['p50_ms']:>8} {row['p95_ms']:>8} {row['p99_ms']:>8} {row['max_ms']:>8}"
+        )
+    total = sum(row["count"] for row in rows)
+    errors = sum(row["errors"] for row in rows)
+    print(f"\n{total} requests in {elapsed:.1f}s: {total / elapsed:.1f} req/s, {errors} errors")
+
+
+async def drive(client: httpx.AsyncClient, population: Population, mix: str, concurrency: int,
+                duration: float, seed: int) -> tuple[Recorder, float]:
+    names, weights = parse_mix(mix)
+    recorder = Recorder()
+    deadline = time.monotonic() + duration
+
+    async def virtual_user(index: int):
+        rng = random.Random(seed + index)
+        while time.monotonic() < deadline:
+            user = VirtualUser(client, recorder, population, rng)
+            journey = rng.choices(names, weights)[0]
+            try:
+                await JOURNEYS[journey](user)
+            except httpx.HTTPError:
+                recorder.add(TRANSPORT_ERROR, 0.0, ok=False)
+
+    started = time.monotonic()
+    await asyncio.gather(*(virtual_user(i) for i in range(concurrency)))
+    return recorder, time.monotonic() - started
+
+
+def discover_population(engine) -> Population:
+    from sqlmodel import Session, func, select
+
+    from models.category import Category
+    from models.media import Media
+    from models.user import User
+
+    with Session(engine) as session:
+        return Population(
+            users=session.exec(select(func.max(User.id))).one() or 0,
+            media=session.exec(select(func.max(Media.id))).one() or 0,
+            categories=session.exec(select(func.max(Category.id))).one() or 0,
+        )
+
+
+def serve_in_thread(app):
+    import uvicorn
+
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning", access_log=False))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return server, f"http://127.0.0.1:{port}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the app with scripted user journeys.")
+    parser.add_argument("--database-url", help="overrides DATABASE_URL for seeding, discovery and in-process runs")
+    parser.add_argument("--mode", choices=["asgi", "http"], default="asgi")
+    parser.add_argument("--base-url", help="http mode: an already running server instead of an in-process one")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds of measured load")
+    parser.add_argument("--warmup", type=float, default=3.0, help="seconds of unmeasured load first")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"journey weights, default {DEFAULT_MIX}")
+    parser.add_argument("--json", help="also write the per-route results to this file")
+    parser.add_argument("--generate", action="store_true", help="seed the database first")
+    parser.add_argument("--reset", action="store_true", help="with --generate on SQLite: recreate every table")
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+    # Keep periodic jobs from competing with the measured traffic
+    os.environ.setdefault("BACKGROUND_JOBS_ENABLED", "false")
+
+    from database import engine
+
+    engine.echo = False
+    if args.generate:
+        prepare_schema(engine, args.reset)
+        generate(engine, config_from_args(args))
+    population = discover_population(engine)
+    if not population.media:
+        raise SystemExit("The database has no media; run with --generate first.")
+
+    server = None
+    if args.mode == "http" and args.base_url:
+        transport, base_url = None, args.base_url
+    else:
+        from main import app
+
+        if args.mode == "http":
+            server, base_url = serve_in_thread(app)
+            transport = None
+        else:
+            transport, base_url = httpx.ASGITransport(app=app), "http://loadtest"
+
+    async def run():
+        limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+        async with httpx.AsyncClient(transport=transport, base_url=base_url, timeout=60, limits=limits) as client:
+            if args.warmup:
+                await drive(client, population, args.mix, args.concurrency, args.warmup, args.seed + 10_000)
+            return await drive(client, population, args.mix, args.concurrency, args.duration, args.seed)
+
+    print(f"{args.mode} mode, {args.concurrency} virtual users for {args.duration:.0f}s against {engine.dialect.name} "
+          f"({population.users} users, {population.media} media)")
+    try:
+        recorder, elapsed = asyncio.run(run())
+    finally:
+        if server is not None:
+            server.should_exit = True
+
+    rows = summarize(recorder, elapsed)
+    print_report(rows, elapsed)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({
+                "mode": args.mode, "database": engine.dialect.name, "concurrency": args.concurrency,
+                "duration": round(elapsed, 2), "mix": args.mix, "routes": rows,
+            }, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Throughput of the local media mount: plain StaticFiles (what /static/media
+used to be) against MediaFileServer, for whole-segment fetches and for the
+small byte ranges players issue while seeking.
+
+Both apps serve the same temporary directory of fake HLS segments from a
+real uvicorn server on a free local port, so no .env or database is needed:
+
+    python -m benchmarks.media_server_bench [--segments 20] [--segment-kb 1024] [--requests 400] [--concurrency 16]
+"""
+import argparse
+import asyncio
+import os
+import random
+import socket
+import tempfile
+import threading
+import time
+from types import SimpleNamespace
+
+import httpx
+import uvicorn
+from starlette.staticfiles import StaticFiles
+
+from core.media_server import MediaFileServer
+
+SETTINGS = SimpleNamespace(
+    MEDIA_SEGMENT_CACHE_CONTROL="public, max-age=31536000, immutable",
+    MEDIA_PLAYLIST_CACHE_CONTROL="public, max-age=2",
+    MEDIA_FILE_CACHE_CONTROL="public, max-age=86400",
+    MEDIA_FD_CACHE_SIZE=256,
+)
+
+
+def make_segments(directory: str, count: int, size_kb: int) -> list[str]:
+    names = []
+    for i in range(count):
+        name = f"segment{i:03d}.ts"
+        with open(os.path.join(directory, name), "wb") as f:
+            f.write(os.urandom(size_kb * 1024))
+        names.append(name)
+    return names
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def serve(app) -> tuple[uvicorn.Server, str]:
+    port = free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning", access_log=False))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return server, f"http://127.0.0.1:{port}"
+
+
+async def run(base_url: str, names: list[str], size: int, requests: int, concurrency: int, ranged: bool):
+    queue = asyncio.Queue()
+    for _ in range(requests):
+        queue.put_nowait(random.choice(names))
+    transferred = 0
+
+    async def worker(client: httpx.AsyncClient):
+        nonlocal transferred
+        while not queue.empty():
+            name = queue.get_nowait()
+            headers = {}
+            if ranged:
+                start = random.randrange(0, size - 65536)
+                headers["range"] = f"bytes={start}-{start + 65535}"
+            response = await client.get(f"{base_url}/{name}", headers=headers)
+            assert response.status_code == (206 if ranged else 200), response.status_code
+            transferred += len(response.content)
+
+    started = time.perf_counter()
+    async with httpx.AsyncClient(limits=httpx.Limits(max_connections=concurrency)) as client:
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+    return time.perf_counter() - started, transferred
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--segments", type=int, default=20)
+    parser.add_argument("--segment-kb", type=int, default=1024)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        names = make_segments(directory, args.segments, args.segment_kb)
+        apps = {
+            "StaticFiles": StaticFiles(directory=directory),
+            "MediaFileServer": MediaFileServer(directory, SETTINGS),
+        }
+        print(f"{args.requests} requests, {args.concurrency} concurrent, {args.segment_kb} KiB segments")
+        for label, app in apps.items():
+            server, base_url = serve(app)
+            try:
+                for ranged in (False, True):
+                    elapsed, transferred = asyncio.run(
+                        run(base_url, names, args.segment_kb * 1024, args.requests, args.concurrency, ranged)
+                    )
+                    kind = "64 KiB range" if ranged else "full segment"
+                    print(
+                        f"{label:>16} {kind:>13}: {args.requests / elapsed:8.0f} req/s"
+                        f"  {transferred / elapsed / 2**20:8.1f} MiB/s"
+                    )
+            finally:
+                server.should_exit = True
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,306 @@
+"""
+Per-route performance regression suite (test_routes.py): every case runs a
+route a few times in process and checks its median latency and its query
+count against the budgets pinned in the case table, then against the
+recent history of the same machine.
+
+Runs offline: a seeded SQLite database (benchmarks.loadtest.dataset, built
+once and kept in the pytest cache), local file storage instead of
+Cloudinary, no background jobs and no mail.
+
+    python -m pytest benchmarks/perf [--perf-iterations 20] [--perf-tolerance 0.5] [--perf-history PATH]
+                                     [--perf-machine LABEL]
+
+Each run is appended to the history file (JSON, last HISTORY_LIMIT runs); a
+route fails when its median exceeds the median of the last passing runs on
+the same machine by more than the tolerance plus --perf-slack-ms. The machine
+is --perf-machine, else $PERF_MACHINE, else the host name, architecture and
+Python version; only runs recorded under the same label form the baseline.
+
+The history file is not committed. On CI, where checkouts are fresh and host
+names random, give the runner type a stable label and carry the file between
+builds in the CI cache (or as an artifact of the last main build):
+
+    restore  benchmarks/perf/history.json  from the cache key "perf-history-<runner type>"
+    run      PERF_MACHINE=ci-<runner type> python -m pytest benchmarks/perf
+    save     benchmarks/perf/history.json  under the same key, also when the run failed
+
+Failed runs are recorded but never used as a baseline, so saving them is safe.
+Without a restored file the first build only records and compares nothing.
+"""
+import hashlib
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+from dataclasses import asdict
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from benchmarks.loadtest.dataset import DatasetConfig, PASSWORD, user_email  # noqa: E402  (no app imports)
+
+DATASET = DatasetConfig(
+    users=300, categories=12, media=3000, comments=6000, reactions=12000,
+    comment_reactions=2000, subscriptions=4000, seed=7,
+)
+HISTORY_LIMIT = 50
+
+# Required settings get offline placeholders; a real .env is not needed
+PLACEHOLDER_ENV = {
+    "POSTGRES_USER": "perf",
+    "POSTGRES_PASSWORD": "perf",
+    "POSTGRES_DB": "perf",
+    "SECRET_KEY": "perf-suite-secret-key-not-for-production",
+    "ALGORITHM": "HS256",
+    "ACCESS_TOKEN_EXPIRE_MINUTES": "60",
+    "ADMIN_EMAIL": "admin@perf.dev",
+    "ADMIN_PASSWORD": PASSWORD,
+    "ADMIN_NAME": "Perf Admin",
+    "MAIL_USERNAME": "perf@perf.dev",
+    "MAIL_PASSWORD": "perf",
+    "MAIL_FROM": "perf@perf.dev",
+    "MAIL_PORT": "587",
+    "MAIL_SERVER": "localhost",
+    "MAIL_FROM_NAME": "Perf",
+    "MAIL_STARTTLS": "false",
+    "MAIL_SSL_TLS": "false",
+    "USE_CREDENTIALS": "false",
+    "FRONTEND_ORIGINS": '["http://localhost"]',
+    "OWNER_EMAIL": "owner@perf.dev",
+}
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("perf", "per-route performance budgets")
+    group.addoption("--perf-iterations", type=int, default=15, help="measured requests per route")
+    group.addoption("--perf-warmup", type=int, default=2, help="unmeasured requests per route first")
+    group.addoption("--perf-tolerance", type=float, default=0.5,
+                    help="allowed slowdown against the history baseline, as a fraction")
+    group.addoption("--perf-slack-ms", type=float, default=2.0,
+                    help="absolute slack on top of the tolerance, so sub-millisecond routes don't flap")
+    group.addoption("--perf-baseline-runs", type=int, default=5, help="passing runs the baseline is the median of")
+    group.addoption("--perf-history", default=str(ROOT / "benchmarks" / "perf" / "history.json"))
+    group.addoption("--perf-no-record", action="store_true", help="compare against the history without appending")
+    group.addoption("--perf-machine", default=os.environ.get("PERF_MACHINE") or _host(),
+                    help="label the baseline is kept under; defaults to $PERF_MACHINE, then the host")
+
+
+def pytest_configure(config):
+    # Before anything imports core.config / database: both read the environment once
+    workdir = Path(tempfile.mkdtemp(prefix="perf-"))
+    config._perf_workdir = workdir
+    for name, value in PLACEHOLDER_ENV.items():
+        os.environ.setdefault(name, value)
+    os.environ.update({
+        "DATABASE_URL": f"sqlite:///{workdir / 'perf.db'}",
+        "UPLOAD_DIR": str(workdir / "uploads"),
+        "UPLOAD_MEDIA_DIR": str(workdir / "uploads" / "media"),
+        "UPLOAD_PROFILE_DIR": str(workdir / "uploads" / "profile"),
+        "STORAGE_BACKEND": "local",
+        "STORAGE_LOCAL_DIR": str(workdir / "storage"),
+        "BACKGROUND_JOBS_ENABLED": "false",
+        "RESPONSE_CACHE_BACKEND": "memory",
+    })
+
+
+def pytest_unconfigure(config):
+    workdir = getattr(config, "_perf_workdir", None)
+    if workdir is not None:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def _dataset_fingerprint() -> str:
+    """Changes with the dataset settings, the generator or any model, so a stale seed is never reused."""
+    digest = hashlib.sha256(json.dumps(asdict(DATASET), sort_keys=True).encode())
+    for path in sorted([*(ROOT / "models").glob("*.py"), ROOT / "benchmarks" / "loadtest" / "dataset.py"]):
+        digest.update(path.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+@pytest.fixture(scope="session")
+def engine(request):
+    """The app's engine over a private copy of the seeded database."""
+    database = request.config._perf_workdir / "perf.db"
+    seed = request.config.cache.mkdir("perf-db") / f"seed-{_dataset_fingerprint()}.db"
+    if seed.exists():
+        shutil.copyfile(seed, database)
+
+    from database import engine
+
+    engine.echo = False
+    if not seed.exists():
+        from benchmarks.loadtest.dataset import generate, prepare_schema
+
+        prepare_schema(engine, reset=True)
+        generate(engine, DATASET, log=lambda message: None)
+        engine.dispose()
+        shutil.copyfile(database, seed)
+    return engine
+
+
+class QueryCounter:
+    """Counts statements sent to the database while a request runs."""
+
+    def __init__(self, engine):
+        from sqlalchemy import event
+
+        self.count = 0
+        event.listen(engine, "after_cursor_execute", self._executed)
+
+    def _executed(self, *args):
+        self.count += 1
+
+
+@pytest.fixture(scope="session")
+def query_counter(engine):
+    return QueryCounter(engine)
+
+
+@pytest.fixture(scope="session")
+def client(engine):
+    from fastapi.testclient import TestClient
+
+    from main import app
+
+    # Not entered as a context manager: the lifespan would start the periodic jobs
+    return TestClient(app, base_url="http://perf")
+
+
+@pytest.fixture(scope="session")
+def ids(engine) -> dict:
+    """Stable ids the cases format their paths with: the busiest media, creator, comment and category."""
+    from sqlmodel import Session, func, select
+
+    from models.media import Media, MediaStatus
+    from models.media_interaction import Comment
+
+    with Session(engine) as session:
+        hot_media = session.exec(
+            select(Media.id).where(Media.status == MediaStatus.ACTIVE).order_by(Media.views.desc(), Media.id).limit(1)
+        ).one()
+        creator, category = session.exec(
+            select(Media.owner_id, Media.category_id).where(Media.id == hot_media)
+        ).one()
+        hot_comment = session.exec(
+            select(Comment.id).where(Comment.media_id == hot_media).order_by(Comment.id).limit(1)
+        ).first()
+        top_creators = session.exec(
+            select(Media.owner_id).group_by(Media.owner_id).order_by(func.count(Media.id).desc(), Media.owner_id).limit(20)
+        ).all()
+        batch = session.exec(select(Media.id).order_by(Media.views.desc(), Media.id).limit(24)).all()
+
+    viewer = next(user_id for user_id in range(2, DATASET.users + 2) if user_id != creator)
+    return {
+        "hot_media": hot_media,
+        "hot_comment": hot_comment,
+        "creator": creator,
+        "viewer": viewer,
+        "category": category,
+        "top_creators": top_creators,
+        "batch": batch,
+    }
+
+
+@pytest.fixture(scope="session")
+def auth_headers(client, ids) -> dict:
+    headers = {None: {}}
+    for role, user_id in (("admin", 1), ("creator", ids["creator"]), ("viewer", ids["viewer"])):
+        response = client.post("/auth/login", json={"email": user_email(user_id), "password": PASSWORD})
+        assert response.status_code == 200, response.text
+        headers[role] = {"Authorization": f"Bearer {response.json()['access_token']}"}
+    return headers
+
+
+def _load_history(path: str) -> list[dict]:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return []
+
+
+def _host() -> str:
+    return f"{platform.node()} {platform.machine()} py{platform.python_version()}"
+
+
+def _commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class PerfRecorder:
+    def __init__(self, config):
+        self.config = config
+        self.results: dict[str, dict] = {}
+        runs = [
+            run for run in _load_history(config.getoption("perf_history"))
+            if run.get("passed") and run.get("machine") == config.getoption("perf_machine")
+        ][-config.getoption("perf_baseline_runs"):]
+        self.baselines = {}
+        for route in {route for run in runs for route in run["routes"]}:
+            medians = [run["routes"][route]["median_ms"] for run in runs if route in run["routes"]]
+            self.baselines[route] = statistics.median(medians)
+
+    def allowed_ms(self, route: str) -> float | None:
+        baseline = self.baselines.get(route)
+        if baseline is None:
+            return None
+        return baseline * (1 + self.config.getoption("perf_tolerance")) + self.config.getoption("perf_slack_ms")
+
+    def save(self, passed: bool):
+        if not self.results or self.config.getoption("perf_no_record"):
+            return
+        path = self.config.getoption("perf_history")
+        history = _load_history(path)
+        history.append({
+            "timestamp": datetime.utcnow().isoformat(timespec="seconds"),
+            "commit": _commit(),
+            "machine": self.config.getoption("perf_machine"),
+            "iterations": self.config.getoption("perf_iterations"),
+            "passed": passed,
+            "routes": self.results,
+        })
+        with open(path, "w") as f:
+            json.dump(history[-HISTORY_LIMIT:], f, indent=2)
+
+
+@pytest.fixture(scope="session")
+def perf_recorder(request):
+    recorder = PerfRecorder(request.config)
+    request.config._perf_recorder = recorder
+    return recorder
+
+
+def pytest_sessionfinish(session, exitstatus):
+    recorder = getattr(session.config, "_perf_recorder", None)
+    if recorder is not None:
+        recorder.save(passed=exitstatus == 0)
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    recorder = getattr(config, "_perf_recorder", None)
+    if recorder is None or not recorder.results:
+        return
+    terminalreporter.section("route performance")
+    width = max(len(route) for route in recorder.results)
+    terminalreporter.write_line(f"{'route':<{width}} {'median ms':>10} {'p95 ms':>8} {'baseline':>9} {'queries':>8}")
+    for route, result in recorder.results.items():
+        baseline = recorder.baselines.get(route)
+        terminalreporter.write_line(
+            f"{route:<{width}} {result['median_ms']:>10} {result['p95_ms']:>8} "
+            f"{baseline if baseline is not None else '-':>9} {result['queries']:>8}"
+        )
+
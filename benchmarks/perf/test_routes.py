@@ -0,0 +1,194 @@
+"""
+Latency and query-count budgets per route, grouped by router. See conftest.py
+for how the suite runs and how the history baseline works.
+
+`budget_ms` caps the median latency and `max_queries` the statements of the
+costliest measured request (warm-up requests are not counted, so per-worker
+caches are normally warm). Latency budgets are ceilings with headroom for
+slower CI machines, the history comparison is what catches smaller
+regressions. Query counts are deterministic, so `max_queries` is set to the
+current count and works as a ceiling: a route may get cheaper, never dearer.
+When a change legitimately moves a number, update the case here in the same
+commit.
+"""
+import itertools
+import statistics
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+import pytest
+
+from benchmarks.loadtest.dataset import PASSWORD, user_email
+
+_unique = itertools.count()
+
+
+@dataclass(frozen=True)
+class Case:
+    router: str
+    method: str
+    # Formatted with the `ids` fixture, e.g. "/media/{hot_media}/details"
+    path: str
+    budget_ms: float
+    max_queries: int
+    as_user: Optional[str] = None  # "admin", "creator" or "viewer"
+    params: Optional[Callable[[dict], dict]] = None
+    # Request body per iteration, given the ids and a number unique to the request
+    json: Optional[Callable[[dict, int], dict]] = None
+    data: Optional[Callable[[dict, int], dict]] = None
+    files: Optional[Callable[[dict, int], dict]] = None
+    expect: tuple = (200,)
+    # Runs before every request, warm-up included, outside the timing
+    before: Optional[Callable[[dict], None]] = None
+    # Tells apart cases on the same route, e.g. with and without the response cache
+    variant: Optional[str] = None
+
+    @property
+    def route(self) -> str:
+        route = f"{self.method} {self.path}"
+        return f"{route} ({self.variant})" if self.variant else route
+
+
+def _video(ids, n):
+    return {"file": (f"clip-{n}.mp4", b"\0" * 64 * 1024, "video/mp4")}
+
+
+def _image(ids, n):
+    return {"bg_file": (f"background-{n}.jpg", b"\xff\xd8\xff" + b"\0" * 16 * 1024, "image/jpeg")}
+
+
+def _drop_cached_details(ids):
+    from services.response_cache import invalidate_media_details
+
+    invalidate_media_details([ids["hot_media"]])
+
+
+CASES = [
+    # auth: dominated by Argon2, one hash or verify per request
+    Case("auth", "POST", "/auth/login", 800, 1,
+         json=lambda ids, n: {"email": user_email(ids["viewer"]), "password": PASSWORD}),
+    Case("auth", "POST", "/user/register", 800, 5, expect=(201,),
+         json=lambda ids, n: {"name": f"Perf {n}", "email": f"perf{n}@perf.dev", "password": PASSWORD}),
+    Case("auth", "POST", "/auth/change-password", 1500, 3, as_user="viewer",
+         json=lambda ids, n: {"current_password": PASSWORD, "new_password": PASSWORD}),
+
+    # media
+    Case("media", "GET", "/media/lists", 30, 1, params=lambda ids: {"size": 20}),
+    Case("media", "GET", "/media/list", 30, 2, as_user="creator", params=lambda ids: {"size": 20}),
+    Case("media", "GET", "/media/search", 60, 3, params=lambda ids: {"q": "guitar"}),
+    Case("media", "GET", "/media/batch", 60, 3, params=lambda ids: {"ids": ids["batch"]}),
+    Case("media", "GET", "/media/trending", 25, 0),
+    Case("media", "GET", "/media/popular", 25, 0),
+    Case("media", "GET", "/media/detail/{hot_media}", 150, 7),
+    Case("media", "GET", "/media/{hot_media}/details", 40, 0),
+    # Every request renders: same N+1 over comments as /comments, pinned as is so it can only get better
+    Case("media", "GET", "/media/{hot_media}/details", 3000, 1692, before=_drop_cached_details, variant="uncached"),
+    Case("media", "GET", "/media-view/{hot_media}", 30, 5, as_user="viewer"),
+    Case("media", "POST", "/media/views/{hot_media}", 15, 1),
+    Case("media", "GET", "/media-management", 100, 26, as_user="admin", params=lambda ids: {"size": 20}),
+    Case("media", "POST", "/media/create", 250, 30, as_user="creator",
+         data=lambda ids, n: {"title": f"Perf upload {n}", "media_type": "video", "category_id": ids["category"]},
+         files=_video),
+
+    # media_interactions
+    # Loads each comment's author and reactions lazily (N+1): pinned as is so it can only get better
+    Case("media_interactions", "GET", "/media/{hot_media}/comments", 3000, 1126),
+    Case("media_interactions", "GET", "/media/{hot_media}/reactions", 35, 2),
+    Case("media_interactions", "POST", "/media/{hot_media}/comments", 40, 4, as_user="viewer", expect=(201,),
+         json=lambda ids, n: {"content": f"Perf comment {n}"}),
+    Case("media_interactions", "POST", "/media/{hot_media}/reaction", 40, 4, as_user="viewer",
+         json=lambda ids, n: {"is_like": True}),
+
+    # comment_interactions
+    Case("comment_interactions", "GET", "/comment/{hot_comment}/reactions", 25, 2),
+    Case("comment_interactions", "POST", "/comment/{hot_comment}/reaction", 35, 5, as_user="viewer",
+         json=lambda ids, n: {"is_like": True}),
+
+    # categories
+    Case("categories", "GET", "/category/list", 20, 1),
+    Case("categories", "GET", "/category/{category}/media", 30, 2),
+
+    # dashboard
+    Case("dashboard", "GET", "/dashboard", 25, 1, as_user="admin"),
+    Case("dashboard", "GET", "/user-dashboard", 25, 1, as_user="creator"),
+
+    # subscription: toggles, so iterations alternate subscribe (feed backfill) and unsubscribe
+    Case("subscription", "POST", "/user/{creator}/subscribe", 80, 8, as_user="viewer"),
+    Case("subscription", "GET", "/user/subscriptions/status", 25, 2, as_user="viewer",
+         params=lambda ids: {"ids": ids["top_creators"]}),
+    Case("subscription", "GET", "/user/{creator}/subscribers", 40, 2),
+
+    # general_api
+    Case("general_api", "GET", "/users/{creator}/profile", 25, 2),
+    Case("general_api", "GET", "/media/user/{creator}", 180, 1),
+    Case("general_api", "POST", "/user/{creator}/bg-profile-update", 45, 3, as_user="creator", files=_image),
+]
+
+
+def measure(client, query_counter, case: Case, url: str, ids: dict, warmup: int, iterations: int, request_kwargs) -> dict:
+    """Latency and worst-case query count over `iterations` requests; request_kwargs() builds each one."""
+    for _ in range(warmup):
+        if case.before:
+            case.before(ids)
+        client.request(case.method, url, **request_kwargs())
+
+    timings, queries, unexpected = [], 0, None
+    for _ in range(iterations):
+        if case.before:
+            case.before(ids)
+        kwargs = request_kwargs()
+        before = query_counter.count
+        started = time.perf_counter()
+        response = client.request(case.method, url, **kwargs)
+        timings.append(time.perf_counter() - started)
+        queries = max(queries, query_counter.count - before)
+        if response.status_code not in case.expect and unexpected is None:
+            unexpected = f"{response.status_code} {response.text[:300]}"
+
+    timings.sort()
+    return {
+        "median_ms": round(statistics.median(timings) * 1000, 3),
+        "p95_ms": round(timings[min(len(timings) - 1, max(0, round(0.95 * len(timings)) - 1))] * 1000, 3),
+        "queries": queries,
+        "unexpected": unexpected,
+    }
+
+
+@pytest.mark.parametrize("case", CASES, ids=[f"{case.router}: {case.route}" for case in CASES])
+def test_route_budget(case: Case, client, query_counter, ids, auth_headers, perf_recorder, request):
+    url = case.path.format(**ids)
+
+    def request_kwargs():
+        n = next(_unique)
+        kwargs = {"headers": auth_headers[case.as_user]}
+        if case.params:
+            kwargs["params"] = case.params(ids)
+        if case.json:
+            kwargs["json"] = case.json(ids, n)
+        if case.data:
+            kwargs["data"] = case.data(ids, n)
+        if case.files:
+            kwargs["files"] = case.files(ids, n)
+        return kwargs
+
+    result = measure(
+        client, query_counter, case, url, ids,
+        request.config.getoption("perf_warmup"), request.config.getoption("perf_iterations"), request_kwargs,
+    )
+    unexpected = result.pop("unexpected")
+    perf_recorder.results[case.route] = {"router": case.router, **result}
+
+    assert unexpected is None, f"{case.route} answered {unexpected}, expected {list(case.expect)}"
+    assert result["queries"] <= case.max_queries, (
+        f"{case.route} ran {result['queries']} queries, budget {case.max_queries}"
+    )
+    assert result["median_ms"] <= case.budget_ms, (
+        f"{case.route} median {result['median_ms']} ms, budget {case.budget_ms} ms"
+    )
+    allowed = perf_recorder.allowed_ms(case.route)
+    if allowed is not None:
+        assert result["median_ms"] <= allowed, (
+            f"{case.route} median {result['median_ms']} ms regressed past {allowed:.2f} ms "
+            f"(baseline {perf_recorder.baselines[case.route]:.2f} ms)"
+        )
@@ -0,0 +1,107 @@
+"""
+Per-item cost of serializing a 1k-item media page: the response_model path
+(ORM objects -> MediaRead validation -> stdlib json) against the fast path
+(row tuples -> dicts -> orjson) used by the hot list routes.
+
+Runs against a throwaway in-memory SQLite database, no .env needed:
+
+    python -m benchmarks.serialization_bench [--items 1000] [--repeat 20]
+
+The fast path's numbers depend on the orjson build, so the installed
+version is printed first, along with the one pinned in requirements.txt
+when they differ.
+"""
+import argparse
+import json
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import orjson
+from pydantic import TypeAdapter
+from sqlalchemy.orm import selectinload
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine, select
+
+import models  # noqa: F401  (registers every table on SQLModel.metadata)
+from models.category import Category
+from models.media import Media
+from models.user import User
+from schemas.media import MediaRead
+from services.serialization import media_read_select, rows_to_dicts
+
+
+def seed(session: Session, items: int):
+    users = [User(name=f"user{i}", email=f"user{i}@example.com", hashed_password="x") for i in range(20)]
+    categories = [Category(name=f"category{i}") for i in range(10)]
+    session.add_all(users + categories)
+    session.flush()
+    now = datetime.utcnow()
+    session.add_all(
+        Media(
+            title=f"Media {i}", description="A description long enough to look like real text " * 3,
+            media_type="video", file_url=f"https://cdn.example.com/v/{i}.mp4",
+            thumbnail_url=f"https://cdn.example.com/t/{i}.jpg", public_id=f"v{i}", thumbnail_public_id=f"t{i}",
+            owner_id=users[i % len(users)].id, category_id=categories[i % len(categories)].id,
+            views=i * 7, width=1920, height=1080, duration=300, created_at=now - timedelta(seconds=i),
+        )
+        for i in range(items)
+    )
+    session.commit()
+
+
+def response_model_path(session: Session, items: int) -> bytes:
+    media = session.exec(
+        select(Media).options(selectinload(Media.category), selectinload(Media.user)).limit(items)
+    ).all()
+    adapter = TypeAdapter(list[MediaRead])
+    validated = adapter.validate_python(media, from_attributes=True)
+    return json.dumps(adapter.dump_python(validated, mode="json")).encode()
+
+
+def fast_path(session: Session, items: int) -> bytes:
+    rows = session.exec(media_read_select().limit(items)).all()
+    return orjson.dumps(rows_to_dicts(rows))
+
+
+def bench(label: str, func, engine, items: int, repeat: int):
+    timings = []
+    for _ in range(repeat):
+        with Session(engine) as session:
+            started = time.perf_counter()
+            body = func(session, items)
+            timings.append(time.perf_counter() - started)
+    best = min(timings)
+    print(f"{label:<16} best {best * 1000:8.2f} ms/page  {best / items * 1e6:7.2f} us/item  {len(body):>9} bytes")
+    return best
+
+
+def pinned_version(package: str):
+    for line in (Path(__file__).resolve().parents[1] / "requirements.txt").read_text().splitlines():
+        name, _, version = line.strip().partition("==")
+        if name.lower() == package and version:
+            return version
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    pinned = pinned_version("orjson")
+    print(f"orjson {orjson.__version__}" + (f" (requirements.txt pins {pinned})" if pinned and pinned != orjson.__version__ else ""))
+
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        seed(session, args.items)
+
+    before = bench("response_model", response_model_path, engine, args.items, args.repeat)
+    after = bench("orjson rows", fast_path, engine, args.items, args.repeat)
+    print(f"speedup          {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
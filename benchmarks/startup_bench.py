@@ -0,0 +1,83 @@
+"""
+Cold-start cost of a worker: wall time of `import main` in a fresh
+interpreter (median of several runs), plus the modules with the largest
+cumulative import time from `python -X importtime`.
+
+Needs the same environment / .env as the app, since importing main reads settings:
+
+    python -m benchmarks.startup_bench [--runs 5] [--top 15] [--history benchmarks/startup_history.jsonl]
+
+With --history, each run appends a JSON line (date, commit, median) so the
+number can be tracked across changes.
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+IMPORT_MAIN = "import main"
+
+
+def timed_import() -> float:
+    started = time.perf_counter()
+    subprocess.run([sys.executable, "-c", IMPORT_MAIN], check=True, capture_output=True)
+    return time.perf_counter() - started
+
+
+def slowest_modules(top: int) -> list[tuple[int, str]]:
+    """(cumulative microseconds, module) for the `top` slowest imports made by main."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", IMPORT_MAIN], check=True, capture_output=True, text=True,
+    )
+    # importtime lists children before their parent, indented two spaces per level
+    children = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth == 1:
+            children.append((int(cumulative), name.strip()))
+        elif depth == 0:
+            if name.strip() == "main":
+                return sorted(children, reverse=True)[:top]
+            children = []
+    return []
+
+
+def current_commit() -> str:
+    result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True)
+    return result.stdout.strip() or "unknown"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--history", help="append the result as a JSON line to this file")
+    args = parser.parse_args()
+
+    timed_import()  # warm the filesystem and bytecode caches
+    samples = [timed_import() for _ in range(args.runs)]
+    median_ms = statistics.median(samples) * 1000
+
+    print(f"import main: median {median_ms:.0f} ms, min {min(samples) * 1000:.0f} ms over {args.runs} runs")
+    print("\nslowest imports from main (cumulative):")
+    for cumulative, name in slowest_modules(args.top):
+        print(f"  {cumulative / 1000:8.1f} ms  {name}")
+
+    if args.history:
+        with open(args.history, "a") as f:
+            f.write(json.dumps({
+                "date": datetime.utcnow().isoformat(timespec="seconds"),
+                "commit": current_commit(),
+                "median_ms": round(median_ms, 1),
+                "runs": args.runs,
+            }) + "\n")
+
+
+if __name__ == "__main__":
+    main()
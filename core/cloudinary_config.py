@@ -1,14 +1,35 @@
-import cloudinary
-import cloudinary.uploader
-import cloudinary.api
 import os
+from functools import lru_cache
 from dotenv import load_dotenv
 
 load_dotenv()  # if you use .env locally
 
-cloudinary.config(
-    cloud_name=os.getenv("CLOUDINARY_CLOUD_NAME"),
-    api_key=os.getenv("CLOUDINARY_API_KEY"),
-    api_secret=os.getenv("CLOUDINARY_API_SECRET"),
-    secure=True
-)
+
+@lru_cache
+def _load():
+    import cloudinary
+    import cloudinary.api
+    import cloudinary.uploader
+    import cloudinary.utils
+
+    cloudinary.config(
+        cloud_name=os.getenv("CLOUDINARY_CLOUD_NAME"),
+        api_key=os.getenv("CLOUDINARY_API_KEY"),
+        api_secret=os.getenv("CLOUDINARY_API_SECRET"),
+        secure=True
+    )
+    return cloudinary
+
+
+class _LazyCloudinary:
+    """
+    Stands in for the `cloudinary` package: the SDK is imported and configured
+    on first attribute access (cloudinary.uploader, cloudinary.api, ...), so
+    workers that never touch Cloudinary don't pay for it at startup.
+    """
+
+    def __getattr__(self, name):
+        return getattr(_load(), name)
+
+
+cloudinary = _LazyCloudinary()
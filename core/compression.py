@@ -0,0 +1,216 @@
+import gzip
+import zlib
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# brotli and zstandard are optional: without them only gzip is negotiated
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+BROTLI = "br"
+ZSTD = "zstd"
+GZIP = "gzip"
+
+
+def available_encodings() -> list[str]:
+    """Encodings this process can produce, in server preference order."""
+    encodings = []
+    if brotli is not None:
+        encodings.append(BROTLI)
+    if zstandard is not None:
+        encodings.append(ZSTD)
+    encodings.append(GZIP)
+    return encodings
+
+
+def accepted_encodings(accept_encoding: str) -> dict[str, float]:
+    """Parse an Accept-Encoding header into {coding: q}, dropping q=0 entries."""
+    accepted: dict[str, float] = {}
+    for part in accept_encoding.lower().split(","):
+        coding, _, params = part.strip().partition(";")
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if q > 0:
+            accepted[coding.strip()] = q
+    return accepted
+
+
+def negotiate(accept_encoding: str, offered: list[str]) -> Optional[str]:
+    """Pick the client's highest-q encoding among `offered`, breaking ties by server order."""
+    accepted = accepted_encodings(accept_encoding)
+    best, best_q = None, 0.0
+    for encoding in offered:
+        q = accepted.get(encoding, accepted.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+class _Compressor:
+    """Streaming compressor with a common compress/flush/finish interface."""
+
+    def __init__(self, encoding: str, settings):
+        self.encoding = encoding
+        if encoding == BROTLI:
+            self._impl = brotli.Compressor(quality=settings.COMPRESSION_BROTLI_QUALITY)
+        elif encoding == ZSTD:
+            self._impl = zstandard.ZstdCompressor(level=settings.COMPRESSION_ZSTD_LEVEL).compressobj()
+        else:
+            # wbits=31 writes a gzip header/trailer
+            self._impl = zlib.compressobj(settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes, flush: bool) -> bytes:
+        if self.encoding == BROTLI:
+            out = self._impl.process(data)
+            return out + self._impl.flush() if flush else out
+        if self.encoding == ZSTD:
+            out = self._impl.compress(data)
+            return out + self._impl.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK) if flush else out
+        out = self._impl.compress(data)
+        return out + self._impl.flush(zlib.Z_SYNC_FLUSH) if flush else out
+
+    def finish(self) -> bytes:
+        if self.encoding == BROTLI:
+            return self._impl.finish()
+        return self._impl.flush()
+
+
+class CompressionMiddleware:
+    """
+    Negotiated br / zstd / gzip compression for API responses.
+
+    Only content types on the allow-list are compressed, and only when the
+    body is at least `min_size` bytes (known up front for single-message
+    responses). Streaming responses are compressed chunk by chunk with a
+    flush after each, so exports and SSE keep streaming. Responses that are
+    already encoded, partial (206), bodiless or sent with zero-copy
+    (`http.response.zerocopysend`, straight from a file descriptor) are
+    passed through untouched.
+    """
+
+    def __init__(self, app: ASGIApp, settings):
+        self.app = app
+        self.settings = settings
+        self.offered = available_encodings()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding", ""), self.offered)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        await _CompressingResponder(self.app, self.settings, encoding)(scope, receive, send)
+
+
+class _CompressingResponder:
+    def __init__(self, app: ASGIApp, settings, encoding: str):
+        self.app = app
+        self.settings = settings
+        self.encoding = encoding
+        self.send: Send = None
+        self.start: Optional[Message] = None
+        self.compressor: Optional[_Compressor] = None
+        self.passthrough = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        self.send = send
+        await self.app(scope, receive, self.send_wrapper)
+
+    def _compressible(self, headers: Headers, status: int) -> bool:
+        if status < 200 or status in (204, 206, 304):
+            return False
+        if "content-encoding" in headers or "content-range" in headers:
+            return False
+        content_type = headers.get("content-type", "").split(";")[0].strip().lower()
+        return any(
+            content_type.startswith(allowed) if allowed.endswith("/") else content_type == allowed
+            for allowed in self.settings.COMPRESSION_CONTENT_TYPES
+        )
+
+    async def send_wrapper(self, message: Message):
+        if message["type"] == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            self.start = message
+            self.passthrough = not self._compressible(headers, message["status"])
+            if self.passthrough:
+                await self.send(message)
+            return
+
+        if message["type"] == "http.response.zerocopysend" and not self.passthrough:
+            # Only under servers offering the extension (not uvicorn): the server writes the
+            # file itself, so the body never comes through here to be compressed
+            if self.compressor is not None:
+                raise RuntimeError("Zero-copy body after a compressed one in the same response")
+            self.passthrough = True
+            await self.send(self.start)
+
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.compressor is None:
+            headers = MutableHeaders(raw=self.start["headers"])
+            if not more_body and len(body) < self.settings.COMPRESSION_MIN_SIZE:
+                self.passthrough = True
+                headers.add_vary_header("Accept-Encoding")
+                await self.send(self.start)
+                await self.send(message)
+                return
+
+            self.compressor = _Compressor(self.encoding, self.settings)
+            headers["content-encoding"] = self.encoding
+            # The encoded bytes differ from the identity representation, so a strong validator becomes weak
+            etag = headers.get("etag")
+            if etag and not etag.startswith("W/"):
+                headers["etag"] = f"W/{etag}"
+            headers.add_vary_header("Accept-Encoding")
+            if not more_body:
+                compressed = self.compressor.compress(body, flush=False) + self.compressor.finish()
+                headers["content-length"] = str(len(compressed))
+                await self.send(self.start)
+                await self.send({"type": "http.response.body", "body": compressed})
+                return
+            del headers["content-length"]
+            await self.send(self.start)
+
+        if more_body:
+            chunk = self.compressor.compress(body, flush=True)
+            if chunk:
+                await self.send({"type": "http.response.body", "body": chunk, "more_body": True})
+        else:
+            chunk = self.compressor.compress(body, flush=False) + self.compressor.finish()
+            await self.send({"type": "http.response.body", "body": chunk})
+
+
+def precompress_file(path, gzip_level: int = 9, brotli_quality: int = 11):
+    """Write `.gz` (and `.br` when brotli is installed) siblings of a static asset."""
+    with open(path, "rb") as source:
+        data = source.read()
+    with gzip.open(f"{path}.gz", "wb", compresslevel=gzip_level) as target:
+        target.write(data)
+    if brotli is not None:
+        with open(f"{path}.br", "wb") as target:
+            target.write(brotli.compress(data, quality=brotli_quality))
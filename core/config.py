@@ -41,6 +41,105 @@ class Settings(BaseSettings):
 
     OWNER_EMAIL: EmailStr
 
+    # Background jobs (disable on workers that should only serve requests)
+    BACKGROUND_JOBS_ENABLED: bool = True
+
+    # Server process (core.server): "production" or "dev" (single auto-reloading worker)
+    SERVER_MODE: str = "production"
+    SERVER_HOST: str = "0.0.0.0"
+    SERVER_PORT: int = 8000
+    SERVER_WORKERS: int = 0  # 0 = one per available CPU
+    SERVER_KEEPALIVE_SECONDS: int = 5
+    SERVER_BACKLOG: int = 2048
+    SERVER_GRACEFUL_TIMEOUT_SECONDS: int = 60
+    SERVER_MAX_REQUESTS: int = 10000  # recycle a worker after this many requests, 0 = never
+    SERVER_ACCESS_LOG: bool = True
+
+    # Related media
+    RELATED_MEDIA_LIMIT: int = 12
+    RELATED_MEDIA_REFRESH_SECONDS: int = 900  # how often the refresh job runs
+    RELATED_MEDIA_REFRESH_BATCH: int = 200
+    RELATED_MEDIA_MAX_AGE_SECONDS: int = 86400  # lists older than this are refreshed, a batch per run
+
+    # Paginated totals: exact COUNT(*) only up to this many rows
+    EXACT_COUNT_THRESHOLD: int = 10000
+    COUNT_CACHE_SECONDS: int = 30
+
+    # Dashboards
+    DASHBOARD_CACHE_SECONDS: int = 5
+    STATS_RECONCILE_SECONDS: int = 3600
+
+    # View analytics
+    VIEW_FLUSH_SECONDS: int = 5
+    VIEW_ROLLUP_SECONDS: int = 300
+    VIEW_MINUTE_RETENTION_HOURS: int = 48
+    VIEW_HOUR_RETENTION_DAYS: int = 30
+    VIEW_DAY_RETENTION_DAYS: int = 730
+
+    # Trending / popular feeds
+    RANKING_REFRESH_SECONDS: int = 300
+    RANKING_CACHE_SECONDS: int = 60
+    RANKING_SNAPSHOT_SIZE: int = 100
+    TRENDING_WINDOW_HOURS: int = 48
+    TRENDING_HALF_LIFE_HOURS: int = 12
+
+    # Subscription feed
+    FEED_FANOUT_MAX_FOLLOWERS: int = 10000
+    FEED_BACKFILL_ON_SUBSCRIBE: int = 20
+
+    # Follow buttons: creator ids resolved per /user/subscriptions/status request
+    FOLLOW_STATE_MAX_IDS: int = 100
+
+    # Batch media fetch
+    MEDIA_BATCH_MAX_IDS: int = 200
+
+    # Bulk moderation
+    MODERATION_MAX_IDS: int = 10000
+    MODERATION_CHUNK_SIZE: int = 500
+
+    # Response compression (br / zstd only when the brotli / zstandard packages are installed)
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MIN_SIZE: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+    COMPRESSION_ZSTD_LEVEL: int = 3
+    # Exact types, or prefixes ending in "/"
+    COMPRESSION_CONTENT_TYPES: List[str] = [
+        "application/json",
+        "application/x-ndjson",
+        "application/vnd.apple.mpegurl",
+        "application/x-mpegurl",
+        "application/dash+xml",
+        "application/javascript",
+        "image/svg+xml",
+        "text/",
+    ]
+
+    # Conditional GET: Cache-Control sent with ETagged responses
+    MEDIA_CACHE_CONTROL: str = "public, max-age=5, stale-while-revalidate=30"
+    PROFILE_CACHE_CONTROL: str = "public, max-age=30, stale-while-revalidate=120"
+    PRIVATE_CACHE_CONTROL: str = "private, no-cache"
+
+    # Local media serving (/static/media): byte ranges, per-type caching, open-file LRU
+    MEDIA_SEGMENT_CACHE_CONTROL: str = "public, max-age=31536000, immutable"
+    MEDIA_PLAYLIST_CACHE_CONTROL: str = "public, max-age=2, stale-while-revalidate=4"
+    MEDIA_FILE_CACHE_CONTROL: str = "public, max-age=86400"
+    MEDIA_FD_CACHE_SIZE: int = 256
+
+    # Uploaded files: "cloudinary", or "local" (disk, served from /static/media) for development and offline runs
+    STORAGE_BACKEND: str = "cloudinary"
+    STORAGE_LOCAL_DIR: str = "static/media/uploads"
+    STORAGE_LOCAL_URL: str = "/static/media/uploads"
+
+    # Rendered public detail pages: "memory" (per worker) or "database" (shared by all workers).
+    # Empty picks "database" when core.server runs more than one worker, "memory" otherwise.
+    RESPONSE_CACHE_BACKEND: str = ""
+    RESPONSE_CACHE_FRESH_SECONDS: int = 5
+    RESPONSE_CACHE_STALE_SECONDS: int = 30
+    RESPONSE_CACHE_LEASE_SECONDS: int = 10
+    RESPONSE_CACHE_MAX_ENTRIES: int = 2048
+    RESPONSE_CACHE_PURGE_SECONDS: int = 300
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
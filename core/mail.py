@@ -1,19 +1,40 @@
-from fastapi_mail import FastMail, MessageSchema, ConnectionConfig, MessageType
+from functools import lru_cache
+
 from core.config import settings
 
-conf = ConnectionConfig(
-    MAIL_USERNAME=settings.MAIL_USERNAME,
-    MAIL_PASSWORD=settings.MAIL_PASSWORD,
-    MAIL_FROM=settings.MAIL_FROM,
-    MAIL_PORT=settings.MAIL_PORT,
-    MAIL_SERVER=settings.MAIL_SERVER,
-    MAIL_FROM_NAME=settings.MAIL_FROM_NAME,
-
-    MAIL_STARTTLS=settings.MAIL_STARTTLS,
-    MAIL_SSL_TLS=settings.MAIL_SSL_TLS,
-    USE_CREDENTIALS=settings.USE_CREDENTIALS,
-    VALIDATE_CERTS=True,
-    # MAIL_TEMPLATE_BODY_TYPE=MessageType.html
-)
-
-fast_mail = FastMail(conf)
+# fastapi_mail pulls in its DNS / template stack, so it is imported on first send rather than at startup
+
+
+@lru_cache
+def get_fast_mail():
+    from fastapi_mail import FastMail, ConnectionConfig
+
+    conf = ConnectionConfig(
+        MAIL_USERNAME=settings.MAIL_USERNAME,
+        MAIL_PASSWORD=settings.MAIL_PASSWORD,
+        MAIL_FROM=settings.MAIL_FROM,
+        MAIL_PORT=settings.MAIL_PORT,
+        MAIL_SERVER=settings.MAIL_SERVER,
+        MAIL_FROM_NAME=settings.MAIL_FROM_NAME,
+
+        MAIL_STARTTLS=settings.MAIL_STARTTLS,
+        MAIL_SSL_TLS=settings.MAIL_SSL_TLS,
+        USE_CREDENTIALS=settings.USE_CREDENTIALS,
+        VALIDATE_CERTS=True,
+        # MAIL_TEMPLATE_BODY_TYPE=MessageType.html
+    )
+    return FastMail(conf)
+
+
+async def send_html_mail(subject: str, recipients: list[str], html: str):
+    """Background task: build and send an HTML message."""
+    from fastapi_mail import MessageSchema, MessageType, MultipartSubtypeEnum
+
+    message = MessageSchema(
+        subject=subject,
+        recipients=recipients,
+        body=html,
+        subtype=MessageType.html,
+        multipart_subtype=MultipartSubtypeEnum.alternative
+    )
+    await get_fast_mail().send_message(message, MessageType.html)
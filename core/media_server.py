@@ -0,0 +1,355 @@
+import mimetypes
+import os
+import stat
+import threading
+from collections import OrderedDict
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Optional
+from uuid import uuid4
+
+import anyio
+from starlette.datastructures import Headers
+from starlette.types import Receive, Scope, Send
+
+from core.compression import accepted_encodings
+from core.static import PRECOMPRESSED_EXTENSIONS, PRECOMPRESSED_SIBLINGS
+
+CHUNK_SIZE = 256 * 1024
+MAX_RANGES = 16
+
+# Segment names never change content, playlists are rewritten while a stream is live
+SEGMENT_EXTENSIONS = {".ts", ".m4s", ".aac"}
+PLAYLIST_EXTENSIONS = {".m3u8", ".mpd"}
+
+# mimetypes maps .ts to Qt translation files on some systems
+MEDIA_TYPES = {
+    ".ts": "video/mp2t",
+    ".m4s": "video/iso.segment",
+    ".m3u8": "application/vnd.apple.mpegurl",
+    ".mpd": "application/dash+xml",
+    ".mp4": "video/mp4",
+    ".webm": "video/webm",
+}
+
+
+def media_type_for(path: str) -> str:
+    extension = os.path.splitext(path)[1].lower()
+    if extension in MEDIA_TYPES:
+        return MEDIA_TYPES[extension]
+    media_type, _ = mimetypes.guess_type(path)
+    return media_type or "application/octet-stream"
+
+
+class OpenFile:
+    """An open descriptor plus the stat it was opened with, shared between concurrent readers."""
+
+    __slots__ = ("fd", "size", "mtime", "inode", "refs", "evicted")
+
+    def __init__(self, fd: int, st: os.stat_result):
+        self.fd = fd
+        self.size = st.st_size
+        self.mtime = st.st_mtime
+        self.inode = st.st_ino
+        self.refs = 0
+        self.evicted = False
+
+
+class FileHandleCache:
+    """
+    LRU of open file descriptors for hot segments, so a popular stream is not
+    re-opened on every fetch. Entries are revalidated against os.stat and
+    closed only once the last in-flight reader has released them.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, OpenFile] = OrderedDict()
+
+    def acquire(self, path: str, st: os.stat_result) -> OpenFile:
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry and (entry.inode, entry.size, entry.mtime) == (st.st_ino, st.st_size, st.st_mtime):
+                self._entries.move_to_end(path)
+                entry.refs += 1
+                return entry
+            if entry:
+                self._evict(path)
+
+        fd = os.open(path, os.O_RDONLY)
+        opened = OpenFile(fd, st)
+        opened.refs = 1
+        with self._lock:
+            if path in self._entries:
+                self._evict(path)
+            self._entries[path] = opened
+            while len(self._entries) > self.max_entries:
+                self._evict(next(iter(self._entries)))
+        return opened
+
+    def release(self, entry: OpenFile):
+        with self._lock:
+            entry.refs -= 1
+            if entry.evicted and entry.refs == 0:
+                os.close(entry.fd)
+
+    def _evict(self, path: str):
+        entry = self._entries.pop(path)
+        entry.evicted = True
+        if entry.refs == 0:
+            os.close(entry.fd)
+
+    def close(self):
+        with self._lock:
+            for path in list(self._entries):
+                self._evict(path)
+
+
+def parse_ranges(header: str, size: int) -> Optional[list[tuple[int, int]]]:
+    """
+    Parse a `bytes=` Range header into inclusive (start, end) pairs clipped to `size`.
+
+    Returns None for a header that should be ignored (not bytes, malformed, too
+    many ranges) and [] when every range is unsatisfiable.
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or not spec:
+        return None
+    parts = spec.split(",")
+    if len(parts) > MAX_RANGES:
+        return None
+
+    ranges = []
+    for part in parts:
+        start_text, dash, end_text = part.strip().partition("-")
+        if not dash:
+            return None
+        try:
+            if start_text == "":
+                length = int(end_text)
+                if length == 0:
+                    continue
+                start, end = max(size - length, 0), size - 1
+            else:
+                start = int(start_text)
+                end = int(end_text) if end_text else size - 1
+        except ValueError:
+            return None
+        if start >= size:
+            continue
+        if start > end:
+            return None
+        ranges.append((start, min(end, size - 1)))
+    return ranges
+
+
+class MediaFileServer:
+    """
+    ASGI app for locally stored uploads and HLS output.
+
+    Supports single and multipart byte ranges, If-Range / If-None-Match /
+    If-Modified-Since, and per-type Cache-Control (immutable segments, short
+    playlists). Bodies go out through the ASGI zero-copy send extension when
+    the server offers it, otherwise as positional reads from a cached
+    descriptor. Playlists and other text assets use a precompressed `.br` / `.gz` sibling when one exists.
+    """
+
+    def __init__(self, directory: str, settings):
+        self.directory = os.path.realpath(directory)
+        self.settings = settings
+        self.handles = FileHandleCache(settings.MEDIA_FD_CACHE_SIZE)
+
+    def cache_control(self, path: str) -> str:
+        extension = os.path.splitext(path)[1].lower()
+        if extension in SEGMENT_EXTENSIONS:
+            return self.settings.MEDIA_SEGMENT_CACHE_CONTROL
+        if extension in PLAYLIST_EXTENSIONS:
+            return self.settings.MEDIA_PLAYLIST_CACHE_CONTROL
+        return self.settings.MEDIA_FILE_CACHE_CONTROL
+
+    def resolve(self, relative: str) -> Optional[str]:
+        full_path = os.path.realpath(os.path.join(self.directory, relative.lstrip("/")))
+        if os.path.commonpath([full_path, self.directory]) != self.directory:
+            return None
+        return full_path
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            return
+        method = scope["method"]
+        if method not in ("GET", "HEAD"):
+            await self._plain(send, 405, b"Method Not Allowed", [(b"allow", b"GET, HEAD")])
+            return
+
+        # Mount leaves `path` whole and appends its prefix to `root_path`
+        root_path = scope.get("root_path", "")
+        relative = scope["path"][len(root_path):] if scope["path"].startswith(root_path) else scope["path"]
+        full_path = self.resolve(relative)
+        st = await anyio.to_thread.run_sync(_stat_file, full_path) if full_path else None
+        if st is None:
+            await self._plain(send, 404, b"Not Found")
+            return
+
+        request_headers = Headers(scope=scope)
+        media_type = media_type_for(full_path)
+        cache_control = self.cache_control(full_path)
+        content_encoding = None
+
+        if os.path.splitext(full_path)[1].lower() in PRECOMPRESSED_EXTENSIONS:
+            accepted = accepted_encodings(request_headers.get("accept-encoding", ""))
+            for encoding, suffix in PRECOMPRESSED_SIBLINGS:
+                if encoding in accepted:
+                    sibling_st = await anyio.to_thread.run_sync(_stat_file, full_path + suffix)
+                    if sibling_st is not None:
+                        full_path, st, content_encoding = full_path + suffix, sibling_st, encoding
+                        break
+
+        etag = f'"{st.st_ino:x}-{st.st_size:x}-{int(st.st_mtime_ns):x}"'
+        if content_encoding:
+            etag = f'{etag[:-1]}-{content_encoding}"'
+        last_modified = formatdate(st.st_mtime, usegmt=True)
+        headers = [
+            (b"accept-ranges", b"bytes"),
+            (b"etag", etag.encode()),
+            (b"last-modified", last_modified.encode()),
+            (b"cache-control", cache_control.encode()),
+        ]
+        if content_encoding:
+            headers += [(b"content-encoding", content_encoding.encode()), (b"vary", b"Accept-Encoding")]
+
+        if _not_modified(request_headers, etag, st.st_mtime):
+            await send({"type": "http.response.start", "status": 304, "headers": headers})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        size = st.st_size
+        ranges = None
+        range_header = request_headers.get("range")
+        if range_header and not content_encoding and _if_range_ok(request_headers, etag, last_modified):
+            ranges = parse_ranges(range_header, size)
+            if ranges == []:
+                headers.append((b"content-range", f"bytes */{size}".encode()))
+                await self._plain(send, 416, b"Range Not Satisfiable", headers)
+                return
+
+        if not ranges:
+            await self._send_file(scope, send, full_path, st, 200, headers, media_type, [(0, size - 1)] if size else [], head=method == "HEAD")
+        elif len(ranges) == 1:
+            start, end = ranges[0]
+            headers.append((b"content-range", f"bytes {start}-{end}/{size}".encode()))
+            await self._send_file(scope, send, full_path, st, 206, headers, media_type, ranges, head=method == "HEAD")
+        else:
+            await self._send_multipart(scope, send, full_path, st, headers, media_type, ranges, head=method == "HEAD")
+
+    async def _send_file(self, scope, send, path, st, status, headers, media_type, ranges, head):
+        length = sum(end - start + 1 for start, end in ranges)
+        headers = headers + [
+            (b"content-type", media_type.encode()),
+            (b"content-length", str(length).encode()),
+        ]
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        if head or not length:
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        entry = await anyio.to_thread.run_sync(self.handles.acquire, path, st)
+        try:
+            for index, (start, end) in enumerate(ranges):
+                await self._send_range(scope, send, entry, start, end, more=index < len(ranges) - 1)
+        finally:
+            self.handles.release(entry)
+
+    async def _send_multipart(self, scope, send, path, st, headers, media_type, ranges, head):
+        boundary = uuid4().hex
+        size = st.st_size
+        part_headers = [
+            (
+                f"--{boundary}\r\nContent-Type: {media_type}\r\n"
+                f"Content-Range: bytes {start}-{end}/{size}\r\n\r\n"
+            ).encode()
+            for start, end in ranges
+        ]
+        closing = f"\r\n--{boundary}--\r\n".encode()
+        length = (
+            sum(len(h) for h in part_headers)
+            + sum(end - start + 1 for start, end in ranges)
+            + 2 * (len(ranges) - 1)
+            + len(closing)
+        )
+        headers = headers + [
+            (b"content-type", f"multipart/byteranges; boundary={boundary}".encode()),
+            (b"content-length", str(length).encode()),
+        ]
+        await send({"type": "http.response.start", "status": 206, "headers": headers})
+        if head:
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        entry = await anyio.to_thread.run_sync(self.handles.acquire, path, st)
+        try:
+            for index, ((start, end), part_header) in enumerate(zip(ranges, part_headers)):
+                prefix = part_header if index == 0 else b"\r\n" + part_header
+                await send({"type": "http.response.body", "body": prefix, "more_body": True})
+                await self._send_range(scope, send, entry, start, end, more=True)
+            await send({"type": "http.response.body", "body": closing})
+        finally:
+            self.handles.release(entry)
+
+    async def _send_range(self, scope, send, entry: OpenFile, start: int, end: int, more: bool):
+        count = end - start + 1
+        # Only under an ASGI server that advertises the zero-copy extension. uvicorn,
+        # which core/server.py runs, does not, so there every range takes the pread loop below.
+        if "http.response.zerocopysend" in scope.get("extensions", {}):
+            await send({
+                "type": "http.response.zerocopysend",
+                "file": entry.fd,
+                "offset": start,
+                "count": count,
+                "more_body": more,
+            })
+            return
+
+        offset = start
+        while offset <= end:
+            chunk = await anyio.to_thread.run_sync(os.pread, entry.fd, min(CHUNK_SIZE, end - offset + 1), offset)
+            if not chunk:
+                break
+            offset += len(chunk)
+            await send({"type": "http.response.body", "body": chunk, "more_body": more or offset <= end})
+
+    @staticmethod
+    async def _plain(send, status: int, body: bytes, headers: Optional[list] = None):
+        headers = (headers or []) + [
+            (b"content-type", b"text/plain; charset=utf-8"),
+            (b"content-length", str(len(body)).encode()),
+        ]
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
+
+
+def _stat_file(path: str) -> Optional[os.stat_result]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st if stat.S_ISREG(st.st_mode) else None
+
+
+def _not_modified(headers: Headers, etag: str, mtime: float) -> bool:
+    if_none_match = headers.get("if-none-match")
+    if if_none_match:
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return "*" in tags or etag in tags
+    if_modified_since = headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return int(mtime) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def _if_range_ok(headers: Headers, etag: str, last_modified: str) -> bool:
+    """A Range is honoured only if If-Range (when sent) still names this representation."""
+    if_range = headers.get("if-range")
+    return if_range is None or if_range in (etag, last_modified)
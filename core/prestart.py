@@ -0,0 +1,55 @@
+"""
+One-off setup run before the server starts (entrypoint.sh: `python -m core.prestart`),
+so workers don't repeat it on every spawn: storage directories, the admin
+account (an Argon2 hash) and the first build of the stats counters.
+Safe to run repeatedly.
+"""
+import os
+
+from sqlmodel import Session, select
+
+from core.config import settings
+from database import engine
+from models.user import User
+from services.auth_service import get_password_hash
+from services.stats_service import ensure_stats_initialized
+
+STORAGE_DIRS = [
+    "static",
+    "static/media/uploads",
+    "static/media/hls",
+    "static/media/thumbnails",
+]
+
+
+def create_directories():
+    for path in [*STORAGE_DIRS, settings.STORAGE_LOCAL_DIR, settings.UPLOAD_DIR, settings.UPLOAD_MEDIA_DIR, settings.UPLOAD_PROFILE_DIR]:
+        os.makedirs(path, exist_ok=True)
+
+
+def seed_admin():
+    """Ensure admin user exists in DB"""
+    with Session(engine) as db:
+        existing_admin = db.exec(select(User).where(User.email == settings.ADMIN_EMAIL)).first()
+        if not existing_admin:
+            admin_user = User(
+                name=settings.ADMIN_NAME,
+                email=settings.ADMIN_EMAIL,
+                hashed_password=get_password_hash(settings.ADMIN_PASSWORD),
+                role="admin"
+            )
+            db.add(admin_user)
+            db.commit()
+            print("✅ Admin user created")
+        else:
+            print("ℹ️ Admin already exists")
+
+
+def main():
+    create_directories()
+    seed_admin()
+    ensure_stats_initialized()
+
+
+if __name__ == "__main__":
+    main()
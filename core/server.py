@@ -0,0 +1,56 @@
+"""
+Process launcher used by entrypoint.sh (`python -m core.server`).
+
+SERVER_MODE=dev runs one auto-reloading worker. SERVER_MODE=production runs
+SERVER_WORKERS uvicorn workers (0 = one per available CPU) on uvloop and
+httptools, recycles each worker after SERVER_MAX_REQUESTS requests, and on
+SIGTERM stops accepting connections while in-flight requests, uploads
+included, get SERVER_GRACEFUL_TIMEOUT_SECONDS to finish.
+"""
+import os
+
+import uvicorn
+
+from core.config import settings
+
+DEV = "dev"
+PRODUCTION = "production"
+
+
+def worker_count(configured: int) -> int:
+    if configured > 0:
+        return configured
+    try:
+        # CPUs this container may actually run on, not the host total
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def server_options(mode: str) -> dict:
+    options = dict(host=settings.SERVER_HOST, port=settings.SERVER_PORT)
+    if mode == DEV:
+        return {**options, "reload": True}
+    if mode == PRODUCTION:
+        return {
+            **options,
+            "workers": worker_count(settings.SERVER_WORKERS),
+            # "auto" picks uvloop and httptools, installed with uvicorn[standard]
+            "loop": "auto",
+            "http": "auto",
+            "timeout_keep_alive": settings.SERVER_KEEPALIVE_SECONDS,
+            "backlog": settings.SERVER_BACKLOG,
+            "timeout_graceful_shutdown": settings.SERVER_GRACEFUL_TIMEOUT_SECONDS,
+            # A worker that hits the limit drains and exits; the supervisor starts a fresh one
+            "limit_max_requests": settings.SERVER_MAX_REQUESTS or None,
+            "access_log": settings.SERVER_ACCESS_LOG,
+        }
+    raise ValueError(f"Unknown SERVER_MODE {mode!r}, expected {DEV!r} or {PRODUCTION!r}")
+
+
+def main():
+    uvicorn.run("main:app", **server_options(settings.SERVER_MODE))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+import mimetypes
+import os
+import stat
+
+import anyio
+from starlette.datastructures import Headers
+from starlette.responses import Response
+from starlette.staticfiles import StaticFiles
+from starlette.types import Scope
+
+from core.compression import accepted_encodings, BROTLI, GZIP
+
+# Text assets worth shipping precompressed; media segments and images are already compressed
+PRECOMPRESSED_EXTENSIONS = {".m3u8", ".mpd", ".vtt", ".json", ".js", ".css", ".svg", ".txt"}
+PRECOMPRESSED_SIBLINGS = ((BROTLI, ".br"), (GZIP, ".gz"))
+
+
+def _media_type(path: str) -> str:
+    media_type, _ = mimetypes.guess_type(path)
+    return media_type or "application/octet-stream"
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """
+    StaticFiles that serves a `.br` / `.gz` sibling of playlists, manifests and
+    other text assets when the client accepts that encoding and the file exists,
+    so nothing is compressed per request.
+    """
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        extension = os.path.splitext(path)[1].lower()
+        if extension not in PRECOMPRESSED_EXTENSIONS or scope["method"] not in ("GET", "HEAD"):
+            return await super().get_response(path, scope)
+
+        accepted = accepted_encodings(Headers(scope=scope).get("accept-encoding", ""))
+        for encoding, suffix in PRECOMPRESSED_SIBLINGS:
+            if encoding not in accepted:
+                continue
+            try:
+                full_path, stat_result = await anyio.to_thread.run_sync(self.lookup_path, path + suffix)
+            except OSError:
+                continue
+            if stat_result and stat.S_ISREG(stat_result.st_mode):
+                response = self.file_response(full_path, stat_result, scope)
+                response.headers["content-encoding"] = encoding
+                if response.status_code == 200:
+                    response.headers["content-type"] = _media_type(path)
+                response.headers.add_vary_header("Accept-Encoding")
+                return response
+
+        response = await super().get_response(path, scope)
+        response.headers.add_vary_header("Accept-Encoding")
+        return response
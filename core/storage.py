@@ -0,0 +1,131 @@
+"""
+Where uploaded media and pictures are stored, picked by STORAGE_BACKEND:
+
+  cloudinary  the Cloudinary account from CLOUDINARY_* (production)
+  local       files under STORAGE_LOCAL_DIR, served by the /static/media mount;
+              for development and offline runs such as benchmarks/perf
+
+Both take the same calls, and upload() returns the fields the routes read off a
+Cloudinary upload result: public_id, secure_url, duration, width, height.
+"""
+import logging
+import os
+import shutil
+from uuid import uuid4
+
+from core.cloudinary_config import cloudinary
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+CLOUDINARY = "cloudinary"
+LOCAL = "local"
+
+# Cloudinary's bulk delete accepts at most 100 public ids per call
+CLOUDINARY_BATCH = 100
+
+
+class CloudinaryStorage:
+    def upload(self, file, folder: str, resource_type: str = "image", filename: str | None = None, **options) -> dict:
+        """`options` go to cloudinary.uploader.upload as is; `filename` only matters to local storage."""
+        return cloudinary.uploader.upload(file, folder=folder, resource_type=resource_type, **options)
+
+    def destroy(self, public_id: str, resource_type: str = "image"):
+        cloudinary.uploader.destroy(public_id, resource_type=resource_type)
+
+    def delete_many(self, public_ids: list[str], resource_type: str):
+        for start in range(0, len(public_ids), CLOUDINARY_BATCH):
+            cloudinary.api.delete_resources(public_ids[start:start + CLOUDINARY_BATCH], resource_type=resource_type)
+
+    def hls_url(self, public_id: str) -> str:
+        # Cloudinary generates the m3u8 for video and audio uploads on first request
+        return f"https://res.cloudinary.com/{cloudinary.config().cloud_name}/video/upload/{public_id}.m3u8"
+
+    def video_thumbnail_url(self, public_id: str) -> str | None:
+        url, _ = cloudinary.utils.cloudinary_url(
+            public_id,
+            resource_type="video",
+            format="jpg",
+            transformation=[{"width": 400, "height": 225, "crop": "fill"}],
+        )
+        return url
+
+
+class LocalStorage:
+    """
+    Files kept as <directory>/<folder>/<random name><original extension>; the
+    public id is that path relative to `directory`. Nothing is transcoded, so
+    the HLS URL is the uploaded file itself and videos get no generated
+    thumbnail. Duration and size come from ffprobe when it is installed.
+    """
+
+    def __init__(self, directory: str, base_url: str):
+        self.directory = os.path.abspath(directory)
+        self.base_url = base_url.rstrip("/")
+
+    def upload(self, file, folder: str, resource_type: str = "image", filename: str | None = None, **options) -> dict:
+        extension = os.path.splitext(filename or "")[1].lower()
+        public_id = f"{folder.strip('/')}/{uuid4().hex}{extension}"
+        path = self._path(public_id)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as out:
+            shutil.copyfileobj(file, out)
+
+        result = {"public_id": public_id, "secure_url": self._url(public_id), "duration": None, "width": None, "height": None}
+        if resource_type == "video":
+            result.update(_probe(path))
+        return result
+
+    def destroy(self, public_id: str, resource_type: str = "image"):
+        try:
+            os.remove(self._path(public_id))
+        except FileNotFoundError:
+            pass
+
+    def delete_many(self, public_ids: list[str], resource_type: str):
+        for public_id in public_ids:
+            self.destroy(public_id, resource_type)
+
+    def hls_url(self, public_id: str) -> str:
+        return self._url(public_id)
+
+    def video_thumbnail_url(self, public_id: str) -> str | None:
+        return None
+
+    def _path(self, public_id: str) -> str:
+        path = os.path.abspath(os.path.join(self.directory, public_id))
+        if os.path.commonpath([path, self.directory]) != self.directory:
+            raise ValueError(f"Public id {public_id!r} points outside the storage directory")
+        return path
+
+    def _url(self, public_id: str) -> str:
+        return f"{self.base_url}/{public_id}"
+
+
+def _probe(path: str) -> dict:
+    """Duration and frame size of a local video or audio file, empty when ffprobe is missing or fails."""
+    try:
+        import ffmpeg
+
+        probe = ffmpeg.probe(path)
+    except Exception as e:
+        logger.info(f"No metadata for {path}: {e}")
+        return {}
+    video = next((stream for stream in probe["streams"] if stream.get("codec_type") == "video"), {})
+    duration = probe.get("format", {}).get("duration")
+    return {
+        "duration": float(duration) if duration else None,
+        "width": video.get("width"),
+        "height": video.get("height"),
+    }
+
+
+def make_storage(name: str):
+    if name == CLOUDINARY:
+        return CloudinaryStorage()
+    if name == LOCAL:
+        return LocalStorage(settings.STORAGE_LOCAL_DIR, settings.STORAGE_LOCAL_URL)
+    raise ValueError(f"Unknown STORAGE_BACKEND {name!r}, expected {CLOUDINARY!r} or {LOCAL!r}")
+
+
+storage = make_storage(settings.STORAGE_BACKEND)
@@ -32,3 +32,7 @@ def get_session():
     """Provides a transactional database session."""
     with Session(engine) as session:
         yield session
+
+def is_postgres(session: Session) -> bool:
+    """True when the session is bound to Postgres (full-text, trigram and planner features)."""
+    return session.get_bind().dialect.name == "postgresql"
@@ -10,6 +10,10 @@ echo "PostgreSQL started"
 echo "Running database migrations..."
 alembic upgrade head
 
+echo "Preparing storage and admin account..."
+python -m core.prestart
+
 echo "Starting application..."
-exec uvicorn main:app --host 0.0.0.0 --port 8000 --reload
+# SERVER_MODE picks production workers or the dev reloader, see core/server.py
+exec python -m core.server
 
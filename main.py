@@ -86,45 +86,42 @@
 ################################
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
-from sqlmodel import Session, select
 from contextlib import asynccontextmanager
 
-from database import engine
-from models.user import User
-from services.auth_service import get_password_hash
 from core.config import settings
-import os
+from core.compression import CompressionMiddleware
+from core.media_server import MediaFileServer
+from core.static import PrecompressedStaticFiles
+from services.scheduler import register_job, start_jobs, stop_jobs, claim_shared_jobs
+from services.related_media_service import refresh_stale_related_media
+from services.stats_service import reconcile_stats
+from services.view_analytics_service import flush_views, rollup_views
+from services.ranking_service import refresh_rankings
+from services.response_cache import response_cache
 
-from api import auth, users, media, categories, dashboard, general_api, media_interactions, comment_interactions, subscription
+from api import auth, users, media, categories, dashboard, general_api, media_interactions, comment_interactions, subscription, search, analytics, feed
 
 
-def seed_admin():
-    """Ensure admin user exists in DB"""
-    with Session(engine) as db:
-        existing_admin = db.exec(select(User).where(User.email == settings.ADMIN_EMAIL)).first()
-        if not existing_admin:
-            admin_user = User(
-                name=settings.ADMIN_NAME,
-                email=settings.ADMIN_EMAIL,
-                hashed_password=get_password_hash(settings.ADMIN_PASSWORD),
-                role="admin"
-            )
-            db.add(admin_user)
-            db.commit()
-            print("✅ Admin user created")
-        else:
-            print("ℹ️ Admin already exists")
-
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     print("🚀 App starting up...")
-    seed_admin()
+    jobs = start_jobs(include_shared=settings.BACKGROUND_JOBS_ENABLED and claim_shared_jobs())
     yield
+    await stop_jobs(jobs)
+    flush_views()
+    media_files.handles.close()
     print("🛑 App shutting down...")
 
 
+register_job("related_media_refresh", settings.RELATED_MEDIA_REFRESH_SECONDS, refresh_stale_related_media)
+register_job("stats_reconcile", settings.STATS_RECONCILE_SECONDS, reconcile_stats)
+register_job("view_flush", settings.VIEW_FLUSH_SECONDS, flush_views, every_worker=True)
+register_job("view_rollup", settings.VIEW_ROLLUP_SECONDS, rollup_views)
+register_job("ranking_refresh", settings.RANKING_REFRESH_SECONDS, refresh_rankings)
+register_job("response_cache_purge", settings.RESPONSE_CACHE_PURGE_SECONDS, response_cache.purge)
+
+
 app = FastAPI(lifespan=lifespan, title="FastAPI SQLModel Backend")
 
 # CORS
@@ -140,10 +137,14 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-os.makedirs("static", exist_ok=True)
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware, settings=settings)
 
-# Static files
-app.mount("/static", StaticFiles(directory="static"), name="static")
+# Static files: uploads and HLS output get range / cache-aware serving, the rest plain files
+media_files = MediaFileServer(directory="static/media", settings=settings)
+app.mount("/static/media", media_files, name="media_files")
+# Directories are created by core.prestart
+app.mount("/static", PrecompressedStaticFiles(directory="static", check_dir=False), name="static")
 
 # Routers
 app.include_router(auth.router)
@@ -155,6 +156,9 @@ app.include_router(general_api.router)
 app.include_router(media_interactions.router)
 app.include_router(comment_interactions.router)
 app.include_router(subscription.router)
+app.include_router(search.router)
+app.include_router(analytics.router)
+app.include_router(feed.router)
 
 
 @app.get("/")
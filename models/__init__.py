@@ -6,3 +6,10 @@ from .media import *
 from .media_interaction import *
 from .comment_interaction import *
 from .subscription import *
+from .related_media import *
+from .stats import *
+from .view_analytics import *
+from .ranking import *
+from .feed import *
+from .moderation import *
+from .response_cache import *
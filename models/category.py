@@ -12,6 +12,9 @@ class Category(SQLModel, table=True):
     status: CategoryStatus = Field(default=CategoryStatus.ACTIVE, sa_column_kwargs={"default": CategoryStatus.ACTIVE})
     description: Optional[str] = None
 
+    # Number of ACTIVE media in this category, kept in sync by services.category_service
+    media_count: int = Field(default=0)
+
     # Reverse relationship: all media items in this category
     media: List["Media"] = Relationship(back_populates="category")
 
@@ -0,0 +1,28 @@
+from sqlmodel import Field, SQLModel, Index
+from datetime import datetime
+
+class FeedInbox(SQLModel, table=True):
+    """
+    Fan-out-on-write feed entry: one row per (follower, media) for creators below
+    FEED_FANOUT_MAX_FOLLOWERS. `created_at` mirrors the media so the feed pages on it.
+    """
+    __tablename__ = "feed_inbox"
+    __table_args__ = (
+        Index("ix_feed_inbox_user_created_media", "user_id", "created_at", "media_id"),
+    )
+
+    user_id: int = Field(foreign_key="users.id", primary_key=True, ondelete="CASCADE")
+    media_id: int = Field(foreign_key="media.id", primary_key=True, ondelete="CASCADE")
+    owner_id: int = Field(index=True)
+    created_at: datetime
+
+
+class FeedPullCreator(SQLModel, table=True):
+    """
+    Creators with too many followers to fan out to; their uploads are merged into
+    feeds at read time instead. Sticky once set, so earlier uploads never go missing.
+    """
+    __tablename__ = "feed_pull_creators"
+
+    creator_id: int = Field(foreign_key="users.id", primary_key=True, ondelete="CASCADE")
+    marked_at: datetime = Field(default_factory=datetime.utcnow)
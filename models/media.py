@@ -1,5 +1,5 @@
 from typing import Optional, List
-from sqlmodel import Field, SQLModel, Relationship
+from sqlmodel import Field, SQLModel, Relationship, Index
 from enum import Enum as PyEnum
 from datetime import datetime
 from schemas.category import CategoryRead
@@ -13,6 +13,14 @@ class MediaStatus(PyEnum):
     INACTIVE = 'INACTIVE'
 
 class Media(SQLModel, table=True):
+    __table_args__ = (
+        # Serves category browse pages: one range scan per (category, status) ordered by recency
+        Index("ix_media_category_status_created_id", "category_id", "status", "created_at", "id"),
+        # Public feed and "my media" lists, both ordered by (created_at, id)
+        Index("ix_media_status_created_id", "status", "created_at", "id"),
+        Index("ix_media_owner_created_id", "owner_id", "created_at", "id"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True, index=True)
     title: str
     description: Optional[str] = None
@@ -33,11 +41,17 @@ class Media(SQLModel, table=True):
     duration: Optional[int] = None
 
     public_id: str
-    thumbnail_public_id: str
+    thumbnail_public_id: Optional[str] = None
 
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
+    # Last time the related_media rows for this item were rebuilt (None = never)
+    related_refreshed_at: Optional[datetime] = Field(default=None, index=True)
+
+    # Bumped by comment and reaction writes; part of the detail routes' ETag
+    interaction_version: int = Field(default=0)
+
     # Relationships
     category: Optional["Category"] = Relationship(back_populates="media")
     user: Optional["User"] = Relationship(back_populates="media")
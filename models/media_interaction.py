@@ -1,10 +1,13 @@
 from typing import Optional, List
-from sqlmodel import Field, SQLModel, Relationship
+from sqlmodel import Field, SQLModel, Relationship, Index
 from enum import Enum as PyEnum
 from datetime import datetime
 
 class Comment(SQLModel, table=True):
     __tablename__ = "comments"
+    __table_args__ = (
+        Index("ix_comments_media_created", "media_id", "created_at"),
+    )
     id: Optional[int] = Field(default=None, primary_key=True)
     user_id: int = Field(foreign_key="users.id")
     media_id: int = Field(foreign_key="media.id")
@@ -33,6 +36,9 @@ class Comment(SQLModel, table=True):
 
 class MediaReaction(SQLModel, table=True):
     __tablename__ = "media_reactions"
+    __table_args__ = (
+        Index("ix_media_reactions_media_like", "media_id", "is_like"),
+    )
     id: Optional[int] = Field(default=None, primary_key=True)
     user_id: int = Field(foreign_key="users.id")
     media_id: int = Field(foreign_key="media.id")
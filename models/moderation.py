@@ -0,0 +1,20 @@
+from typing import Optional
+from sqlmodel import Field, SQLModel
+from datetime import datetime
+
+class ModerationJob(SQLModel, table=True):
+    """
+    Progress of a bulk admin action (status change / delete) run in the
+    background by services.moderation_service. Polled by id.
+    """
+    __tablename__ = "moderation_jobs"
+
+    id: str = Field(primary_key=True, max_length=32)
+    action: str = Field(max_length=20)
+    status: str = Field(default="queued", max_length=20)
+    total: int = Field(default=0)
+    processed: int = Field(default=0)
+    error: Optional[str] = None
+    requested_by: int = Field(foreign_key="users.id", ondelete="CASCADE")
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    finished_at: Optional[datetime] = None
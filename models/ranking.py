@@ -0,0 +1,21 @@
+from typing import Optional
+from sqlmodel import Field, SQLModel, Index
+from datetime import datetime
+
+class MediaRanking(SQLModel, table=True):
+    """
+    One row of a ranked feed snapshot (trending / popular) written by
+    services.ranking_service. `category_id` 0 holds the all-categories snapshot.
+    """
+    __tablename__ = "media_rankings"
+    __table_args__ = (
+        Index("ix_media_rankings_feed_category_rank", "feed", "category_id", "rank"),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    feed: str = Field(max_length=20)
+    category_id: int = Field(default=0)
+    rank: int
+    media_id: int = Field(foreign_key="media.id", ondelete="CASCADE")
+    score: float
+    computed_at: datetime = Field(default_factory=datetime.utcnow)
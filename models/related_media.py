@@ -0,0 +1,20 @@
+from typing import Optional
+from sqlmodel import Field, SQLModel, Index
+from datetime import datetime
+
+class RelatedMedia(SQLModel, table=True):
+    """
+    Precomputed top-N related items for a media, ordered by `rank`.
+    Rebuilt by services.related_media_service, read by the media detail page.
+    """
+    __tablename__ = "related_media"
+    __table_args__ = (
+        Index("ix_related_media_media_rank", "media_id", "rank"),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    media_id: int = Field(foreign_key="media.id", ondelete="CASCADE")
+    related_media_id: int = Field(foreign_key="media.id", ondelete="CASCADE")
+    score: float
+    rank: int
+    computed_at: datetime = Field(default_factory=datetime.utcnow)
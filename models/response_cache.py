@@ -0,0 +1,19 @@
+from typing import Optional
+from sqlalchemy import Column, LargeBinary
+from sqlmodel import Field, SQLModel
+from datetime import datetime
+
+class ResponseCacheEntry(SQLModel, table=True):
+    """
+    A rendered response shared by every worker when RESPONSE_CACHE_BACKEND is
+    "database" (see services.response_cache). `lease_until` marks the worker
+    currently recomputing the entry.
+    """
+    __tablename__ = "response_cache"
+
+    key: str = Field(primary_key=True, max_length=200)
+    body: bytes = Field(sa_column=Column(LargeBinary, nullable=False))
+    etag: str = Field(max_length=100)
+    fresh_until: datetime
+    stale_until: datetime = Field(index=True)
+    lease_until: Optional[datetime] = None
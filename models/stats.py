@@ -0,0 +1,13 @@
+from sqlmodel import Field, SQLModel
+from datetime import datetime
+
+class StatCounter(SQLModel, table=True):
+    """
+    Named counter kept in sync by the write paths (see services.stats_service),
+    so dashboards read totals by primary key instead of running COUNT(*).
+    """
+    __tablename__ = "stat_counters"
+
+    key: str = Field(primary_key=True, max_length=100)
+    value: int = Field(default=0)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
@@ -1,5 +1,5 @@
 from typing import Optional
-from sqlmodel import SQLModel, Field, Relationship, UniqueConstraint
+from sqlmodel import SQLModel, Field, Relationship, UniqueConstraint, Index
 from models.user import User
 
 class Subscription(SQLModel, table=True):
@@ -26,4 +26,8 @@ class Subscription(SQLModel, table=True):
     creator: User = Relationship(back_populates="subscribers", sa_relationship_kwargs={"foreign_keys": "[Subscription.creator_id]"})
     
     # Constraint to ensure a user can only subscribe to a creator once
-    __table_args__ = (UniqueConstraint("subscriber_id", "creator_id", name="unique_subscription"),)
+    __table_args__ = (
+        UniqueConstraint("subscriber_id", "creator_id", name="unique_subscription"),
+        # Pages a creator's subscribers newest first
+        Index("ix_subscriptions_creator_id_id", "creator_id", "id"),
+    )
@@ -41,10 +41,14 @@ class User(UserBase, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
     hashed_password: str
     created_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow, sa_column_kwargs={"onupdate": datetime.utcnow})
     media: List["Media"] = Relationship(back_populates="user")
     reset_token: Optional[str] = None
     reset_token_expires_at: Optional[datetime] = None
+
+    # Denormalized from the subscriptions table, maintained by user_subscribe
+    subscriber_count: int = Field(default=0)
+    subscription_count: int = Field(default=0)
     # comments: List["Comment"] = Relationship(back_populates="owner")
     
     comments: List["Comment"] = Relationship(back_populates="user")
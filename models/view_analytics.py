@@ -0,0 +1,49 @@
+from sqlmodel import Field, SQLModel, Index
+from datetime import datetime
+
+# Views are counted per (media, time bucket) at three granularities. Minute buckets are
+# written by the ingestion flush and compacted into hour buckets, hours into days,
+# by services.view_analytics_service. `owner_id` is copied in for per-creator rollups.
+# `rolled_up_views` is how much of `views` has already reached the coarser table, so
+# views that land in a bucket after its rollup are rolled up as a delta.
+
+class MediaViewMinute(SQLModel, table=True):
+    __tablename__ = "media_views_minute"
+    __table_args__ = (
+        Index("ix_media_views_minute_owner_bucket", "owner_id", "bucket_start"),
+        Index("ix_media_views_minute_rollup", "rolled_up", "bucket_start"),
+    )
+
+    media_id: int = Field(foreign_key="media.id", primary_key=True, ondelete="CASCADE")
+    bucket_start: datetime = Field(primary_key=True)
+    owner_id: int
+    views: int = Field(default=0)
+    rolled_up_views: int = Field(default=0)
+    rolled_up: bool = Field(default=False)
+
+
+class MediaViewHour(SQLModel, table=True):
+    __tablename__ = "media_views_hour"
+    __table_args__ = (
+        Index("ix_media_views_hour_owner_bucket", "owner_id", "bucket_start"),
+        Index("ix_media_views_hour_rollup", "rolled_up", "bucket_start"),
+    )
+
+    media_id: int = Field(foreign_key="media.id", primary_key=True, ondelete="CASCADE")
+    bucket_start: datetime = Field(primary_key=True)
+    owner_id: int
+    views: int = Field(default=0)
+    rolled_up_views: int = Field(default=0)
+    rolled_up: bool = Field(default=False)
+
+
+class MediaViewDay(SQLModel, table=True):
+    __tablename__ = "media_views_day"
+    __table_args__ = (
+        Index("ix_media_views_day_owner_bucket", "owner_id", "bucket_start"),
+    )
+
+    media_id: int = Field(foreign_key="media.id", primary_key=True, ondelete="CASCADE")
+    bucket_start: datetime = Field(primary_key=True)
+    owner_id: int
+    views: int = Field(default=0)
@@ -0,0 +1,14 @@
+from pydantic import BaseModel
+from typing import List
+from datetime import datetime
+
+class ViewPoint(BaseModel):
+    bucket_start: datetime
+    views: int
+
+class ViewSeries(BaseModel):
+    granularity: str
+    since: datetime
+    until: datetime
+    total: int
+    points: List[ViewPoint]
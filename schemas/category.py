@@ -11,6 +11,7 @@ class CategoryBase(BaseModel):
 class CategoryRead(CategoryBase):
     id: int
     status: str
+    media_count: int = 0
 
     class Config:
         from_attributes = True
@@ -40,6 +40,59 @@ class PaginatedMedia(SQLModel):
     size: int = Field(description="The number of items per page.")
     total_count: int = Field(description="Total number of media matching the filter.")
     total_pages: int
+    total_is_exact: bool = Field(default=True, description="False when total_count is an estimate or a lower bound.")
+
+
+class CursorPaginatedMedia(SQLModel):
+    items: List[MediaRead] = Field(description="The list of media for the current page.")
+    size: int = Field(description="The maximum number of items per page.")
+    next_cursor: Optional[str] = Field(default=None, description="Opaque cursor for the next page, null on the last page.")
+
+
+class MediaFieldsRead(BaseModel):
+    """MediaRead narrowed by `fields=`: the id, plus only the fields that were asked for."""
+    id: int
+    title: Optional[str] = None
+    description: Optional[str] = None
+    media_type: Optional[str] = None
+    file_url: Optional[str] = None
+    thumbnail_url: Optional[str] = None
+    owner_id: Optional[int] = None
+    category_id: Optional[int] = None
+    created_at: Optional[datetime] = None
+    category: Optional[CategoryRead] = None
+    status: Optional[MediaStatus] = None
+    user: Optional[UserRead] = None
+    views: Optional[int] = None
+    hls_path: Optional[str] = None
+    width: Optional[int] = None
+    height: Optional[int] = None
+    duration: Optional[int] = None
+
+
+class CursorPaginatedMediaFields(CursorPaginatedMedia):
+    items: List[MediaFieldsRead] = Field(description="The media for the current page, with the requested fields only.")
+
+
+class CategoryMediaPage(CursorPaginatedMedia):
+    category: CategoryRead
+    total_count: int = Field(description="Number of active media in the category.")
+
+
+class CategoryMediaFieldsPage(CategoryMediaPage):
+    items: List[MediaFieldsRead] = Field(description="The media for the current page, with the requested fields only.")
+
+
+class RankedFeed(SQLModel):
+    feed: str
+    category_id: Optional[int] = None
+    computed_at: Optional[datetime] = Field(default=None, description="When the snapshot was ranked, null before the first run.")
+    items: List[MediaRead]
+
+
+class MediaBatch(SQLModel):
+    items: List[MediaRead] = Field(description="Found media, in the order the ids were requested.")
+    missing: List[int] = Field(description="Requested ids that do not exist or are not visible to the caller.")
 
 
 class MediaWithRelatedCategoryMedia(SQLModel):
@@ -0,0 +1,29 @@
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+from models.media import MediaStatus
+
+
+class BulkMediaStatusUpdate(BaseModel):
+    ids: List[int] = Field(min_length=1)
+    status: MediaStatus
+
+
+class BulkMediaDelete(BaseModel):
+    ids: List[int] = Field(min_length=1)
+
+
+class ModerationJobRead(BaseModel):
+    id: str
+    action: str
+    status: str = Field(description="queued, running, finished or failed.")
+    total: int
+    processed: int
+    error: Optional[str] = None
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,12 @@
+from pydantic import BaseModel
+from typing import List
+
+class Suggestion(BaseModel):
+    type: str  # media / creator / category
+    id: int
+    label: str
+    score: float
+
+class SuggestResponse(BaseModel):
+    query: str
+    suggestions: List[Suggestion]
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 class ReadSubscription(BaseModel):
     id: int
@@ -6,4 +6,7 @@ class ReadSubscription(BaseModel):
     creator_id: int
 
     class Config:
-        from_attributes = True 
\ No newline at end of file
+        from_attributes = True 
+
+class FollowState(BaseModel):
+    following: dict[int, bool] = Field(description="Follow state of each requested creator id.")
@@ -3,7 +3,6 @@ from typing import Optional, List
 from datetime import datetime
 from models.user import UserRole, UserStatus
 from sqlmodel import SQLModel, Field
-from schemas.subscription import ReadSubscription
 
 class UserCreate(BaseModel):
     name: str
@@ -21,7 +20,8 @@ class UserRead(BaseModel):
     profile_pic_url: Optional[str] = None
     background_pic_url: Optional[str] = None
     created_at: datetime
-    subscribers: Optional[List[ReadSubscription]] = None
+    subscriber_count: int = 0
+    subscription_count: int = 0
     
     class Config:
         # ⭐️ ADD THIS LINE ⭐️
@@ -33,9 +33,44 @@ class UserUpdate(BaseModel):
     about: Optional[str] = None
     password: Optional[str] = None
 
+class SubscriberRead(BaseModel):
+    """Public view of a follower: no email, role or status."""
+    id: int
+    name: str
+    about: Optional[str] = None
+    profile_pic_url: Optional[str] = None
+    subscriber_count: int = 0
+
+    class Config:
+        from_attributes = True
+
+class PaginatedSubscribers(SQLModel):
+    items: List[SubscriberRead] = Field(description="Subscribers on this page, most recent first.")
+    size: int = Field(description="The maximum number of items per page.")
+    total_count: int = Field(description="Total number of subscribers.")
+    next_cursor: Optional[int] = Field(default=None, description="Pass as `cursor` to get the next page, null on the last page.")
+
 class PaginatedUsers(SQLModel):
     items: List[UserRead] = Field(description="The list of users for the current page.")
     page: int = Field(description="The current page number (1-based).")
     size: int = Field(description="The number of items per page.")
     total_count: int = Field(description="Total number of users matching the filter.")
     total_pages: int
+    total_is_exact: bool = Field(default=True, description="False when total_count is an estimate or a lower bound.")
+
+class UserFieldsRead(BaseModel):
+    """UserRead narrowed by `fields=`: the id, plus only the fields that were asked for."""
+    id: int
+    name: Optional[str] = None
+    email: Optional[EmailStr] = None
+    role: Optional[UserRole] = None
+    status: Optional[UserStatus] = None
+    about: Optional[str] = None
+    profile_pic_url: Optional[str] = None
+    background_pic_url: Optional[str] = None
+    created_at: Optional[datetime] = None
+    subscriber_count: Optional[int] = None
+    subscription_count: Optional[int] = None
+
+class PaginatedUserFields(PaginatedUsers):
+    items: List[UserFieldsRead] = Field(description="The users for the current page, with the requested fields only.")
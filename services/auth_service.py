@@ -11,6 +11,7 @@ from models.user import User
 from core.config import settings
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")  # kept (tokenUrl unused but preserved)
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token", auto_error=False)
 
 password_hash = PasswordHash.recommended()
 
@@ -72,6 +73,13 @@ def get_current_user(token: str = Depends(oauth2_scheme), session: Session = Dep
     return user
 
 
+def get_optional_user(token: str | None = Depends(optional_oauth2_scheme), session: Session = Depends(get_session)):
+    """Like get_current_user for endpoints that also serve anonymous visitors."""
+    if not token:
+        return None
+    return get_current_user(token, session)
+
+
 def require_admin(user=Depends(get_current_user)):
     if user.role != "admin":
         raise HTTPException(
@@ -0,0 +1,71 @@
+from collections import Counter
+from typing import Optional
+
+from sqlalchemy import update
+from sqlmodel import Session, select, func
+
+from models.category import Category
+from models.media import Media, MediaStatus
+
+
+def adjust_category_media_count(session: Session, category_id: Optional[int], delta: int):
+    """
+    Atomically shift a category's active-media counter.
+
+    Runs as `UPDATE ... SET media_count = media_count + delta` so concurrent
+    uploads never lose increments. The caller owns the commit.
+    """
+    if not category_id or not delta:
+        return
+    session.exec(
+        update(Category)
+        .where(Category.id == category_id)
+        .values(media_count=Category.media_count + delta)
+    )
+
+
+def track_media_change(
+    session: Session,
+    old_category_id: Optional[int],
+    old_status: Optional[MediaStatus],
+    new_category_id: Optional[int],
+    new_status: Optional[MediaStatus],
+):
+    """
+    Apply the counter deltas for a media row moving between (category, status) states.
+
+    Pass `None` for the old state when the media is being created and for the new
+    state when it is being deleted.
+    """
+    track_media_changes(session, [(old_category_id, old_status, new_category_id, new_status)])
+
+
+def track_media_changes(
+    session: Session,
+    changes: list[tuple[Optional[int], Optional[MediaStatus], Optional[int], Optional[MediaStatus]]],
+):
+    """Batch form of track_media_change: one UPDATE per affected category."""
+    deltas: Counter = Counter()
+    for old_category_id, old_status, new_category_id, new_status in changes:
+        if old_status == MediaStatus.ACTIVE and old_category_id:
+            deltas[old_category_id] -= 1
+        if new_status == MediaStatus.ACTIVE and new_category_id:
+            deltas[new_category_id] += 1
+    for category_id, delta in deltas.items():
+        adjust_category_media_count(session, category_id, delta)
+
+
+def recount_category_media(session: Session):
+    """Rebuild every category counter from the media table (repair / backfill)."""
+    counts = dict(
+        session.exec(
+            select(Media.category_id, func.count(Media.id))
+            .where(Media.status == MediaStatus.ACTIVE)
+            .where(Media.category_id.is_not(None))
+            .group_by(Media.category_id)
+        ).all()
+    )
+    for category in session.exec(select(Category)).all():
+        category.media_count = counts.get(category.id, 0)
+        session.add(category)
+    session.commit()
@@ -0,0 +1,69 @@
+import threading
+import time
+from typing import Optional
+
+from sqlalchemy import text
+from sqlmodel import Session, select, func
+
+from core.config import settings
+from database import is_postgres
+
+_cache_lock = threading.Lock()
+_cached_counts: dict[str, tuple[float, int]] = {}
+
+
+def _exact_count(session: Session, statement) -> int:
+    return session.exec(select(func.count()).select_from(statement.subquery())).one()
+
+
+def _planner_estimate(session: Session, table_name: str) -> Optional[int]:
+    """Row estimate Postgres keeps from ANALYZE/autovacuum, read in O(1)."""
+    row = session.exec(
+        text("SELECT reltuples::bigint FROM pg_class WHERE relname = :table_name")
+        .bindparams(table_name=table_name)
+    ).first()
+    # reltuples is -1 until the table has been analyzed
+    if row is None or row[0] < 0:
+        return None
+    return int(row[0])
+
+
+def _cached_count(session: Session, key: str, statement) -> tuple[int, bool]:
+    now = time.monotonic()
+    with _cache_lock:
+        hit = _cached_counts.get(key)
+    # Small tables are cheap to count, only large totals are worth serving stale
+    if hit and now - hit[0] < settings.COUNT_CACHE_SECONDS and hit[1] > settings.EXACT_COUNT_THRESHOLD:
+        return hit[1], False
+
+    total = _exact_count(session, statement)
+    with _cache_lock:
+        _cached_counts[key] = (now, total)
+    return total, True
+
+
+def count_total(session: Session, statement, table_name: Optional[str] = None) -> tuple[int, bool]:
+    """
+    Total rows for a paginated list as (total, is_exact).
+
+    Pass `table_name` when `statement` covers (nearly) the whole table: large tables
+    then use the Postgres planner estimate, or a short-lived cached count elsewhere.
+    Filtered statements are counted exactly up to EXACT_COUNT_THRESHOLD rows; beyond
+    that the threshold is returned as a lower bound.
+    """
+    threshold = settings.EXACT_COUNT_THRESHOLD
+
+    if table_name:
+        if is_postgres(session):
+            estimate = _planner_estimate(session, table_name)
+            if estimate is not None and estimate > threshold:
+                return estimate, False
+            return _exact_count(session, statement), True
+        return _cached_count(session, table_name, statement)
+
+    capped = session.exec(
+        select(func.count()).select_from(statement.limit(threshold + 1).subquery())
+    ).one()
+    if capped > threshold:
+        return threshold, False
+    return capped, True
@@ -0,0 +1,101 @@
+import hashlib
+from typing import Optional
+
+from fastapi import Request, Response
+from sqlalchemy import update
+from sqlmodel import Session, select, func
+
+from models.category import Category
+from models.media import Media, MediaStatus
+from models.media_interaction import Comment
+from models.related_media import RelatedMedia
+from models.user import User
+
+# Bump when a response shape changes so clients drop validators minted by older code
+ETAG_VERSION = 1
+
+
+def make_etag(*parts) -> str:
+    """Strong validator over the values a response is built from."""
+    digest = hashlib.sha1(repr((ETAG_VERSION, *parts)).encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """If-None-Match check; uses weak comparison as RFC 9110 requires for this header."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in header.split(","))
+
+
+def set_cache_headers(response: Response, etag: str, cache_control: str):
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
+
+
+def not_modified(etag: str, cache_control: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
+
+
+def bump_interaction_version(session: Session, media_id: int):
+    """Invalidate a media's detail ETags after a comment or reaction write. The caller owns the commit."""
+    session.exec(
+        update(Media)
+        .where(Media.id == media_id)
+        .values(interaction_version=Media.interaction_version + 1)
+    )
+
+
+def bump_comment_interaction_version(session: Session, comment_id: int) -> Optional[int]:
+    """Same for a comment reaction; returns the comment's media id (None when the comment doesn't exist)."""
+    media_id = session.exec(select(Comment.media_id).where(Comment.id == comment_id)).first()
+    if media_id is not None:
+        bump_interaction_version(session, media_id)
+    return media_id
+
+
+def media_etag(session: Session, media_id: int, with_comment_authors: bool = False, with_related: bool = False) -> Optional[str]:
+    """
+    ETag for the media detail routes, from version columns only: media row,
+    category, owner, comment/reaction version and optionally comment authors
+    and the related list. Returns None when the media does not exist.
+    """
+    row = session.exec(
+        select(
+            Media.updated_at, Media.views, Media.status, Media.interaction_version, Media.related_refreshed_at,
+            Category.name, Category.status, Category.description, Category.media_count,
+            User.updated_at,
+        )
+        .join(User, User.id == Media.owner_id)
+        .outerjoin(Category, Category.id == Media.category_id)
+        .where(Media.id == media_id)
+    ).first()
+    if row is None:
+        return None
+    parts = [media_id, *row]
+
+    if with_comment_authors:
+        parts += session.exec(
+            select(func.count(Comment.id), func.max(User.updated_at))
+            .join(User, User.id == Comment.user_id)
+            .where(Comment.media_id == media_id)
+        ).one()
+
+    if with_related:
+        parts += session.exec(
+            select(func.count(Media.id), func.max(Media.updated_at), func.sum(Media.views))
+            .join(RelatedMedia, RelatedMedia.related_media_id == Media.id)
+            .where(RelatedMedia.media_id == media_id, Media.status == MediaStatus.ACTIVE)
+        ).one()
+
+    return make_etag(*parts)
+
+
+def user_etag(session: Session, user_id: int) -> Optional[str]:
+    # users.updated_at moves on every write to the row, counters included
+    updated_at = session.exec(select(User.updated_at).where(User.id == user_id)).first()
+    return make_etag(user_id, updated_at) if updated_at else None
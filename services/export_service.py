@@ -0,0 +1,61 @@
+import csv
+import io
+import json
+from datetime import datetime
+from enum import Enum
+from typing import Iterator
+
+from sqlmodel import Session
+
+from database import engine
+
+CSV = "csv"
+NDJSON = "ndjson"
+
+MEDIA_TYPES = {CSV: "text/csv", NDJSON: "application/x-ndjson"}
+
+# Rows fetched per round trip from the server-side cursor
+YIELD_PER = 1000
+
+
+def _plain(value):
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def stream_export(statement, fmt: str) -> Iterator[str]:
+    """
+    Yield `statement`'s rows as CSV or NDJSON, a batch of rows per chunk.
+
+    Runs in its own session so the rows keep streaming after the request's
+    session is released; memory stays at one batch whatever the table size.
+    """
+    with Session(engine) as session:
+        result = session.exec(statement.execution_options(yield_per=YIELD_PER))
+        columns = list(result.keys())
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if fmt == CSV:
+            writer.writerow(columns)
+
+        for partition in result.partitions():
+            for row in partition:
+                values = [_plain(value) for value in row]
+                if fmt == CSV:
+                    writer.writerow(values)
+                else:
+                    buffer.write(json.dumps(dict(zip(columns, values)), ensure_ascii=False))
+                    buffer.write("\n")
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+        if fmt == CSV and buffer.tell():
+            yield buffer.getvalue()
+
+
+def export_filename(name: str, fmt: str) -> str:
+    return f"{name}-{datetime.utcnow():%Y%m%d-%H%M%S}.{fmt}"
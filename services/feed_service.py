@@ -0,0 +1,142 @@
+import logging
+from typing import Optional
+
+from sqlalchemy import delete, literal, true
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import selectinload
+from sqlmodel import Session, select
+
+from core.config import settings
+from database import engine
+from models.feed import FeedInbox, FeedPullCreator
+from models.media import Media, MediaStatus
+from models.subscription import Subscription
+from models.user import User
+from services.pagination import apply_keyset, encode_cursor
+
+logger = logging.getLogger(__name__)
+
+
+def follower_count(session: Session, creator_id: int) -> int:
+    creator = session.get(User, creator_id)
+    return creator.subscriber_count if creator else 0
+
+
+INBOX_COLUMNS = ["user_id", "media_id", "owner_id", "created_at"]
+
+
+def _insert_into_inboxes(session: Session, rows):
+    """
+    INSERT ... SELECT of (user_id, media_id, owner_id, created_at) rows into feed_inbox,
+    skipping entries that already exist (a backfill and a fan-out can race on the same pair).
+    """
+    rows = rows.subquery()
+    dialect = session.get_bind().dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        insert = pg_insert if dialect == "postgresql" else sqlite_insert
+        # SQLite needs a WHERE before ON CONFLICT in INSERT ... SELECT, or it parses the ON as a join
+        source = select(rows).where(true())
+        session.exec(insert(FeedInbox).from_select(INBOX_COLUMNS, source).on_conflict_do_nothing())
+        return
+
+    session.exec(FeedInbox.__table__.insert().from_select(
+        INBOX_COLUMNS,
+        select(rows).where(~select(FeedInbox.user_id).where(
+            FeedInbox.user_id == rows.c.user_id, FeedInbox.media_id == rows.c.media_id,
+        ).exists()),
+    ))
+
+
+def fan_out_media(media_id: int):
+    """
+    Background task after an upload: copy the media into every follower's inbox,
+    or mark the creator as pull-only when they have too many followers.
+    """
+    with Session(engine) as session:
+        media = session.get(Media, media_id)
+        if not media:
+            return
+
+        if follower_count(session, media.owner_id) > settings.FEED_FANOUT_MAX_FOLLOWERS:
+            if not session.get(FeedPullCreator, media.owner_id):
+                session.add(FeedPullCreator(creator_id=media.owner_id))
+                session.commit()
+                logger.info(f"Creator {media.owner_id} switched to fan-out-on-read")
+            return
+
+        _insert_into_inboxes(session, select(
+            Subscription.subscriber_id.label("user_id"),
+            literal(media.id).label("media_id"),
+            literal(media.owner_id).label("owner_id"),
+            literal(media.created_at).label("created_at"),
+        ).where(Subscription.creator_id == media.owner_id))
+        session.commit()
+
+
+def backfill_inbox(session: Session, user_id: int, creator_id: int):
+    """Seed a new follower's inbox with the creator's latest uploads. The caller owns the commit."""
+    if session.get(FeedPullCreator, creator_id):
+        return
+    recent = (
+        select(Media.id, Media.created_at)
+        .where(Media.owner_id == creator_id, Media.status == MediaStatus.ACTIVE)
+        .order_by(Media.created_at.desc(), Media.id.desc())
+        .limit(settings.FEED_BACKFILL_ON_SUBSCRIBE)
+        .subquery()
+    )
+    _insert_into_inboxes(session, select(
+        literal(user_id).label("user_id"),
+        recent.c.id.label("media_id"),
+        literal(creator_id).label("owner_id"),
+        recent.c.created_at.label("created_at"),
+    ))
+
+
+def clear_inbox(session: Session, user_id: int, creator_id: int):
+    """Drop a creator's uploads from a follower's inbox on unsubscribe. The caller owns the commit."""
+    session.exec(delete(FeedInbox).where(FeedInbox.user_id == user_id, FeedInbox.owner_id == creator_id))
+
+
+def get_feed_page(session: Session, user_id: int, cursor: Optional[str], size: int) -> tuple[list[Media], Optional[str]]:
+    """
+    Newest-first page of uploads from the user's subscriptions.
+
+    Merges the user's inbox (fan-out-on-write) with a live query over followed
+    pull-only creators (fan-out-on-read), both keyset-paginated on (created_at, id).
+    """
+    inbox = session.exec(
+        apply_keyset(
+            select(FeedInbox.created_at, FeedInbox.media_id)
+            .join(Media, Media.id == FeedInbox.media_id)
+            .where(FeedInbox.user_id == user_id, Media.status == MediaStatus.ACTIVE),
+            FeedInbox, cursor, size, id_column=FeedInbox.media_id,
+        )
+    ).all()
+
+    pull_creators = select(FeedPullCreator.creator_id).join(
+        Subscription, Subscription.creator_id == FeedPullCreator.creator_id
+    ).where(Subscription.subscriber_id == user_id)
+    pulled = session.exec(
+        apply_keyset(
+            select(Media.created_at, Media.id)
+            .where(Media.owner_id.in_(pull_creators), Media.status == MediaStatus.ACTIVE),
+            Media, cursor, size,
+        )
+    ).all()
+
+    # A creator can appear in both sources if they were marked pull-only after fan-outs
+    keys = sorted({(created_at, media_id) for created_at, media_id in [*inbox, *pulled]}, reverse=True)
+    page_keys = keys[:size]
+    next_cursor = encode_cursor(*page_keys[-1]) if len(keys) > size else None
+
+    ids = [media_id for _, media_id in page_keys]
+    media = {
+        m.id: m
+        for m in session.exec(
+            select(Media)
+            .where(Media.id.in_(ids))
+            .options(selectinload(Media.category), selectinload(Media.user))
+        ).all()
+    } if ids else {}
+    return [media[i] for i in ids if i in media], next_cursor
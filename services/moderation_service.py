@@ -0,0 +1,155 @@
+import logging
+import os
+import uuid
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import delete, update
+from sqlmodel import Session, select
+
+from core.config import settings
+from core.storage import storage, CLOUDINARY_BATCH
+from database import engine
+from models.comment_interaction import CommentReaction, CommentReply
+from models.media import Media, MediaStatus
+from models.media_interaction import Comment, MediaReaction
+from models.moderation import ModerationJob
+from services.category_service import track_media_changes
+from services.response_cache import invalidate_media_details
+from services.search_service import index_media, unindex_media
+from services.stats_service import record_media_changes
+from services.suggest_service import index_suggestion, unindex_suggestion, MEDIA
+
+logger = logging.getLogger(__name__)
+
+STATUS_CHANGE = "status_change"
+DELETE = "delete"
+
+QUEUED = "queued"
+RUNNING = "running"
+FINISHED = "finished"
+FAILED = "failed"
+
+
+def _chunks(ids: list[int], size: int):
+    for start in range(0, len(ids), size):
+        yield ids[start:start + size]
+
+
+def create_job(session: Session, action: str, total: int, requested_by: int) -> ModerationJob:
+    job = ModerationJob(id=uuid.uuid4().hex, action=action, total=total, requested_by=requested_by)
+    session.add(job)
+    session.commit()
+    session.refresh(job)
+    return job
+
+
+def _set_job(job_id: str, **values):
+    with Session(engine) as session:
+        session.exec(update(ModerationJob).where(ModerationJob.id == job_id).values(**values))
+        session.commit()
+
+
+def _run(job_id: str, ids: list[int], apply_chunk):
+    """Drive `apply_chunk` over MODERATION_CHUNK_SIZE ids at a time, committing progress after each."""
+    _set_job(job_id, status=RUNNING)
+    processed = 0
+    try:
+        for chunk in _chunks(list(dict.fromkeys(ids)), settings.MODERATION_CHUNK_SIZE):
+            apply_chunk(chunk)
+            processed += len(chunk)
+            _set_job(job_id, processed=processed)
+    except Exception as e:
+        logger.exception(f"Moderation job {job_id} failed")
+        _set_job(job_id, status=FAILED, error=str(e), finished_at=datetime.utcnow())
+        return
+    _set_job(job_id, status=FINISHED, finished_at=datetime.utcnow())
+
+
+def _change_status_chunk(chunk: list[int], new_status: MediaStatus):
+    with Session(engine) as session:
+        media = session.exec(select(Media).where(Media.id.in_(chunk), Media.status != new_status)).all()
+        if not media:
+            return
+
+        track_media_changes(session, [(m.category_id, m.status, m.category_id, new_status) for m in media])
+        record_media_changes(session, [
+            ((m.owner_id, m.category_id, m.status), (m.owner_id, m.category_id, new_status)) for m in media
+        ])
+        values = {"status": new_status, "updated_at": datetime.utcnow()}
+        if new_status == MediaStatus.ACTIVE:
+            # Related lists were not kept up while hidden; the periodic refresh takes never-built ones first
+            values["related_refreshed_at"] = None
+        session.exec(update(Media).where(Media.id.in_([m.id for m in media])).values(**values))
+        session.commit()
+
+        for m in media:
+            m.status = new_status
+            index_media(m)
+            index_suggestion(MEDIA, m.id, m.title, new_status == MediaStatus.ACTIVE)
+        invalidate_media_details([m.id for m in media])
+
+
+def _purge_storage(rows: list):
+    """Remove the files of deleted media: batched storage deletes plus any legacy local copies."""
+    videos = [row.public_id for row in rows if row.public_id]
+    images = [row.thumbnail_public_id for row in rows if row.thumbnail_public_id]
+    for public_ids, resource_type in ((videos, "video"), (images, "image")):
+        for batch in _chunks(public_ids, CLOUDINARY_BATCH):
+            try:
+                storage.delete_many(batch, resource_type=resource_type)
+            except Exception as e:
+                logger.warning(f"Storage bulk delete of {len(batch)} {resource_type}s failed: {e}")
+
+    for row in rows:
+        for path in (row.file_url, row.thumbnail_url):
+            if path and os.path.isfile(path):
+                try:
+                    os.remove(path)
+                except OSError as e:
+                    logger.warning(f"Failed to delete {path}: {e}")
+
+
+def _delete_chunk(chunk: list[int]):
+    with Session(engine) as session:
+        rows = session.exec(
+            select(
+                Media.id, Media.owner_id, Media.category_id, Media.status,
+                Media.public_id, Media.thumbnail_public_id, Media.file_url, Media.thumbnail_url,
+            ).where(Media.id.in_(chunk))
+        ).all()
+        if not rows:
+            return
+        ids = [row.id for row in rows]
+
+        track_media_changes(session, [(row.category_id, row.status, None, None) for row in rows])
+        record_media_changes(session, [((row.owner_id, row.category_id, row.status), None) for row in rows])
+
+        # Bulk DELETE skips the ORM cascades session.delete() would run, so clear children first
+        comment_ids = select(Comment.id).where(Comment.media_id.in_(ids))
+        session.exec(delete(CommentReply).where(CommentReply.comment_id.in_(comment_ids)))
+        session.exec(delete(CommentReaction).where(CommentReaction.comment_id.in_(comment_ids)))
+        session.exec(delete(Comment).where(Comment.media_id.in_(ids)))
+        session.exec(delete(MediaReaction).where(MediaReaction.media_id.in_(ids)))
+        session.exec(delete(Media).where(Media.id.in_(ids)))
+        session.commit()
+
+    for media_id in ids:
+        unindex_media(media_id)
+        unindex_suggestion(MEDIA, media_id)
+    invalidate_media_details(ids)
+    _purge_storage(rows)
+
+
+def bulk_change_status(job_id: str, ids: list[int], new_status: MediaStatus):
+    """Background task: one UPDATE ... WHERE id IN per chunk, counters and indexes kept in step."""
+    _run(job_id, ids, lambda chunk: _change_status_chunk(chunk, new_status))
+
+
+def bulk_delete(job_id: str, ids: list[int]):
+    """Background task: delete media and their interactions chunk by chunk, then their files."""
+    _run(job_id, ids, _delete_chunk)
+
+
+def get_job(session: Session, job_id: str) -> Optional[ModerationJob]:
+    return session.get(ModerationJob, job_id)
@@ -0,0 +1,50 @@
+import base64
+from datetime import datetime
+
+from fastapi import HTTPException, status
+from sqlalchemy import tuple_
+
+
+def encode_cursor(created_at: datetime, item_id: int) -> str:
+    """Build an opaque cursor pointing at the last item of a page."""
+    raw = f"{created_at.isoformat()}|{item_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """Parse a cursor produced by `encode_cursor` back into (created_at, id)."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode()).decode()
+        created_at, item_id = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), int(item_id)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+
+
+def apply_keyset(statement, model, cursor: str | None, size: int, id_column=None):
+    """
+    Order `statement` newest first on (created_at, id) and seek past `cursor`.
+
+    One extra row is requested so `keyset_page` can tell whether another page
+    exists without a COUNT query. `id_column` overrides `model.id` as tie-breaker.
+    """
+    id_column = id_column if id_column is not None else model.id
+    if cursor:
+        created_at, item_id = decode_cursor(cursor)
+        # A row-value comparison, so the (created_at, id) index is walked as one range
+        statement = statement.where(tuple_(model.created_at, id_column) < tuple_(created_at, item_id))
+    return statement.order_by(model.created_at.desc(), id_column.desc()).limit(size + 1)
+
+
+def keyset_page(rows: list, size: int) -> tuple[list, str | None]:
+    """Trim the look-ahead row and return (items, next_cursor)."""
+    items = list(rows[:size])
+    next_cursor = None
+    if len(rows) > size and items:
+        last = items[-1]
+        next_cursor = encode_cursor(last.created_at, last.id)
+    return items, next_cursor
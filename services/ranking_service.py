@@ -0,0 +1,195 @@
+import logging
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import delete, insert, union
+from sqlalchemy.orm import selectinload
+from sqlmodel import Session, select, func
+
+from core.config import settings
+from database import engine
+from models.media import Media, MediaStatus
+from models.media_interaction import Comment, MediaReaction
+from models.ranking import MediaRanking
+from models.view_analytics import MediaViewMinute, MediaViewHour
+from schemas.media import MediaRead
+from services.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+TRENDING = "trending"
+POPULAR = "popular"
+ALL_CATEGORIES = 0
+
+COMMENT_WEIGHT = 5.0
+# Snapshot rows per INSERT, well under SQLite's bound-parameter limit
+WRITE_CHUNK = 500
+
+feed_cache = TTLCache(ttl_seconds=settings.RANKING_CACHE_SECONDS)
+
+
+def like_ratio(likes: int, dislikes: int) -> float:
+    """Laplace-smoothed share of likes, 0.5 for media nobody has reacted to."""
+    return (likes + 1) / (likes + dislikes + 2)
+
+
+def _reaction_counts(session: Session, candidates) -> dict[int, tuple[int, int]]:
+    """Likes and dislikes of the media in `candidates`, a subquery with a media_id column."""
+    counts: dict[int, list[int]] = defaultdict(lambda: [0, 0])
+    for media_id, is_like, total in session.exec(
+        select(MediaReaction.media_id, MediaReaction.is_like, func.count(MediaReaction.id))
+        .join(candidates, candidates.c.media_id == MediaReaction.media_id)
+        .group_by(MediaReaction.media_id, MediaReaction.is_like)
+    ).all():
+        counts[media_id][0 if is_like else 1] += total
+    return {media_id: (likes, dislikes) for media_id, (likes, dislikes) in counts.items()}
+
+
+def _recent_view_buckets(since: datetime):
+    """
+    (model, views, filters) of the analytics buckets holding views since `since`, each
+    view counted once: minute rows only add what has not been rolled up into hours yet.
+    """
+    return (
+        (MediaViewHour, MediaViewHour.views, [MediaViewHour.bucket_start >= since]),
+        (
+            MediaViewMinute,
+            MediaViewMinute.views - MediaViewMinute.rolled_up_views,
+            [MediaViewMinute.bucket_start >= since, MediaViewMinute.rolled_up == False],
+        ),
+    )
+
+
+def _decayed_recent_views(session: Session, since: datetime, now: datetime) -> dict[int, float]:
+    """Recent views with exponential decay by age, from the analytics buckets."""
+    decayed: dict[int, float] = defaultdict(float)
+    half_life = settings.TRENDING_HALF_LIFE_HOURS
+    for model, views_column, filters in _recent_view_buckets(since):
+        for media_id, bucket_start, views in session.exec(
+            select(model.media_id, model.bucket_start, views_column).where(*filters)
+        ).all():
+            age_hours = max((now - bucket_start).total_seconds() / 3600, 0)
+            decayed[media_id] += views * 0.5 ** (age_hours / half_life)
+    return decayed
+
+
+def _trending_scores(session: Session, now: datetime):
+    """Scores of media with recent views or comments, and the subquery selecting those media."""
+    since = now - timedelta(hours=settings.TRENDING_WINDOW_HOURS)
+    decayed = _decayed_recent_views(session, since, now)
+
+    comment_velocity = dict(
+        session.exec(
+            select(Comment.media_id, func.count(Comment.id))
+            .where(Comment.created_at >= since)
+            .group_by(Comment.media_id)
+        ).all()
+    )
+
+    if not decayed and not comment_velocity:
+        return {}, None
+
+    candidates = union(
+        *(select(model.media_id).where(*filters) for model, _, filters in _recent_view_buckets(since)),
+        select(Comment.media_id).where(Comment.created_at >= since),
+    ).subquery()
+    reactions = _reaction_counts(session, candidates)
+    window_hours = settings.TRENDING_WINDOW_HOURS
+    scores = {
+        media_id: decayed.get(media_id, 0.0) * (0.5 + like_ratio(*reactions.get(media_id, (0, 0))))
+        + COMMENT_WEIGHT * comment_velocity.get(media_id, 0) * 24 / window_hours
+        for media_id in set(decayed) | set(comment_velocity)
+    }
+    return scores, candidates
+
+
+def _popular_scores(session: Session):
+    """Scores of the most viewed active media per category, and the subquery selecting those media."""
+    # Per category, only the most viewed few hundred can make the snapshot
+    pool = settings.RANKING_SNAPSHOT_SIZE * 3
+    position = func.row_number().over(partition_by=Media.category_id, order_by=Media.views.desc()).label("position")
+    ranked = (
+        select(Media.id, Media.views, position)
+        .where(Media.status == MediaStatus.ACTIVE)
+        .subquery()
+    )
+    views = dict(session.exec(select(ranked.c.id, ranked.c.views).where(ranked.c.position <= pool)).all())
+    if not views:
+        return {}, None
+
+    candidates = select(ranked.c.id.label("media_id")).where(ranked.c.position <= pool).subquery()
+    reactions = _reaction_counts(session, candidates)
+    scores = {
+        media_id: (count or 0) * (0.5 + like_ratio(*reactions.get(media_id, (0, 0))))
+        for media_id, count in views.items()
+    }
+    return scores, candidates
+
+
+def _write_snapshot(session: Session, feed: str, scores: dict[int, float], candidates, now: datetime):
+    """Replace `feed`'s snapshot; `candidates` is the subquery selecting the scored media."""
+    categories = dict(
+        session.exec(
+            select(Media.id, Media.category_id)
+            .join(candidates, candidates.c.media_id == Media.id)
+            .where(Media.status == MediaStatus.ACTIVE)
+        ).all()
+    ) if scores else {}
+
+    by_scope: dict[int, list[tuple[float, int]]] = defaultdict(list)
+    for media_id, category_id in categories.items():
+        entry = (scores[media_id], media_id)
+        by_scope[ALL_CATEGORIES].append(entry)
+        if category_id:
+            by_scope[category_id].append(entry)
+
+    rows = []
+    for scope, entries in by_scope.items():
+        entries.sort(key=lambda e: (-e[0], -e[1]))
+        rows.extend(
+            {"feed": feed, "category_id": scope, "rank": rank, "media_id": media_id, "score": score, "computed_at": now}
+            for rank, (score, media_id) in enumerate(entries[: settings.RANKING_SNAPSHOT_SIZE])
+        )
+
+    session.exec(delete(MediaRanking).where(MediaRanking.feed == feed))
+    for start in range(0, len(rows), WRITE_CHUNK):
+        session.connection().execute(insert(MediaRanking.__table__), rows[start:start + WRITE_CHUNK])
+
+
+def refresh_rankings():
+    """Periodic job: recompute the trending and popular snapshots for every category."""
+    now = datetime.utcnow()
+    with Session(engine) as session:
+        _write_snapshot(session, TRENDING, *_trending_scores(session, now), now)
+        _write_snapshot(session, POPULAR, *_popular_scores(session), now)
+        session.commit()
+    feed_cache.clear()
+    logger.info("Refreshed trending and popular snapshots")
+
+
+def _load_feed(session: Session, feed: str, category_id: int) -> tuple[Optional[datetime], list[MediaRead]]:
+    rows = session.exec(
+        select(MediaRanking.media_id, MediaRanking.computed_at)
+        .where(MediaRanking.feed == feed, MediaRanking.category_id == category_id)
+        .order_by(MediaRanking.rank)
+    ).all()
+    if not rows:
+        return None, []
+
+    ids = [media_id for media_id, _ in rows]
+    media = {
+        m.id: m
+        for m in session.exec(
+            select(Media)
+            .where(Media.id.in_(ids), Media.status == MediaStatus.ACTIVE)
+            .options(selectinload(Media.category), selectinload(Media.user))
+        ).all()
+    }
+    return rows[0][1], [MediaRead.model_validate(media[i]) for i in ids if i in media]
+
+
+def get_feed(session: Session, feed: str, category_id: Optional[int]) -> tuple[Optional[datetime], list[MediaRead]]:
+    """Serve a ranked snapshot, cached for RANKING_CACHE_SECONDS per (feed, category)."""
+    scope = category_id or ALL_CATEGORIES
+    return feed_cache.get_or_set((feed, scope), lambda: _load_feed(session, feed, scope))
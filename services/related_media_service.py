@@ -0,0 +1,139 @@
+import logging
+import math
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete
+from sqlalchemy.orm import selectinload
+from sqlmodel import Session, select
+
+from core.config import settings
+from database import engine
+from models.media import Media, MediaStatus
+from models.related_media import RelatedMedia
+
+logger = logging.getLogger(__name__)
+
+# Score weights; category match dominates, the rest break ties
+CATEGORY_WEIGHT = 4.0
+OWNER_WEIGHT = 2.0
+VIEWS_WEIGHT = 1.5
+RECENCY_WEIGHT = 1.0
+RECENCY_HALF_LIFE_DAYS = 30
+
+# How many candidates each bounded query may pull in before scoring
+CANDIDATE_POOL = 200
+
+
+def _candidates(session: Session, media: Media) -> list[Media]:
+    base = select(Media).where(Media.status == MediaStatus.ACTIVE, Media.id != media.id)
+    candidates: dict[int, Media] = {}
+
+    if media.category_id:
+        for m in session.exec(
+            base.where(Media.category_id == media.category_id)
+            .order_by(Media.views.desc(), Media.id.desc())
+            .limit(CANDIDATE_POOL)
+        ).all():
+            candidates[m.id] = m
+
+    for m in session.exec(
+        base.where(Media.owner_id == media.owner_id)
+        .order_by(Media.created_at.desc(), Media.id.desc())
+        .limit(CANDIDATE_POOL // 4)
+    ).all():
+        candidates[m.id] = m
+
+    return list(candidates.values())
+
+
+def score_related(media: Media, candidate: Media, max_views: int, now: datetime) -> float:
+    score = 0.0
+    if media.category_id and candidate.category_id == media.category_id:
+        score += CATEGORY_WEIGHT
+    if candidate.owner_id == media.owner_id:
+        score += OWNER_WEIGHT
+    if max_views > 0:
+        score += VIEWS_WEIGHT * math.log1p(candidate.views or 0) / math.log1p(max_views)
+    age_days = max((now - candidate.created_at).total_seconds() / 86400, 0)
+    score += RECENCY_WEIGHT * 0.5 ** (age_days / RECENCY_HALF_LIFE_DAYS)
+    return score
+
+
+def refresh_related_for(session: Session, media: Media):
+    """Recompute and store the top-N related items for one media. The caller owns the commit."""
+    now = datetime.utcnow()
+    candidates = _candidates(session, media)
+    max_views = max((c.views or 0 for c in candidates), default=0)
+
+    ranked = sorted(
+        ((score_related(media, c, max_views, now), c.id) for c in candidates),
+        key=lambda pair: (-pair[0], -pair[1]),
+    )[: settings.RELATED_MEDIA_LIMIT]
+
+    session.exec(delete(RelatedMedia).where(RelatedMedia.media_id == media.id))
+    session.add_all(
+        RelatedMedia(media_id=media.id, related_media_id=related_id, score=score, rank=rank, computed_at=now)
+        for rank, (score, related_id) in enumerate(ranked)
+    )
+    media.related_refreshed_at = now
+    session.add(media)
+
+
+def refresh_related_media(media_id: int):
+    """Background-task entry point: rebuild one media's related list in its own session."""
+    with Session(engine) as session:
+        media = session.get(Media, media_id)
+        if not media:
+            return
+        refresh_related_for(session, media)
+        session.commit()
+
+
+def _refresh_batch(where) -> int:
+    """Rebuild one batch of related lists matching `where`, oldest first, in its own commit."""
+    with Session(engine) as session:
+        batch = session.exec(
+            select(Media)
+            .where(Media.status == MediaStatus.ACTIVE, where)
+            .order_by(Media.related_refreshed_at.is_not(None), Media.related_refreshed_at)
+            .limit(settings.RELATED_MEDIA_REFRESH_BATCH)
+        ).all()
+        for media in batch:
+            refresh_related_for(session, media)
+        session.commit()
+    return len(batch)
+
+
+def refresh_stale_related_media():
+    """
+    Periodic job: build every related list that was never computed or was
+    invalidated by a change, then refresh at most one batch of lists older than
+    RELATED_MEDIA_MAX_AGE_SECONDS, so scores slowly follow views and recency.
+    """
+    refreshed = 0
+    # Built rows get a timestamp, so this ends once every missing list exists
+    while True:
+        count = _refresh_batch(Media.related_refreshed_at.is_(None))
+        refreshed += count
+        if count < settings.RELATED_MEDIA_REFRESH_BATCH:
+            break
+
+    cutoff = datetime.utcnow() - timedelta(seconds=settings.RELATED_MEDIA_MAX_AGE_SECONDS)
+    refreshed += _refresh_batch(Media.related_refreshed_at < cutoff)
+    if refreshed:
+        logger.info(f"Refreshed related media for {refreshed} items")
+
+
+def get_related_media(session: Session, media: Media) -> list[Media]:
+    """Read the precomputed related list, building it inline the first time it is requested."""
+    if media.related_refreshed_at is None:
+        refresh_related_for(session, media)
+        session.commit()
+
+    return session.exec(
+        select(Media)
+        .join(RelatedMedia, RelatedMedia.related_media_id == Media.id)
+        .where(RelatedMedia.media_id == media.id, Media.status == MediaStatus.ACTIVE)
+        .order_by(RelatedMedia.rank)
+        .options(selectinload(Media.category), selectinload(Media.user))
+    ).all()
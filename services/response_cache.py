@@ -0,0 +1,287 @@
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+
+from sqlalchemy import delete, or_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session
+
+from core.config import settings
+from database import engine
+from models.response_cache import ResponseCacheEntry
+from services.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+MEMORY = "memory"
+DATABASE = "database"
+
+# How often a request waits on another worker's lease before checking the shared entry again
+LEASE_POLL_SECONDS = 0.05
+
+
+@dataclass
+class CachedResponse:
+    body: bytes
+    etag: str
+    fresh_until: datetime
+    stale_until: datetime
+
+    def is_fresh(self) -> bool:
+        return self.fresh_until > datetime.utcnow()
+
+
+class MemoryBackend:
+    """Per-worker entries; the in-process single-flight is the only coordination needed."""
+
+    def __init__(self, stale_seconds: float, max_entries: int):
+        self._entries = TTLCache(ttl_seconds=stale_seconds, max_entries=max_entries)
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        return self._entries.get(key)
+
+    def set(self, key: str, entry: CachedResponse):
+        self._entries.set(key, entry)
+
+    def delete(self, key: str):
+        self._entries.delete(key)
+
+    def acquire_lease(self, key: str, seconds: float) -> bool:
+        return True
+
+    def release_lease(self, key: str):
+        pass
+
+    def purge(self):
+        pass
+
+
+class DatabaseBackend:
+    """
+    Entries in the response_cache table, shared by every worker. A lease
+    (conditional UPDATE / INSERT on the key) lets one worker recompute an
+    entry while the others keep serving the stale copy or wait for it.
+    """
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with Session(engine) as session:
+            row = session.get(ResponseCacheEntry, key)
+            if row is None or row.stale_until <= datetime.utcnow():
+                return None
+            return CachedResponse(row.body, row.etag, row.fresh_until, row.stale_until)
+
+    def set(self, key: str, entry: CachedResponse):
+        values = dict(
+            body=entry.body, etag=entry.etag, fresh_until=entry.fresh_until,
+            stale_until=entry.stale_until, lease_until=None,
+        )
+        with Session(engine) as session:
+            dialect = session.get_bind().dialect.name
+            if dialect in ("postgresql", "sqlite"):
+                insert = pg_insert if dialect == "postgresql" else sqlite_insert
+                session.exec(
+                    insert(ResponseCacheEntry)
+                    .values(key=key, **values)
+                    .on_conflict_do_update(index_elements=[ResponseCacheEntry.key], set_=values)
+                )
+            else:
+                session.merge(ResponseCacheEntry(key=key, **values))
+            session.commit()
+
+    def delete(self, key: str):
+        with Session(engine) as session:
+            session.exec(delete(ResponseCacheEntry).where(ResponseCacheEntry.key == key))
+            session.commit()
+
+    def acquire_lease(self, key: str, seconds: float) -> bool:
+        now = datetime.utcnow()
+        lease_until = now + timedelta(seconds=seconds)
+        with Session(engine) as session:
+            result = session.exec(
+                update(ResponseCacheEntry)
+                .where(
+                    ResponseCacheEntry.key == key,
+                    or_(ResponseCacheEntry.lease_until.is_(None), ResponseCacheEntry.lease_until < now),
+                )
+                .values(lease_until=lease_until)
+            )
+            session.commit()
+            if result.rowcount:
+                return True
+            if session.get(ResponseCacheEntry, key) is not None:
+                return False
+            # No row yet: an already-expired placeholder carries the lease until the first set()
+            try:
+                session.add(ResponseCacheEntry(
+                    key=key, body=b"", etag="", fresh_until=now, stale_until=now, lease_until=lease_until,
+                ))
+                session.commit()
+            except IntegrityError:
+                session.rollback()
+                return False
+            return True
+
+    def release_lease(self, key: str):
+        with Session(engine) as session:
+            session.exec(update(ResponseCacheEntry).where(ResponseCacheEntry.key == key).values(lease_until=None))
+            session.commit()
+
+    def purge(self):
+        now = datetime.utcnow()
+        with Session(engine) as session:
+            session.exec(
+                delete(ResponseCacheEntry).where(
+                    ResponseCacheEntry.stale_until < now,
+                    or_(ResponseCacheEntry.lease_until.is_(None), ResponseCacheEntry.lease_until < now),
+                )
+            )
+            session.commit()
+
+
+class ResponseCache:
+    """
+    Rendered responses with a fresh window, then a stale-while-revalidate window.
+
+    A fresh entry is returned as is. A stale one is returned too, while a single
+    background refresh recomputes it. On a miss, concurrent callers for the same
+    key are coalesced: one runs `compute`, the rest wait for its result (in this
+    worker through a shared future, across workers through the backend lease).
+    `compute` returns (body, etag), or None when there is nothing to cache (404).
+    """
+
+    def __init__(self, backend, fresh_seconds: float, stale_seconds: float, lease_seconds: float):
+        self.backend = backend
+        self.fresh_seconds = fresh_seconds
+        self.stale_seconds = stale_seconds
+        self.lease_seconds = lease_seconds
+        self._lock = threading.Lock()
+        self._inflight: dict[str, Future] = {}
+        self._refresher = ThreadPoolExecutor(max_workers=2, thread_name_prefix="response-cache")
+
+    def get_or_compute(self, key: str, compute: Callable[[], Optional[tuple[bytes, str]]]) -> Optional[CachedResponse]:
+        entry = self.backend.get(key)
+        if entry is not None:
+            if not entry.is_fresh():
+                self._start(key, compute, background=True)
+            return entry
+        future = self._start(key, compute, background=False)
+        entry = future.result()
+        if entry is None and future.refresh:
+            # Joined a background refresh that deferred to another worker's lease
+            entry = self._start(key, compute, background=False).result()
+        return entry
+
+    def invalidate(self, key: str):
+        """Drop an entry after a write. With the memory backend only this worker's copy goes (see default_backend)."""
+        self.backend.delete(key)
+
+    def purge(self):
+        self.backend.purge()
+
+    def _start(self, key: str, compute, background: bool) -> Future:
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                return future
+            future = self._inflight[key] = Future()
+            future.refresh = background
+
+        if background:
+            self._refresher.submit(self._run, key, compute, future, False)
+        else:
+            self._run(key, compute, future, True)
+        return future
+
+    def _run(self, key: str, compute, future: Future, wait: bool):
+        try:
+            future.set_result(self._fill(key, compute, wait))
+        except Exception as e:
+            if not wait:
+                logger.exception(f"Background refresh of {key} failed")
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def _fill(self, key: str, compute, wait: bool) -> Optional[CachedResponse]:
+        if not self.backend.acquire_lease(key, self.lease_seconds):
+            if not wait:
+                # Another worker is already refreshing this entry
+                return None
+            deadline = time.monotonic() + self.lease_seconds
+            while time.monotonic() < deadline:
+                time.sleep(LEASE_POLL_SECONDS)
+                entry = self.backend.get(key)
+                if entry is not None and entry.is_fresh():
+                    return entry
+            # The lease holder is slow or gone: compute here rather than fail the request
+
+        try:
+            result = compute()
+        except Exception:
+            self.backend.release_lease(key)
+            raise
+        if result is None:
+            # Gone (deleted or no longer public): drop the stale copy too, so no worker keeps serving it
+            self.backend.delete(key)
+            return None
+
+        body, etag = result
+        now = datetime.utcnow()
+        entry = CachedResponse(
+            body=body,
+            etag=etag,
+            fresh_until=now + timedelta(seconds=self.fresh_seconds),
+            stale_until=now + timedelta(seconds=self.fresh_seconds + self.stale_seconds),
+        )
+        self.backend.set(key, entry)
+        return entry
+
+
+def default_backend() -> str:
+    """Per-worker copies can't all be invalidated by one write, so several workers share the database backend."""
+    from core.server import PRODUCTION, worker_count
+
+    if settings.SERVER_MODE == PRODUCTION and worker_count(settings.SERVER_WORKERS) > 1:
+        return DATABASE
+    return MEMORY
+
+
+def make_backend(name: str):
+    name = name or default_backend()
+    if name == DATABASE:
+        return DatabaseBackend()
+    if name == MEMORY:
+        if default_backend() == DATABASE:
+            logger.warning(
+                "RESPONSE_CACHE_BACKEND=memory with several workers: writes only invalidate the worker that made "
+                "them, others serve stale detail pages for up to the fresh + stale window"
+            )
+        return MemoryBackend(
+            stale_seconds=settings.RESPONSE_CACHE_FRESH_SECONDS + settings.RESPONSE_CACHE_STALE_SECONDS,
+            max_entries=settings.RESPONSE_CACHE_MAX_ENTRIES,
+        )
+    raise ValueError(f"Unknown RESPONSE_CACHE_BACKEND {name!r}, expected {MEMORY!r} or {DATABASE!r}")
+
+
+response_cache = ResponseCache(
+    make_backend(settings.RESPONSE_CACHE_BACKEND),
+    fresh_seconds=settings.RESPONSE_CACHE_FRESH_SECONDS,
+    stale_seconds=settings.RESPONSE_CACHE_STALE_SECONDS,
+    lease_seconds=settings.RESPONSE_CACHE_LEASE_SECONDS,
+)
+
+
+def media_details_key(media_id: int) -> str:
+    return f"media-details:{media_id}"
+
+
+def invalidate_media_details(media_ids):
+    for media_id in media_ids:
+        response_cache.invalidate(media_details_key(media_id))
@@ -0,0 +1,82 @@
+import asyncio
+import logging
+import os
+import tempfile
+from dataclasses import dataclass
+from typing import Callable
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+from starlette.concurrency import run_in_threadpool
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Job:
+    name: str
+    interval_seconds: float
+    func: Callable[[], None]
+    every_worker: bool = False
+
+
+_jobs: list[Job] = []
+
+# Held for the life of the worker that won it; the OS releases it when that worker exits
+SHARED_JOBS_LOCK = os.path.join(tempfile.gettempdir(), "mediahub-shared-jobs.lock")
+_lock_file = None
+
+
+def register_job(name: str, interval_seconds: float, func: Callable[[], None], every_worker: bool = False):
+    """
+    Register a blocking function to be run every `interval_seconds` while the app is up.
+
+    `every_worker` jobs manage per-process state (e.g. in-memory buffers) and run in
+    every worker; the others are shared maintenance and only run where enabled.
+    """
+    _jobs.append(Job(name=name, interval_seconds=interval_seconds, func=func, every_worker=every_worker))
+
+
+async def _run_forever(job: Job):
+    while True:
+        await asyncio.sleep(job.interval_seconds)
+        try:
+            # Jobs talk to the DB synchronously, keep them off the event loop
+            await run_in_threadpool(job.func)
+        except Exception:
+            logger.exception(f"Background job {job.name} failed")
+
+
+def claim_shared_jobs() -> bool:
+    """
+    With several workers on one host, only the one holding an exclusive file
+    lock runs the shared jobs. A recycled worker's replacement takes it over.
+    """
+    global _lock_file
+    if fcntl is None or _lock_file is not None:
+        return True
+    lock_file = open(SHARED_JOBS_LOCK, "a")
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock_file.close()
+        return False
+    _lock_file = lock_file
+    return True
+
+
+def start_jobs(include_shared: bool = True) -> list[asyncio.Task]:
+    return [
+        asyncio.create_task(_run_forever(job), name=job.name)
+        for job in _jobs
+        if include_shared or job.every_worker
+    ]
+
+
+async def stop_jobs(tasks: list[asyncio.Task]):
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,168 @@
+import math
+import re
+import threading
+from collections import defaultdict
+from typing import Optional
+
+from sqlalchemy import literal_column
+from sqlalchemy.orm import selectinload
+from sqlmodel import Session, select, func
+
+from database import is_postgres
+from models.media import Media, MediaStatus
+from services.count_service import count_total
+
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+# Title hits count more than description hits, mirroring setweight('A'/'B') on Postgres
+TITLE_WEIGHT = 2.0
+DESCRIPTION_WEIGHT = 1.0
+
+
+def tokenize(text: Optional[str]) -> list[str]:
+    return TOKEN_RE.findall(text.lower()) if text else []
+
+
+class InvertedIndex:
+    """
+    In-process term -> {media_id: weight} index used when the database has no
+    full-text support (SQLite in dev/tests). Kept current by the media write paths.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._postings: dict[str, dict[int, float]] = defaultdict(dict)
+        self._doc_terms: dict[int, set[str]] = {}
+        self._doc_status: dict[int, MediaStatus] = {}
+        self.loaded = False
+
+    def add(self, media_id: int, title: Optional[str], description: Optional[str], status: MediaStatus):
+        weights: dict[str, float] = defaultdict(float)
+        for term in tokenize(title):
+            weights[term] += TITLE_WEIGHT
+        for term in tokenize(description):
+            weights[term] += DESCRIPTION_WEIGHT
+
+        with self._lock:
+            self._remove_locked(media_id)
+            for term, weight in weights.items():
+                self._postings[term][media_id] = weight
+            self._doc_terms[media_id] = set(weights)
+            self._doc_status[media_id] = status
+
+    def remove(self, media_id: int):
+        with self._lock:
+            self._remove_locked(media_id)
+
+    def _remove_locked(self, media_id: int):
+        for term in self._doc_terms.pop(media_id, ()):
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(media_id, None)
+                if not postings:
+                    del self._postings[term]
+        self._doc_status.pop(media_id, None)
+
+    def search(self, query: str, status: Optional[MediaStatus] = None) -> list[int]:
+        """Return ids matching every query term, best tf-idf score first."""
+        terms = set(tokenize(query))
+        if not terms:
+            return []
+
+        with self._lock:
+            postings = [self._postings.get(term, {}) for term in terms]
+            if not all(postings):
+                return []
+            total_docs = max(len(self._doc_terms), 1)
+            candidates = set.intersection(*(set(p) for p in postings))
+            if status is not None:
+                candidates = {i for i in candidates if self._doc_status.get(i) == status}
+            scores = {
+                media_id: sum(
+                    p[media_id] * math.log(1 + total_docs / len(p)) for p in postings
+                )
+                for media_id in candidates
+            }
+
+        return sorted(scores, key=lambda media_id: (-scores[media_id], -media_id))
+
+
+_fallback_index = InvertedIndex()
+
+
+def _ensure_fallback_loaded(session: Session):
+    if _fallback_index.loaded:
+        return
+    rows = session.exec(select(Media.id, Media.title, Media.description, Media.status)).all()
+    for media_id, title, description, status in rows:
+        _fallback_index.add(media_id, title, description, status)
+    _fallback_index.loaded = True
+
+
+def index_media(media: Media):
+    """Refresh a media's search entry after it was created or changed."""
+    # Postgres keeps media.search_vector current itself (generated column)
+    if _fallback_index.loaded:
+        _fallback_index.add(media.id, media.title, media.description, media.status)
+
+
+def unindex_media(media_id: int):
+    if _fallback_index.loaded:
+        _fallback_index.remove(media_id)
+
+
+def _load_in_order(session: Session, ids: list[int]) -> list[Media]:
+    if not ids:
+        return []
+    rows = session.exec(
+        select(Media)
+        .where(Media.id.in_(ids))
+        .options(selectinload(Media.category), selectinload(Media.user))
+    ).all()
+    by_id = {m.id: m for m in rows}
+    return [by_id[i] for i in ids if i in by_id]
+
+
+def search_filter(session: Session, query: str):
+    """Unranked WHERE clause matching the same media as `search_media`, for bulk reads such as exports."""
+    if is_postgres(session):
+        return literal_column("media.search_vector").op("@@")(func.websearch_to_tsquery("english", query))
+    _ensure_fallback_loaded(session)
+    return Media.id.in_(_fallback_index.search(query))
+
+
+def search_media(
+    session: Session,
+    query: str,
+    offset: int,
+    limit: int,
+    status: Optional[MediaStatus] = MediaStatus.ACTIVE,
+) -> tuple[list[Media], int, bool]:
+    """
+    Ranked full-text search over media title and description.
+
+    Returns (page of media, total matches, whether the total is exact).
+    Pass `status=None` to include every status.
+    """
+    if is_postgres(session):
+        vector = literal_column("media.search_vector")
+        ts_query = func.websearch_to_tsquery("english", query)
+        match = vector.op("@@")(ts_query)
+
+        filters = [match]
+        if status is not None:
+            filters.append(Media.status == status)
+
+        total, exact = count_total(session, select(Media.id).where(*filters))
+        ids = session.exec(
+            select(Media.id)
+            .where(*filters)
+            .order_by(func.ts_rank_cd(vector, ts_query).desc(), Media.id.desc())
+            .offset(offset)
+            .limit(limit)
+        ).all()
+        return _load_in_order(session, list(ids)), total, exact
+
+    _ensure_fallback_loaded(session)
+    ids = _fallback_index.search(query, status=status)
+    return _load_in_order(session, ids[offset:offset + limit]), len(ids), True
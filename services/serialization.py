@@ -0,0 +1,98 @@
+from typing import Iterable, Optional
+
+from fastapi import HTTPException
+from fastapi.responses import ORJSONResponse
+from sqlmodel import select
+
+from models.category import Category
+from models.media import Media
+from models.user import User
+from schemas.category import CategoryRead
+from schemas.media import MediaRead
+from schemas.user import UserRead
+
+# Hot list routes build plain dicts straight from row tuples and hand them to
+# orjson, skipping ORM hydration and the second response_model validation pass.
+# Field lists come from the read schemas so the output shape cannot drift.
+SEPARATOR = "__"
+
+CATEGORY_FIELDS = list(CategoryRead.model_fields)
+USER_FIELDS = list(UserRead.model_fields)
+MEDIA_FIELDS = [name for name in MediaRead.model_fields if name not in ("category", "user")]
+MEDIA_READ_FIELDS = list(MediaRead.model_fields)
+
+FIELDS_DESCRIPTION = "Comma-separated subset of response fields to return, e.g. id,title,thumbnail_url"
+
+
+def parse_fields(fields: Optional[str], allowed: list[str]) -> Optional[list[str]]:
+    """Validate a `fields=` sparse fieldset; `id` is always included, None means every field."""
+    if not fields:
+        return None
+    requested = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = [name for name in requested if name not in allowed]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    return list(dict.fromkeys(["id", *requested]))
+
+
+def _nested(model, prefix: str, fields: list[str]):
+    return [getattr(model, name).label(f"{prefix}{SEPARATOR}{name}") for name in fields]
+
+
+def media_read_select(fields: Optional[list[str]] = None):
+    """
+    SELECT of the requested MediaRead columns (all by default). Category and owner
+    are joined in the same query, and only when asked for.
+
+    created_at is always selected because keyset pagination builds its cursor from it.
+    """
+    fields = fields or MEDIA_READ_FIELDS
+    columns = [getattr(Media, name) for name in MEDIA_FIELDS if name in fields or name == "created_at"]
+    if "category" in fields:
+        columns += _nested(Category, "category", CATEGORY_FIELDS)
+    if "user" in fields:
+        columns += _nested(User, "user", USER_FIELDS)
+
+    statement = select(*columns)
+    if "category" in fields:
+        statement = statement.outerjoin(Category, Category.id == Media.category_id)
+    if "user" in fields:
+        statement = statement.join(User, User.id == Media.owner_id)
+    return statement
+
+
+def user_read_select(fields: Optional[list[str]] = None):
+    fields = fields or USER_FIELDS
+    return select(*[getattr(User, name) for name in USER_FIELDS if name in fields])
+
+
+def category_select():
+    return select(*Category.__table__.columns)
+
+
+def row_to_dict(row) -> dict:
+    """Flatten-to-nested: `category__name` becomes item["category"]["name"]; an all-null join becomes None."""
+    item: dict = {}
+    nested: dict[str, dict] = {}
+    for key, value in row._mapping.items():
+        prefix, _, name = key.partition(SEPARATOR)
+        if name:
+            nested.setdefault(prefix, {})[name] = value
+        else:
+            item[key] = value
+    for prefix, values in nested.items():
+        item[prefix] = values if values.get("id") is not None else None
+    return item
+
+
+def rows_to_dicts(rows: Iterable, fields: Optional[list[str]] = None) -> list[dict]:
+    items = [row_to_dict(row) for row in rows]
+    if fields:
+        # Drop columns selected only for pagination
+        items = [{name: item[name] for name in fields if name in item} for item in items]
+    return items
+
+
+def fast_response(content, status_code: int = 200, headers: Optional[dict] = None) -> ORJSONResponse:
+    """Already-shaped content, encoded by orjson (datetimes and enums natively)."""
+    return ORJSONResponse(content=content, status_code=status_code, headers=headers)
@@ -0,0 +1,186 @@
+import logging
+from collections import Counter
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import String, cast, literal, true, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlmodel import Session, select, func
+
+from database import engine
+from models.category import Category
+from models.media import Media, MediaStatus
+from models.stats import StatCounter
+from models.user import User, UserRole, UserStatus
+from services.category_service import recount_category_media
+from services.subscription_service import recount_subscriptions
+
+logger = logging.getLogger(__name__)
+
+# (owner_id, category_id, status) of a media row; None when the row does not exist
+MediaState = Optional[tuple[int, Optional[int], MediaStatus]]
+
+CATEGORIES = "categories"
+USERS = "users"
+MEDIA = "media"
+
+
+def user_status_key(status: UserStatus) -> str:
+    return f"users:status:{status.name}"
+
+
+def media_status_key(status: MediaStatus) -> str:
+    return f"media:status:{status.name}"
+
+
+def owner_media_key(owner_id: int, status: Optional[MediaStatus] = None) -> str:
+    key = f"media:owner:{owner_id}"
+    return f"{key}:status:{status.name}" if status else key
+
+
+def category_media_key(category_id: int, status: Optional[MediaStatus] = None) -> str:
+    key = f"media:category:{category_id}"
+    return f"{key}:status:{status.name}" if status else key
+
+
+def _media_keys(state: MediaState) -> list[str]:
+    if state is None:
+        return []
+    owner_id, category_id, status = state
+    keys = [MEDIA, media_status_key(status), owner_media_key(owner_id), owner_media_key(owner_id, status)]
+    if category_id:
+        keys += [category_media_key(category_id), category_media_key(category_id, status)]
+    return keys
+
+
+def bump(session: Session, key: str, delta: int):
+    """Add `delta` to a counter, creating it on first use. The caller owns the commit."""
+    if not delta:
+        return
+    now = datetime.utcnow()
+    dialect = session.get_bind().dialect.name
+
+    if dialect in ("postgresql", "sqlite"):
+        insert = pg_insert if dialect == "postgresql" else sqlite_insert
+        statement = insert(StatCounter).values(key=key, value=delta, updated_at=now)
+        session.exec(
+            statement.on_conflict_do_update(
+                index_elements=[StatCounter.key],
+                set_={"value": StatCounter.value + delta, "updated_at": now},
+            )
+        )
+        return
+
+    result = session.exec(
+        update(StatCounter)
+        .where(StatCounter.key == key)
+        .values(value=StatCounter.value + delta, updated_at=now)
+    )
+    if result.rowcount == 0:
+        session.add(StatCounter(key=key, value=delta, updated_at=now))
+
+
+def record_media_change(session: Session, before: MediaState, after: MediaState):
+    """Apply counter deltas for a media row moving from `before` to `after` (None = absent)."""
+    record_media_changes(session, [(before, after)])
+
+
+def record_media_changes(session: Session, changes: list[tuple[MediaState, MediaState]]):
+    """Batch form of record_media_change: one bump per affected counter, however many rows moved."""
+    deltas: Counter = Counter()
+    for before, after in changes:
+        deltas.update(_media_keys(after))
+        deltas.subtract(_media_keys(before))
+    for key, delta in deltas.items():
+        bump(session, key, delta)
+
+
+def record_user_change(session: Session, before: Optional[UserStatus], after: Optional[UserStatus]):
+    """Same as record_media_change for non-admin users, keyed on status only."""
+    if before is None and after is not None:
+        bump(session, USERS, 1)
+    elif before is not None and after is None:
+        bump(session, USERS, -1)
+    if before != after:
+        if before is not None:
+            bump(session, user_status_key(before), -1)
+        if after is not None:
+            bump(session, user_status_key(after), 1)
+
+
+def get_counters(session: Session, *keys: str) -> dict[str, int]:
+    """Read counters by primary key; missing counters read as 0."""
+    rows = session.exec(select(StatCounter.key, StatCounter.value).where(StatCounter.key.in_(keys))).all()
+    values = dict(rows)
+    return {key: values.get(key, 0) for key in keys}
+
+
+def _recount_sources(now: datetime) -> list:
+    """One SELECT (key, value, updated_at) per counter family, keys built in SQL the way the *_key helpers do."""
+    user_status = cast(User.status, String)
+    media_status = cast(Media.status, String)
+    owner = literal("media:owner:") + cast(Media.owner_id, String)
+    category = literal("media:category:") + cast(Media.category_id, String)
+    users = User.role != UserRole.ADMIN
+    has_category = Media.category_id.is_not(None)
+    media_count = func.count(Media.id)
+
+    sources = [
+        select(literal(CATEGORIES), func.count(Category.id)),
+        select(literal(USERS), func.count(User.id)).where(users),
+        select(literal("users:status:") + user_status, func.count(User.id)).where(users).group_by(User.status),
+        select(literal(MEDIA), media_count),
+        select(literal("media:status:") + media_status, media_count).group_by(Media.status),
+        select(owner, media_count).group_by(Media.owner_id),
+        select(owner + literal(":status:") + media_status, media_count).group_by(Media.owner_id, Media.status),
+        select(category, media_count).where(has_category).group_by(Media.category_id),
+        select(category + literal(":status:") + media_status, media_count)
+        .where(has_category).group_by(Media.category_id, Media.status),
+    ]
+    return [source.add_columns(literal(now)) for source in sources]
+
+
+def reconcile_stats():
+    """
+    Periodic job: rebuild every counter from the source tables to repair any drift.
+
+    Each family is recounted and written in one INSERT ... SELECT ... ON CONFLICT
+    DO UPDATE, so a counter is never missing or deleted while bump() writes to it.
+    Counters no family produced (nothing left to count) are set to 0.
+    """
+    now = datetime.utcnow()
+    columns = ["key", "value", "updated_at"]
+
+    with Session(engine) as session:
+        dialect = session.get_bind().dialect.name
+        for source in _recount_sources(now):
+            if dialect in ("postgresql", "sqlite"):
+                insert = pg_insert if dialect == "postgresql" else sqlite_insert
+                # The WHERE keeps SQLite from reading ON CONFLICT as a join constraint
+                rows = select(source.subquery()).where(true())
+                statement = insert(StatCounter).from_select(columns, rows)
+                session.exec(statement.on_conflict_do_update(
+                    index_elements=[StatCounter.key],
+                    set_={"value": statement.excluded.value, "updated_at": statement.excluded.updated_at},
+                ))
+            else:
+                for key, value, updated_at in session.exec(source).all():
+                    session.merge(StatCounter(key=key, value=value, updated_at=updated_at))
+        stale = session.exec(
+            update(StatCounter).where(StatCounter.updated_at < now, StatCounter.value != 0).values(value=0, updated_at=now)
+        ).rowcount
+        session.commit()
+
+        recount_category_media(session)
+        recount_subscriptions(session)
+
+    logger.info(f"Reconciled stat counters, {stale} emptied")
+
+
+def ensure_stats_initialized():
+    """Build the counters on first boot so dashboards never read an empty table."""
+    with Session(engine) as session:
+        initialized = session.exec(select(StatCounter.key).limit(1)).first()
+    if not initialized:
+        reconcile_stats()
@@ -0,0 +1,49 @@
+from sqlalchemy import or_, update
+from sqlmodel import Session, select, func
+
+from models.subscription import Subscription
+from models.user import User
+
+
+def followed_creators(session: Session, user_id: int, creator_ids: list[int]) -> set[int]:
+    """
+    Which of `creator_ids` `user_id` follows. Not cached: one probe of the unique
+    (subscriber_id, creator_id) index, and a per-worker cache would show other
+    workers' stale state after a toggle.
+    """
+    return set(session.exec(
+        select(Subscription.creator_id).where(
+            Subscription.subscriber_id == user_id, Subscription.creator_id.in_(set(creator_ids))
+        )
+    ).all())
+
+
+def adjust_subscription_counts(session: Session, subscriber_id: int, creator_id: int, delta: int):
+    """Atomically move both sides' denormalized counters. The caller owns the commit."""
+    session.exec(
+        update(User)
+        .where(User.id == creator_id)
+        .values(subscriber_count=User.subscriber_count + delta)
+    )
+    session.exec(
+        update(User)
+        .where(User.id == subscriber_id)
+        .values(subscription_count=User.subscription_count + delta)
+    )
+
+
+def recount_subscriptions(session: Session):
+    """Rebuild every user's subscriber/subscription counters from the subscriptions table."""
+    subscribers = (
+        select(func.count(Subscription.id)).where(Subscription.creator_id == User.id).scalar_subquery()
+    )
+    subscriptions = (
+        select(func.count(Subscription.id)).where(Subscription.subscriber_id == User.id).scalar_subquery()
+    )
+    # Only rows that drifted: an UPDATE touches updated_at (onupdate), which feeds the profile ETag
+    session.exec(
+        update(User)
+        .where(or_(User.subscriber_count != subscribers, User.subscription_count != subscriptions))
+        .values(subscriber_count=subscribers, subscription_count=subscriptions)
+    )
+    session.commit()
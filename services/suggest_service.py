@@ -0,0 +1,201 @@
+import threading
+from collections import defaultdict
+
+from sqlalchemy import literal, or_
+from sqlmodel import Session, select, func
+
+from database import is_postgres
+from models.category import Category, CategoryStatus
+from models.media import Media, MediaStatus
+from models.user import User, UserRole, UserStatus
+
+MEDIA = "media"
+CREATOR = "creator"
+CATEGORY = "category"
+
+# Same cut-off pg_trgm uses for the <% (word similarity) operator
+SIMILARITY_THRESHOLD = 0.6
+PREFIX_BONUS = 1.0
+# Shorter queries share a trigram with nearly every label, so they only match label prefixes
+MIN_TRIGRAM_QUERY = 3
+
+
+def _is_prefix(label: str, query: str) -> bool:
+    label = label.lower()
+    return label.startswith(query) or any(word.startswith(query) for word in label.split())
+
+
+def _is_label_prefix(label: str, query: str) -> bool:
+    """What short queries match, in both backends: the start of the lowercased label."""
+    return label.lower().startswith(query)
+
+
+def trigrams(text: str) -> set[str]:
+    """pg_trgm-compatible trigrams: lowercase words padded with two leading and one trailing space."""
+    grams = set()
+    for word in text.lower().split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class TrigramIndex:
+    """In-memory trigram -> entry postings, the autocomplete fallback when pg_trgm is unavailable."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._postings: dict[str, set[tuple[str, int]]] = defaultdict(set)
+        self._entries: dict[tuple[str, int], tuple[str, set[str]]] = {}
+        self.loaded = False
+
+    def add(self, kind: str, item_id: int, label: str):
+        key = (kind, item_id)
+        grams = trigrams(label)
+        with self._lock:
+            self._remove_locked(key)
+            self._entries[key] = (label, grams)
+            for gram in grams:
+                self._postings[gram].add(key)
+
+    def remove(self, kind: str, item_id: int):
+        with self._lock:
+            self._remove_locked((kind, item_id))
+
+    def _remove_locked(self, key: tuple[str, int]):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for gram in entry[1]:
+            keys = self._postings.get(gram)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._postings[gram]
+
+    def suggest(self, query: str, limit: int) -> list[tuple[str, int, str, float]]:
+        query_lower = query.lower()
+        query_grams = trigrams(query)
+        short = len(query) < MIN_TRIGRAM_QUERY
+        shared: dict[tuple[str, int], int] = defaultdict(int)
+
+        with self._lock:
+            for gram in query_grams:
+                for key in self._postings.get(gram, ()):
+                    shared[key] += 1
+
+            results = []
+            for key, common in shared.items():
+                label, _ = self._entries[key]
+                if short:
+                    # Same as the Postgres prefix path: label start only, no similarity matches
+                    if _is_label_prefix(label, query_lower):
+                        results.append((key[0], key[1], label, common / len(query_grams) + PREFIX_BONUS))
+                    continue
+                # Share of the query's trigrams found in the label, close to pg_trgm word_similarity
+                similarity = common / len(query_grams)
+                is_prefix = _is_prefix(label, query_lower)
+                if similarity < SIMILARITY_THRESHOLD and not is_prefix:
+                    continue
+                score = similarity + (PREFIX_BONUS if is_prefix else 0.0)
+                results.append((key[0], key[1], label, score))
+
+        results.sort(key=lambda r: (-r[3], r[2]))
+        return results[:limit]
+
+
+_fallback_index = TrigramIndex()
+
+
+def _ensure_fallback_loaded(session: Session):
+    if _fallback_index.loaded:
+        return
+    for media_id, title in session.exec(
+        select(Media.id, Media.title).where(Media.status == MediaStatus.ACTIVE)
+    ).all():
+        _fallback_index.add(MEDIA, media_id, title)
+    for user_id, name in session.exec(
+        select(User.id, User.name).where(User.role != UserRole.ADMIN, User.status == UserStatus.ACTIVE)
+    ).all():
+        _fallback_index.add(CREATOR, user_id, name)
+    for category_id, name in session.exec(
+        select(Category.id, Category.name).where(Category.status == CategoryStatus.ACTIVE)
+    ).all():
+        _fallback_index.add(CATEGORY, category_id, name)
+    _fallback_index.loaded = True
+
+
+def index_suggestion(kind: str, item_id: int, label: str, visible: bool = True):
+    """Add, update or (when not visible) drop an autocomplete entry after a write."""
+    if not _fallback_index.loaded:
+        return
+    if visible:
+        _fallback_index.add(kind, item_id, label)
+    else:
+        _fallback_index.remove(kind, item_id)
+
+
+def unindex_suggestion(kind: str, item_id: int):
+    if _fallback_index.loaded:
+        _fallback_index.remove(kind, item_id)
+
+
+def _escape_like(term: str) -> str:
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _trgm_matches(session: Session, kind: str, id_col, label_col, filters: list, query: str, limit: int):
+    # Both the ILIKE and the <% word-similarity operator are served by the gin_trgm_ops index
+    score = func.word_similarity(query, label_col)
+    rows = session.exec(
+        select(id_col, label_col, score)
+        .where(*filters)
+        .where(or_(label_col.ilike(f"%{_escape_like(query)}%", escape="\\"), literal(query).op("<%")(label_col)))
+        .order_by(score.desc())
+        .limit(limit)
+    ).all()
+    prefix = query.lower()
+    return [
+        (kind, item_id, label, float(sim) + (PREFIX_BONUS if _is_prefix(label, prefix) else 0.0))
+        for item_id, label, sim in rows
+    ]
+
+
+def _prefix_matches(session: Session, kind: str, id_col, label_col, filters: list, query: str, limit: int):
+    # A range scan on the lower(label) text_pattern_ops index, stopped at `limit`. That
+    # index is in byte order, so the ORDER BY has to use the "C" collation to follow it.
+    lowered = func.lower(label_col)
+    rows = session.exec(
+        select(id_col, label_col, func.word_similarity(query, label_col))
+        .where(*filters)
+        # Lowercased by the database on both sides, as the fallback lowercases both in Python
+        .where(lowered.like(func.lower(f"{_escape_like(query)}%"), escape="\\"))
+        .order_by(lowered.collate("C"))
+        .limit(limit)
+    ).all()
+    return [(kind, item_id, label, float(sim) + PREFIX_BONUS) for item_id, label, sim in rows]
+
+
+def suggest(session: Session, query: str, limit: int) -> list[tuple[str, int, str, float]]:
+    """Top-`limit` (kind, id, label, score) suggestions across media titles, creators and categories."""
+    query = query.strip()
+    if not query:
+        return []
+
+    if not is_postgres(session):
+        _ensure_fallback_loaded(session)
+        return _fallback_index.suggest(query, limit)
+
+    matches = _trgm_matches if len(query) >= MIN_TRIGRAM_QUERY else _prefix_matches
+    results = (
+        matches(session, MEDIA, Media.id, Media.title, [Media.status == MediaStatus.ACTIVE], query, limit)
+        + matches(
+            session, CREATOR, User.id, User.name,
+            [User.role != UserRole.ADMIN, User.status == UserStatus.ACTIVE], query, limit,
+        )
+        + matches(
+            session, CATEGORY, Category.id, Category.name,
+            [Category.status == CategoryStatus.ACTIVE], query, limit,
+        )
+    )
+    results.sort(key=lambda r: (-r[3], r[2]))
+    return results[:limit]
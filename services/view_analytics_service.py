@@ -0,0 +1,236 @@
+import logging
+import threading
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import bindparam, delete, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlmodel import Session, select, func
+
+from core.config import settings
+from database import engine
+from models.media import Media
+from models.view_analytics import MediaViewMinute, MediaViewHour, MediaViewDay
+
+logger = logging.getLogger(__name__)
+
+MINUTE = "minute"
+HOUR = "hour"
+DAY = "day"
+
+# Finest table first; each coarser table also absorbs the not-yet-rolled-up rows of finer ones
+TABLES = {MINUTE: MediaViewMinute, HOUR: MediaViewHour, DAY: MediaViewDay}
+ORDER = [MINUTE, HOUR, DAY]
+
+# Minute buckets this recent may still receive late flushes from other workers
+ROLLUP_GRACE = timedelta(minutes=2)
+
+
+def truncate(moment: datetime, granularity: str) -> datetime:
+    if granularity == MINUTE:
+        return moment.replace(second=0, microsecond=0)
+    if granularity == HOUR:
+        return moment.replace(minute=0, second=0, microsecond=0)
+    return moment.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+class ViewBuffer:
+    """Per-process (media_id, minute) -> views counter, drained by `flush_views`."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts: Counter = Counter()
+
+    def add(self, media_id: int, at: datetime, views: int = 1):
+        with self._lock:
+            self._counts[(media_id, truncate(at, MINUTE))] += views
+
+    def drain(self) -> Counter:
+        with self._lock:
+            counts, self._counts = self._counts, Counter()
+        return counts
+
+    def restore(self, counts: Counter):
+        with self._lock:
+            self._counts.update(counts)
+
+
+_buffer = ViewBuffer()
+
+
+def record_view(media_id: int):
+    """Hot path for the view beacon: an in-memory increment, no database work."""
+    _buffer.add(media_id, datetime.utcnow())
+
+
+def _upsert_add(session: Session, model, rows: list[dict]):
+    """
+    Insert bucket rows, adding `views` onto rows whose key already exists. A row
+    that was already rolled up becomes pending again, for the added views only.
+    """
+    if not rows:
+        return
+    dialect = session.get_bind().dialect.name
+
+    if dialect in ("postgresql", "sqlite"):
+        insert = pg_insert if dialect == "postgresql" else sqlite_insert
+        statement = insert(model).values(rows)
+        set_ = {"views": model.views + statement.excluded.views}
+        if hasattr(model, "rolled_up"):
+            set_["rolled_up"] = False
+        session.exec(
+            statement.on_conflict_do_update(index_elements=[model.media_id, model.bucket_start], set_=set_)
+        )
+        return
+
+    for row in rows:
+        existing = session.get(model, (row["media_id"], row["bucket_start"]))
+        if existing:
+            existing.views += row["views"]
+            if hasattr(model, "rolled_up"):
+                existing.rolled_up = False
+            session.add(existing)
+        else:
+            session.add(model(**row))
+
+
+def flush_views():
+    """Periodic job: write buffered views into minute buckets and Media.views in one transaction."""
+    counts = _buffer.drain()
+    if not counts:
+        return
+
+    try:
+        with Session(engine) as session:
+            media_ids = {media_id for media_id, _ in counts}
+            owners = dict(session.exec(select(Media.id, Media.owner_id).where(Media.id.in_(media_ids))).all())
+
+            rows = [
+                {"media_id": media_id, "bucket_start": bucket, "owner_id": owners[media_id], "views": views}
+                for (media_id, bucket), views in counts.items()
+                if media_id in owners
+            ]
+            _upsert_add(session, MediaViewMinute, rows)
+
+            per_media = Counter()
+            for row in rows:
+                per_media[row["media_id"]] += row["views"]
+            if per_media:
+                media_table = Media.__table__
+                # Id order, so flushes from several workers lock the rows in the same order
+                session.connection().execute(
+                    update(media_table)
+                    .where(media_table.c.id == bindparam("b_id"))
+                    .values(views=media_table.c.views + bindparam("b_views")),
+                    [{"b_id": media_id, "b_views": per_media[media_id]} for media_id in sorted(per_media)],
+                )
+            session.commit()
+    except Exception:
+        # Keep the views for the next flush rather than dropping them
+        _buffer.restore(counts)
+        raise
+
+
+def _rollup(session: Session, source, target, granularity: str, before: datetime):
+    pending = session.exec(
+        select(source.media_id, source.owner_id, source.bucket_start, source.views, source.rolled_up_views)
+        .where(source.rolled_up == False, source.bucket_start < before)
+    ).all()
+    if not pending:
+        return 0
+
+    totals: dict[tuple[int, datetime], list] = {}
+    for media_id, owner_id, bucket_start, views, rolled_up_views in pending:
+        key = (media_id, truncate(bucket_start, granularity))
+        if key in totals:
+            totals[key][1] += views - rolled_up_views
+        else:
+            totals[key] = [owner_id, views - rolled_up_views]
+
+    _upsert_add(session, target, [
+        {"media_id": media_id, "bucket_start": bucket, "owner_id": owner_id, "views": views}
+        for (media_id, bucket), (owner_id, views) in totals.items()
+    ])
+    # Only the rows read above, up to the views read above: a flush landing in between stays pending
+    source_table = source.__table__
+    session.connection().execute(
+        update(source_table)
+        .where(source_table.c.media_id == bindparam("b_media_id"), source_table.c.bucket_start == bindparam("b_bucket"))
+        .values(
+            rolled_up_views=bindparam("b_views"),
+            rolled_up=source_table.c.views == bindparam("b_views"),
+        ),
+        [
+            {"b_media_id": media_id, "b_bucket": bucket_start, "b_views": views}
+            for media_id, _, bucket_start, views, _ in sorted(pending, key=lambda row: (row[0], row[2]))
+        ],
+    )
+    return len(pending)
+
+
+def rollup_views():
+    """
+    Periodic job: compact completed minutes into hours and completed hours into days,
+    then drop buckets past their retention window.
+    """
+    now = datetime.utcnow()
+    with Session(engine) as session:
+        minutes = _rollup(session, MediaViewMinute, MediaViewHour, HOUR, truncate(now - ROLLUP_GRACE, HOUR))
+        hours = _rollup(session, MediaViewHour, MediaViewDay, DAY, truncate(now - ROLLUP_GRACE, DAY))
+
+        session.exec(delete(MediaViewMinute).where(
+            MediaViewMinute.rolled_up == True,
+            MediaViewMinute.bucket_start < now - timedelta(hours=settings.VIEW_MINUTE_RETENTION_HOURS),
+        ))
+        session.exec(delete(MediaViewHour).where(
+            MediaViewHour.rolled_up == True,
+            MediaViewHour.bucket_start < now - timedelta(days=settings.VIEW_HOUR_RETENTION_DAYS),
+        ))
+        session.exec(delete(MediaViewDay).where(
+            MediaViewDay.bucket_start < now - timedelta(days=settings.VIEW_DAY_RETENTION_DAYS),
+        ))
+        session.commit()
+
+    if minutes or hours:
+        logger.info(f"Rolled up {minutes} minute and {hours} hour view buckets")
+
+
+def view_series(
+    session: Session,
+    granularity: str,
+    since: datetime,
+    until: datetime,
+    media_id: Optional[int] = None,
+    owner_id: Optional[int] = None,
+) -> list[tuple[datetime, int]]:
+    """
+    Views per `granularity` bucket in [since, until) for one media or one creator.
+
+    Reads the table at that granularity plus the not-yet-rolled-up rows of finer
+    tables, so recent activity shows up before the rollup job has run.
+    """
+    points: dict[datetime, int] = defaultdict(int)
+    since = truncate(since, granularity)
+
+    for level in ORDER[: ORDER.index(granularity) + 1]:
+        model = TABLES[level]
+        # Finer rows only add what has not reached the coarser table yet
+        views = model.views if level == granularity else model.views - model.rolled_up_views
+        statement = (
+            select(model.bucket_start, func.sum(views))
+            .where(model.bucket_start >= since, model.bucket_start < until)
+            .group_by(model.bucket_start)
+        )
+        if media_id is not None:
+            statement = statement.where(model.media_id == media_id)
+        if owner_id is not None:
+            statement = statement.where(model.owner_id == owner_id)
+        if level != granularity:
+            statement = statement.where(model.rolled_up == False)
+
+        for bucket_start, views in session.exec(statement).all():
+            points[truncate(bucket_start, granularity)] += int(views or 0)
+
+    return sorted(points.items())